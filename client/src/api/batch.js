@@ -0,0 +1,23 @@
+import { API_BASE_URL } from "../config";
+
+// Run several API calls in one round trip.
+// requests: [{ id, method = "GET", path: "/proposals/1", body, headers }]
+// With { transactional: true } every write commits together or not at all.
+// Resolves to { responses: [{ id, status, headers, body }], committed? }
+export const fetchBatch = async (requests, { transactional = false, token } = {}) => {
+  const response = await fetch(`${API_BASE_URL}/batch`, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/json",
+      ...(token ? { Authorization: `Bearer ${token}` } : {}), // Passed on to every sub-request
+    },
+    body: JSON.stringify({ requests, transactional }),
+  });
+
+  if (!response.ok) {
+    const errorData = await response.json();
+    throw new Error(errorData.error || "Batch request failed");
+  }
+
+  return response.json();
+};
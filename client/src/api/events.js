@@ -0,0 +1,17 @@
+import { API_BASE_URL } from "../config";
+
+// Listen for committed changes to proposals, tasks and subtasks.
+// `onChange` gets { type, action, id, proposal_id } and should refetch what it shows;
+// `onResync` is called when notices may have been missed (refetch everything).
+// Pass `proposalIds` to hear only about those proposals. Returns a function that stops listening.
+export const subscribeToChanges = ({ proposalIds, onChange, onResync }) => {
+  const query = proposalIds?.length ? `?proposal_id=${proposalIds.join(",")}` : "";
+  const source = new EventSource(`${API_BASE_URL}/events${query}`);
+
+  source.addEventListener("change", (event) => onChange(JSON.parse(event.data)));
+  source.addEventListener("resync", () => onResync?.());
+  // The browser reconnects by itself; anything committed meanwhile wasn't seen
+  source.addEventListener("open", () => onResync?.());
+
+  return () => source.close();
+};
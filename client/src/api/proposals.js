@@ -1,16 +1,17 @@
 import { API_BASE_URL } from "../config";  // ✅ Import the global API URL
 
 
-export const fetchProposals = async (filters = {}) => {
-  const params = new URLSearchParams(filters).toString(); // Convert filters into query params
+export const fetchProposals = async (filters = {}, after = null) => {
+  const query = after ? { ...filters, after } : filters; // `after` is the cursor from the previous page
+  const params = new URLSearchParams(query).toString(); // Convert filters into query params
   try {
     const response = await fetch(`${API_BASE_URL}/proposals?${params}`); // Append filters to URL
 
     if (!response.ok) throw new Error("Failed to fetch proposals");
-    return await response.json();
+    return await response.json(); // { proposals: [...], next_cursor: "..." | null }
   } catch (error) {
     console.error("Error fetching proposals:", error);
-    return [];
+    return { proposals: [], next_cursor: null };
   }
 };
 
@@ -0,0 +1,44 @@
+import { API_BASE_URL } from "../config";
+
+// Keep a local copy of proposals, tasks and subtasks up to date by fetching only changes.
+// `store` is { proposals: Map, tasks: Map, subtasks: Map, token: string | null } (keyed by id);
+// pass a fresh one (token null) for the first sync. Resolves to the updated store.
+export const syncProposals = async (store) => {
+  let since = store.token;
+  for (;;) {
+    const query = since ? `?since=${encodeURIComponent(since)}` : "";
+    const response = await fetch(`${API_BASE_URL}/sync/proposals${query}`);
+
+    if (response.status === 410) {
+      // Token older than the server keeps deletions for: start over from a snapshot
+      return syncProposals({ proposals: new Map(), tasks: new Map(), subtasks: new Map(), token: null });
+    }
+    if (!response.ok) throw new Error("Failed to sync proposals");
+
+    const changes = await response.json();
+    for (const kind of ["proposals", "tasks", "subtasks"]) {
+      for (const row of changes[kind]) store[kind].set(row.id, row);
+    }
+    // Tombstones name only the deleted row; children removed with it by the database have
+    // none, so drop a deleted proposal's tasks and a deleted task's subtasks here
+    const goneProposals = new Set();
+    const goneTasks = new Set();
+    for (const { type, id } of changes.deleted) {
+      store[`${type}s`].delete(id);
+      if (type === "proposal") goneProposals.add(id);
+      if (type === "task") goneTasks.add(id);
+    }
+    for (const [id, task] of store.tasks) {
+      if (goneProposals.has(task.proposal_id)) {
+        store.tasks.delete(id);
+        goneTasks.add(id);
+      }
+    }
+    for (const [id, subtask] of store.subtasks) {
+      if (goneTasks.has(subtask.task_id)) store.subtasks.delete(id);
+    }
+
+    since = changes.next_token;
+    if (!changes.has_more) return { ...store, token: since };
+  }
+};
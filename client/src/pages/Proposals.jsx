@@ -10,28 +10,34 @@ const Proposals = () => {
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
   const [expandedProposal, setExpandedProposal] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [activeFilters, setActiveFilters] = useState({});
 
   // Filters
-  const [filters, setFilters] = useState({ name: "", client: "", clientName: "" });
+  const [filters, setFilters] = useState({ q: "" });
 
   // Sorting
   const [sortBy, setSortBy] = useState("newest");
 
   // ✅ Memoized API call to prevent unnecessary re-fetching
-  const loadProposals = useCallback(async (filters = {}) => {
+  const loadProposals = useCallback(async (filters = {}, after = null) => {
     setLoading(true);
     try {
-      const data = await fetchProposals({ ...filters });
+      const data = await fetchProposals({ ...filters }, after);
 
-      if (!data || !Array.isArray(data)) {
+      if (!data || !Array.isArray(data.proposals)) {
         throw new Error("Invalid API response");
       }
 
-      setProposals(data); // ✅ Store proposals without modifying sort order yet
+      // ✅ A cursor means "append the next page", no cursor means a fresh search
+      setProposals((prev) => (after ? [...prev, ...data.proposals] : data.proposals));
+      setNextCursor(data.next_cursor);
+      setActiveFilters(filters);
     } catch (err) {
       console.error("Error fetching proposals:", err);
       setError("Failed to load proposals.");
       setProposals([]);
+      setNextCursor(null);
     } finally {
       setLoading(false);
     }
@@ -45,7 +51,8 @@ const Proposals = () => {
   // ✅ Debounced search function to prevent excessive API calls
   const debouncedSearch = useCallback(
     debounce(() => {
-      loadProposals({ name: filters.name, client: filters.client, client_name: filters.clientName });
+      // ✅ One full-text query across name, client, client name, quote number and description
+      loadProposals(filters.q.trim() ? { q: filters.q } : {});
     }, 500),
     [filters, loadProposals] // ✅ Re-run when filters change
   );
@@ -75,25 +82,21 @@ const Proposals = () => {
       </h1>
 
       <form className="mb-4">
-        <div className="grid grid-cols-3 gap-3">
-          {["name", "client", "clientName"].map((filterKey, index) => (
-            <div key={index} className="relative flex items-center">
-              <MagnifyingGlassIcon className="absolute left-2 w-5 h-5 text-gray-500" />
-              <input
-                type="text"
-                placeholder={`Search by ${filterKey.replace("Name", " Name")}`}
-                value={filters[filterKey]}
-                onChange={(e) => setFilters((prev) => ({ ...prev, [filterKey]: e.target.value }))}
-                className="border p-2 pl-8 rounded w-full"
-              />
-            </div>
-          ))}
+        <div className="relative flex items-center">
+          <MagnifyingGlassIcon className="absolute left-2 w-5 h-5 text-gray-500" />
+          <input
+            type="text"
+            placeholder="Search by name, client, client name or quote number"
+            value={filters.q}
+            onChange={(e) => setFilters({ q: e.target.value })}
+            className="border p-2 pl-8 rounded w-full"
+          />
         </div>
 
         <div className="flex justify-between mt-3">
           <button
             type="button"
-            onClick={() => setFilters({ name: "", client: "", clientName: "" })}
+            onClick={() => setFilters({ q: "" })}
             className="bg-gray-500 text-white px-4 py-2 rounded flex items-center gap-1 hover:bg-gray-600 transition"
           >
             <XCircleIcon className="w-5 h-5" /> Clear Filters
@@ -162,6 +165,18 @@ const Proposals = () => {
           ))}
         </ul>
       )}
+
+      {nextCursor && !loading && (
+        <div className="flex justify-center mt-4">
+          <button
+            type="button"
+            onClick={() => loadProposals(activeFilters, nextCursor)}
+            className="bg-blue-500 text-white px-4 py-2 rounded hover:bg-blue-600 transition"
+          >
+            Load more
+          </button>
+        </div>
+      )}
     </div>
   );
 };
@@ -5,27 +5,66 @@ from server.config import DevelopmentConfig
 from server.app.routes.get_routes import get_routes_blueprint
 from server.app.routes.post_routes import post_routes_blueprint
 from server.app.routes.put_routes import put_routes_blueprint
+from server.app.routes.patch_routes import patch_routes_blueprint
 from server.app.routes.delete_routes import delete_routes_blueprint
 from server.app.routes.auth_routes import auth_routes_blueprint
 from server.app.routes.user_routes import user_routes_blueprint
+from server.app.routes.export_routes import export_routes_blueprint
+from server.app.routes.admin_routes import admin_routes_blueprint
+from server.app.routes.batch_routes import batch_routes_blueprint
+from server.app.routes.analytics_routes import analytics_routes_blueprint
+from server.app.routes.sync_routes import sync_routes_blueprint
+from server.app.routes.event_routes import event_routes_blueprint
+from server.app.services.export_jobs import export_jobs
+from server.app.passwords import passwords
+from server.sql_metrics import sql_metrics
+from server.compression import compression
+from server.app.commands import rollups_cli, sync_cli
+from server.app.serializers import init_json_provider
 
 
-def create_app():
+def create_app(config_object=DevelopmentConfig):
     app = Flask(__name__)
-    app.config.from_object(DevelopmentConfig)
+    app.config.from_object(config_object)
 
     # Initialize extensions (DB, CORS, etc.)
     init_extensions(app)
 
+    # orjson-backed jsonify()/get_json() (JSON_PROVIDER = "default" to opt out)
+    init_json_provider(app)
+
+    # Per-request query counts, slow-query log and N+1 warnings
+    sql_metrics.init_app(app)
+
+    # gzip/brotli response compression negotiated from Accept-Encoding
+    compression.init_app(app)
+
     # Initialize migration
     migrate = Migrate(app, db)
 
+    # Bounded thread pool for password hashing
+    passwords.init_app(app)
+
+    # Background worker pool for Excel exports
+    export_jobs.init_app(app)
+
+    # CLI commands (`flask rollups repair`, `flask sync prune`)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(sync_cli)
+
     # Register Blueprints
     app.register_blueprint(get_routes_blueprint)
     app.register_blueprint(post_routes_blueprint)
     app.register_blueprint(put_routes_blueprint)
+    app.register_blueprint(patch_routes_blueprint)
     app.register_blueprint(delete_routes_blueprint)
     app.register_blueprint(auth_routes_blueprint, url_prefix="/auth")
     app.register_blueprint(user_routes_blueprint, url_prefix="/users")
+    app.register_blueprint(export_routes_blueprint)
+    app.register_blueprint(admin_routes_blueprint, url_prefix="/admin")
+    app.register_blueprint(batch_routes_blueprint)
+    app.register_blueprint(analytics_routes_blueprint, url_prefix="/analytics")
+    app.register_blueprint(sync_routes_blueprint, url_prefix="/sync")
+    app.register_blueprint(event_routes_blueprint)
 
     return app
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import namedtuple
+from functools import wraps
+from flask import current_app, g, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from server.extensions import db
+from server.app.models import User, _committed_value
+from server.app.services.batch_services import after_outer_commit
+
+# Who is making the request, as far as authorization cares
+Principal = namedtuple("Principal", ["id", "role", "is_active"])
+
+def principal_claims(user):
+    """Claims embedded in access tokens so routes can authorize without reading `users`"""
+    return {"role": user.role, "is_active": user.is_active}
+
+class PrincipalCache:
+    """Short-TTL, per-process cache of Principals loaded from the database.
+
+    Backs `authorize(fresh=True)`, where a role change or deactivation must take effect
+    before the token expires. Local changes evict immediately (see the session hooks
+    below); other worker processes catch up within AUTH_PRINCIPAL_TTL seconds.
+    """
+
+    def __init__(self):
+        self._entries = {}  # user_id -> (expires_at, Principal or None)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        row = db.session.execute(select(User.id, User.role, User.is_active).where(User.id == user_id)).first()
+        principal = Principal(*row) if row else None
+        with self._lock:
+            self._entries[user_id] = (now + current_app.config.get("AUTH_PRINCIPAL_TTL", 30), principal)
+        return principal
+
+    def evict(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+principal_cache = PrincipalCache()
+
+def current_principal():
+    """The Principal authorized for this request by `authorize`"""
+    return g.get("principal")
+
+def authorize(*roles, fresh=False):
+    """Require a valid access token, an active account and, if given, one of `roles`.
+
+    By default the role and active flag come from the token's claims, so the check costs
+    no queries. `fresh=True` reads them through the principal cache instead, for routes
+    where revoking access must not wait for the token to expire. Tokens issued before
+    claims were added also go through the cache.
+    """
+    allowed = {role.lower() for role in roles}
+
+    def wrapper(fn):
+        @wraps(fn)  # Preserve function name
+        @jwt_required()
+        def decorated_function(*args, **kwargs):
+            user_id = int(get_jwt_identity())
+            claims = get_jwt()
+
+            if fresh or "role" not in claims:
+                principal = principal_cache.get(user_id)
+                if principal is None:
+                    return jsonify({"error": "User not found"}), 401
+            else:
+                principal = Principal(user_id, claims["role"], claims.get("is_active", True))
+
+            if not principal.is_active:
+                return jsonify({"error": "Account is disabled"}), 403
+            if allowed and principal.role.lower() not in allowed:
+                return jsonify({"error": "Access denied, insufficient permissions"}), 403
+
+            g.principal = principal
+            return fn(*args, **kwargs)
+        return decorated_function
+    return wrapper
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    changed = {
+        user.id for user in (*session.dirty, *session.deleted)
+        if isinstance(user, User) and (
+            user in session.deleted
+            or any(_committed_value(user, attr) != getattr(user, attr) for attr in ("role", "is_active"))
+        )
+    }
+    if changed:
+        session.info.setdefault("changed_principals", set()).update(changed)
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_principals(session):
+    changed = session.info.pop("changed_principals", None)
+    if changed:
+        after_outer_commit(session, lambda: principal_cache.evict(*changed))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop("changed_principals", None)
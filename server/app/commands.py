@@ -0,0 +1,24 @@
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from server.extensions import cache
+from server.app.services.rollup_services import recompute_rollups
+from server.app.services.sync_services import prune_tombstones
+
+rollups_cli = AppGroup("rollups", help="Maintain the hour rollups on tasks and proposals.")
+
+@rollups_cli.command("repair")
+def repair_rollups_command():
+    """Recompute task and proposal hour totals from their subtasks."""
+    tasks, proposals = recompute_rollups()
+    if tasks or proposals:
+        cache.clear()  # Reaches other workers only with a shared (redis) backend
+    click.echo(f"Repaired rollups on {tasks} task(s) and {proposals} proposal(s).")
+
+sync_cli = AppGroup("sync", help="Maintain the data behind GET /sync/proposals.")
+
+@sync_cli.command("prune")
+def prune_tombstones_command():
+    """Delete tombstones older than SYNC_TOMBSTONE_DAYS."""
+    removed = prune_tombstones(current_app.config["SYNC_TOMBSTONE_DAYS"])
+    click.echo(f"Removed {removed} tombstone(s).")
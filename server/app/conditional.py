@@ -0,0 +1,34 @@
+import hashlib
+from flask import current_app, make_response, request
+from werkzeug.http import is_resource_modified
+
+def make_version(*parts):
+    """Build an (etag, last_modified) version from timestamps, counts and representation flags.
+
+    The ETag hashes every part, so a deleted child (lower count) or a different query
+    variant changes it even when no timestamp moved. Last-Modified is the newest timestamp.
+    """
+    etag = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+    timestamps = [part for part in parts if hasattr(part, "isoformat")]
+    return etag, max(timestamps) if timestamps else None
+
+def conditional_get(version, build):
+    """Return 304 if the client already holds `version`, otherwise the response from `build()`.
+
+    `build` is only called when the representation actually has to be sent, so a
+    revalidation costs just the query that produced `version`.
+    """
+    etag, last_modified = version
+
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = make_response(build())
+        if response.status_code != 200:  # Errors don't get validators
+            return response
+    else:
+        response = current_app.response_class(status=304)
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True  # Browsers may keep it but must revalidate on every use
+    return response
@@ -1,11 +1,19 @@
 from server.extensions import db
 from datetime import datetime
+from functools import lru_cache
+from sqlalchemy import DDL, event, inspect, select, update
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
 import pytz
-from werkzeug.security import generate_password_hash, check_password_hash
+from server.app.passwords import passwords
 
 PR_TZ = pytz.timezone("America/Puerto_Rico")  # Puerto Rico timezone
 UTC_TZ = pytz.utc  # Explicit UTC timezone
 
+# updated_at feeds ETags, so MySQL keeps microseconds (plain DATETIME rounds to the second)
+PRECISE_DATETIME = db.DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+@lru_cache(maxsize=65536)  # Rows in one response often share timestamps (bulk inserts, rollup updates)
 def convert_to_pr_timezone(dt):
     if dt is None:
         return None  # Handle cases where timestamps may be missing
@@ -27,19 +35,43 @@ class Proposal(db.Model):
     budget = db.Column(db.Numeric(10, 2), nullable=True)
     description = db.Column(db.Text, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     business_unit = db.Column(db.String(50), default="In House Project", nullable=False)
     opportunity_status = db.Column(db.String(50), default="Quote", nullable=False)
     resource_name = db.Column(db.String(255), default="Automation Team", nullable=False)
+    # Rollups over all subtasks of the proposal, maintained by the events at the bottom of this module
+    total_hours = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    subtask_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relationship to the User who created the proposal
     user = db.relationship('User', backref=db.backref('proposals', lazy=True))
+
+    __table_args__ = (
+        db.Index('ix_proposals_created_at_id', 'created_at', 'id'),  # Keyset pagination order
+        # Each list filter leads an index that continues in page order, so filtered pages need no sort
+        db.Index('ix_proposals_created_by_created_at_id', 'created_by', 'created_at', 'id'),
+        db.Index('ix_proposals_opportunity_status_created_at_id', 'opportunity_status', 'created_at', 'id'),
+        db.Index('ix_proposals_business_unit_created_at_id', 'business_unit', 'created_at', 'id'),
+        db.Index('ix_proposals_quote_number', 'quote_number'),
+        db.Index('ix_proposals_updated_at_id', 'updated_at', 'id'),  # GET /sync/proposals change feed
+        # Covers GET /analytics/summary by business unit / status / month without reading the wide rows
+        db.Index(
+            'ix_proposals_analytics',
+            'business_unit', 'opportunity_status', 'created_at', 'total_hours', 'subtask_count', 'budget'
+        ),
+        # Full-text search (`q=`); SQLite gets the FTS5 table defined below instead
+        db.Index(
+            'ft_proposals_search', 'name', 'client', 'client_name', 'quote_number', 'description',
+            mysql_prefix='FULLTEXT'
+        ).ddl_if(dialect='mysql'),
+    )
     
     def __repr__(self):
         return f'<Proposal {self.name} - {self.quote_number}>'
         
     def to_dict(self):
+        user = self.user  # Read the relationship once; callers should eager-load it for lists
         return {
             "id": self.id,
             "name": self.name,
@@ -52,29 +84,59 @@ class Proposal(db.Model):
             "created_at": convert_to_pr_timezone(self.created_at),
             "updated_at": convert_to_pr_timezone(self.updated_at),
             "created_by": {
-                "id": self.user.id if self.user else None,
-                "first_name": self.user.first_name if self.user else "Unknown",
-                "last_name": self.user.last_name if self.user else "Unknown",
-            } if self.user else None,  # Include User details if exists
+                "id": user.id,
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+            } if user else None,  # Include User details if exists
             "business_unit": self.business_unit,
             "opportunity_status": self.opportunity_status,
-            "resource_name": self.resource_name
+            "resource_name": self.resource_name,
+            "total_hours": self.total_hours,
+            "subtask_count": self.subtask_count
         }
 
 
 
+# SQLite has no FULLTEXT index, so local/testing databases mirror the searchable
+# columns into an external-content FTS5 table kept in sync by triggers.
+PROPOSAL_SEARCH_COLUMNS = ("name", "client", "client_name", "quote_number", "description")
+_fts_columns = ", ".join(PROPOSAL_SEARCH_COLUMNS)
+_fts_new_values = ", ".join(f"new.{c}" for c in PROPOSAL_SEARCH_COLUMNS)
+_fts_old_values = ", ".join(f"old.{c}" for c in PROPOSAL_SEARCH_COLUMNS)
+
+for _statement in (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS proposals_fts USING fts5({_fts_columns}, "
+    "content='proposals', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS proposals_fts_ai AFTER INSERT ON proposals BEGIN "
+    f"INSERT INTO proposals_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS proposals_fts_ad AFTER DELETE ON proposals BEGIN "
+    f"INSERT INTO proposals_fts(proposals_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old_values}); END",
+    f"CREATE TRIGGER IF NOT EXISTS proposals_fts_au AFTER UPDATE OF {_fts_columns} ON proposals BEGIN "
+    f"INSERT INTO proposals_fts(proposals_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old_values}); "
+    f"INSERT INTO proposals_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new_values}); END",
+):
+    event.listen(Proposal.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+
+event.listen(Proposal.__table__, "before_drop", DDL("DROP TABLE IF EXISTS proposals_fts").execute_if(dialect="sqlite"))
+
+
 class Subtask(db.Model):
     __tablename__ = 'subtasks'
 
     id = db.Column(db.Integer, primary_key=True)
-    task_id = db.Column(db.ForeignKey('tasks.id'), nullable=False, index=True)
+    task_id = db.Column(db.ForeignKey('tasks.id'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
     hours = db.Column(db.Integer, nullable=False, default=0)  # Changed to Integer
     order = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    task = db.relationship('Task', primaryjoin='Subtask.task_id == Task.id', backref='subtasks')
+    task = db.relationship('Task', primaryjoin='Subtask.task_id == Task.id', backref=db.backref('subtasks', order_by='Subtask.order'))
+
+    __table_args__ = (
+        db.Index('ix_subtasks_task_id_order', 'task_id', 'order'),  # A task's subtasks in display order, no sort
+        db.Index('ix_subtasks_updated_at_id', 'updated_at', 'id'),  # GET /sync/proposals change feed
+    )
 
     def to_dict(self):
         """Convert Subtask object to dictionary"""
@@ -93,16 +155,24 @@ class Task(db.Model):
     __tablename__ = 'tasks'
 
     id = db.Column(db.Integer, primary_key=True)
-    proposal_id = db.Column(db.ForeignKey('proposals.id', ondelete='CASCADE'), nullable=False, index=True)
+    proposal_id = db.Column(db.ForeignKey('proposals.id', ondelete='CASCADE'), nullable=False)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
     order = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Rollups over the task's subtasks, maintained by the events at the bottom of this module
+    total_hours = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    subtask_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Relationship with Proposal
     proposal = db.relationship('Proposal', primaryjoin='Task.proposal_id == Proposal.id', backref='tasks')
 
+    __table_args__ = (
+        db.Index('ix_tasks_proposal_id_order', 'proposal_id', 'order'),  # A proposal's tasks in display order, no sort
+        db.Index('ix_tasks_updated_at_id', 'updated_at', 'id'),  # GET /sync/proposals change feed
+    )
+
     def to_dict(self, include_proposal=False, include_subtasks=False):
         """Convert Task object to dictionary, with optional proposal and subtasks"""
         task_dict = {
@@ -113,6 +183,8 @@ class Task(db.Model):
             "order": self.order,
             "created_at": convert_to_pr_timezone(self.created_at),
             "updated_at": convert_to_pr_timezone(self.updated_at),
+            "total_hours": self.total_hours,
+            "subtask_count": self.subtask_count,
         }
 
         if include_proposal:
@@ -123,6 +195,19 @@ class Task(db.Model):
 
         return task_dict
 
+class DeletedRecord(db.Model):
+    """Tombstone of a deleted proposal, task or subtask, so sync clients can drop their copy"""
+    __tablename__ = 'deleted_records'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(20), nullable=False)  # "proposal", "task" or "subtask"
+    entity_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(PRECISE_DATETIME, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_deleted_records_deleted_at_id', 'deleted_at', 'id'),
+    )
+
 class User(db.Model):
     __tablename__ = 'users'
 
@@ -134,18 +219,25 @@ class User(db.Model):
     last_name = db.Column(db.String(50), nullable=True)
     role = db.Column(db.Enum('user', 'admin', 'moderator', name="user_roles"), default='user', nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = db.Column(PRECISE_DATETIME, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True, nullable=False)  # ✅ Ensure it's never NULL
     last_login = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        # GET /users/all filters (username and email are unique, so already indexed)
+        # Single columns: the row ID that every index implicitly ends with keeps results in ID order
+        db.Index('ix_users_role', 'role'),
+        db.Index('ix_users_is_active', 'is_active'),
+    )
+
     # Password hashing methods
     def set_password(self, password):
         """Hash the password before storing it"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = passwords.hash(password)
 
     def check_password(self, password):
         """Check the password against the stored hash"""
-        return check_password_hash(self.password_hash, password)
+        return passwords.verify(self.password_hash, password)
 
     def __repr__(self):
         return f'<User {self.username} - {self.role} - Active: {self.is_active}>'
@@ -161,4 +253,93 @@ class User(db.Model):
             "role": self.role,
             "is_active": self.is_active,  # ✅ Include is_active to easily filter users
             "last_login": self.last_login.isoformat() if self.last_login else None
-        }
\ No newline at end of file
+        }
+
+
+# Hour rollups: every ORM insert/update/delete of a Subtask adjusts its task and proposal
+# with relative UPDATEs inside the same flush, so reads never aggregate. Core bulk inserts
+# bypass these events and must write the totals themselves (see proposal_services).
+
+def _committed_value(target, attr):
+    """Value of `attr` as last loaded from the database, before any pending change"""
+    history = inspect(target).attrs[attr].history
+    return history.deleted[0] if history.deleted else getattr(target, attr)
+
+def _adjust_rollups(connection, task_id, hours, count):
+    if not hours and not count:
+        return
+
+    tasks = Task.__table__
+    proposals = Proposal.__table__
+    connection.execute(
+        update(tasks).where(tasks.c.id == task_id)
+        .values(total_hours=tasks.c.total_hours + hours, subtask_count=tasks.c.subtask_count + count)
+    )
+    connection.execute(
+        update(proposals)
+        .where(proposals.c.id == select(tasks.c.proposal_id).where(tasks.c.id == task_id).scalar_subquery())
+        .values(total_hours=proposals.c.total_hours + hours, subtask_count=proposals.c.subtask_count + count)
+    )
+
+def _move_task_rollups(connection, task_id, from_proposal_id, to_proposal_id):
+    """Shift a task's totals from one proposal to another (or off a proposal, if to is None)"""
+    tasks = Task.__table__
+    proposals = Proposal.__table__
+    task_hours = select(tasks.c.total_hours).where(tasks.c.id == task_id).scalar_subquery()
+    task_count = select(tasks.c.subtask_count).where(tasks.c.id == task_id).scalar_subquery()
+
+    connection.execute(
+        update(proposals).where(proposals.c.id == from_proposal_id)
+        .values(total_hours=proposals.c.total_hours - task_hours, subtask_count=proposals.c.subtask_count - task_count)
+    )
+    if to_proposal_id is not None:
+        connection.execute(
+            update(proposals).where(proposals.c.id == to_proposal_id)
+            .values(total_hours=proposals.c.total_hours + task_hours, subtask_count=proposals.c.subtask_count + task_count)
+        )
+
+@event.listens_for(Subtask, "after_insert")
+def _subtask_inserted(mapper, connection, target):
+    _adjust_rollups(connection, target.task_id, target.hours or 0, 1)
+
+@event.listens_for(Subtask, "after_update")
+def _subtask_updated(mapper, connection, target):
+    old_task_id = _committed_value(target, "task_id")
+    old_hours = _committed_value(target, "hours") or 0
+    new_hours = target.hours or 0
+
+    if old_task_id != target.task_id:
+        _adjust_rollups(connection, old_task_id, -old_hours, -1)
+        _adjust_rollups(connection, target.task_id, new_hours, 1)
+    elif old_hours != new_hours:
+        _adjust_rollups(connection, target.task_id, new_hours - old_hours, 0)
+
+@event.listens_for(Subtask, "after_delete")
+def _subtask_deleted(mapper, connection, target):
+    _adjust_rollups(connection, _committed_value(target, "task_id"), -(_committed_value(target, "hours") or 0), -1)
+
+@event.listens_for(Task, "after_update")
+def _task_updated(mapper, connection, target):
+    old_proposal_id = _committed_value(target, "proposal_id")
+    if old_proposal_id != target.proposal_id:
+        _move_task_rollups(connection, target.id, old_proposal_id, target.proposal_id)
+
+@event.listens_for(Task, "before_delete")
+def _task_deleting(mapper, connection, target):
+    _move_task_rollups(connection, target.id, _committed_value(target, "proposal_id"), None)
+
+@event.listens_for(Session, "after_flush")
+def _note_rollup_changes(session, flush_context):
+    # new/dirty/deleted still describe the flush that just ran at this point
+    if any(isinstance(obj, (Subtask, Task)) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info["rollups_stale"] = True
+
+@event.listens_for(Session, "after_flush_postexec")
+def _expire_stale_rollups(session, flush_context):
+    """The rollup UPDATEs bypass the identity map, so drop any totals it still holds"""
+    if not session.info.pop("rollups_stale", False):
+        return
+
+    for obj in session.identity_map.values():
+        if isinstance(obj, (Task, Proposal)):
+            session.expire(obj, ["total_hours", "subtask_count"])
@@ -0,0 +1,35 @@
+import base64
+import binascii
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def parse_limit(limit, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse a `limit` query parameter, clamping it to the allowed page size"""
+    if limit is None or limit == "":
+        return default
+
+    limit = int(limit)  # Raises ValueError for non-numeric input
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+
+    return min(limit, maximum)
+
+def encode_cursor(values):
+    """Encode keyset values into an opaque, URL-safe cursor string"""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by `encode_cursor`, raising ValueError if it was tampered with"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (TypeError, UnicodeError, json.JSONDecodeError, binascii.Error) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, dict):
+        raise ValueError("Invalid cursor")
+
+    return values
@@ -0,0 +1,108 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, has_app_context, jsonify
+from werkzeug.security import generate_password_hash, check_password_hash
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a hash didn't finish in time; answered with a 503"""
+
+class _AppPasswordHasher:
+    """One app's hashing method, pool and queue slots"""
+
+    def __init__(self, method, timeout=None, workers=0, max_pending=0):
+        self.method = method
+        self.timeout = timeout
+        # Hashing once up front validates the method and yields its canonical "name:params" prefix
+        self.dummy_hash = generate_password_hash(os.urandom(16).hex(), method)
+        self.method_prefix = self.dummy_hash.split("$", 1)[0]
+        if workers > 0:
+            self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+            self.slots = threading.BoundedSemaphore(workers + max_pending)
+        else:
+            self.executor = None
+            self.slots = None
+
+class PasswordHasher:
+    """Runs password hashing on a small dedicated thread pool.
+
+    hashlib's scrypt/pbkdf2 release the GIL, so a login burst hashing inline on every
+    request thread occupies every core at once. Funnelling the work through
+    PASSWORD_HASH_WORKERS threads caps how much CPU hashing can take, and the rest keeps
+    serving other requests; work beyond PASSWORD_HASH_MAX_PENDING is shed with a 503
+    instead of piling up. Each app gets its own pool in app.extensions["passwords"]. With
+    PASSWORD_HASH_WORKERS = 0, or outside an app set up with init_app, hashing runs
+    inline on the calling thread.
+    """
+
+    def __init__(self, app=None):
+        self._inline = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("PASSWORD_HASH_METHOD", "scrypt")  # Any werkzeug method, e.g. "pbkdf2:sha256:600000"
+        app.config.setdefault("PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 2) // 2))
+        app.config.setdefault("PASSWORD_HASH_MAX_PENDING", 64)
+        app.config.setdefault("PASSWORD_HASH_TIMEOUT", 10)  # Seconds a request waits for its hash
+
+        app.extensions["passwords"] = _AppPasswordHasher(
+            app.config["PASSWORD_HASH_METHOD"],
+            timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+            workers=app.config["PASSWORD_HASH_WORKERS"],
+            max_pending=app.config["PASSWORD_HASH_MAX_PENDING"],
+        )
+        # App-wide: passwords are set from more than the auth routes
+        app.register_error_handler(PasswordHasherBusy, _password_hasher_busy)
+
+    def _state(self):
+        if has_app_context() and "passwords" in current_app.extensions:
+            return current_app.extensions["passwords"]
+        if self._inline is None:
+            self._inline = _AppPasswordHasher("scrypt")
+        return self._inline
+
+    def hash(self, password):
+        """Hash `password` with the configured method"""
+        state = self._state()
+        return self._run(state, generate_password_hash, password, state.method)
+
+    def verify(self, password_hash, password):
+        """Check `password` against `password_hash`; with no hash (unknown user) burns the same time and fails"""
+        state = self._state()
+        if password_hash is None:
+            self._run(state, check_password_hash, state.dummy_hash, password)
+            return False
+        return self._run(state, check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if `password_hash` was made with a different method or cost than configured"""
+        return password_hash.split("$", 1)[0] != self._state().method_prefix
+
+    @staticmethod
+    def _run(state, fn, *args):
+        if state.executor is None:
+            return fn(*args)
+
+        if not state.slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = state.executor.submit(fn, *args)
+        except BaseException:
+            state.slots.release()
+            raise
+        future.add_done_callback(lambda _: state.slots.release())  # Slot frees when the work does, not the waiter
+
+        try:
+            return future.result(timeout=state.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy()
+
+def _password_hasher_busy(e):
+    """Hashing queue is saturated (e.g. a login burst): shed load instead of queueing forever"""
+    response = jsonify({"error": "Too many password requests, please try again shortly"})
+    response.headers["Retry-After"] = "1"
+    return response, 503
+
+passwords = PasswordHasher()
@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from server.extensions import cache, db
+from server.db_pool import pool_status
+from server.app.auth import authorize
+
+admin_routes_blueprint = Blueprint("admin_routes_blueprint", __name__)
+
+@admin_routes_blueprint.route("/cache", methods=["GET"])
+@authorize("admin", fresh=True)
+def cache_stats_route():
+    """Hit/miss/eviction counters for sizing the read-through cache"""
+    return jsonify(cache.stats()), 200
+
+@admin_routes_blueprint.route("/cache", methods=["DELETE"])
+@authorize("admin", fresh=True)
+def clear_cache_route():
+    """Drop every cached entry and reset this process's counters"""
+    cache.clear()
+    cache.reset_stats()
+    return jsonify({"message": "Cache cleared"}), 200
+
+@admin_routes_blueprint.route("/pool", methods=["GET"])
+@authorize("admin", fresh=True)
+def pool_stats_route():
+    """Connection pool occupancy, checkout wait times and overflow usage for this process"""
+    return jsonify(pool_status(db.engine)), 200
@@ -0,0 +1,20 @@
+from flask import Blueprint, current_app, jsonify, request
+from server.app.auth import authorize
+from server.app.services.analytics_services import parse_summary_args, get_summary
+
+analytics_routes_blueprint = Blueprint("analytics_routes_blueprint", __name__)
+
+@analytics_routes_blueprint.route("/summary", methods=["GET"])
+@authorize()
+def summary_route():
+    """Hours, subtasks and budget per business_unit / opportunity_status / client / resource_name / month.
+
+    ?group_by=business_unit,month picks the dimensions; business_unit, opportunity_status,
+    client, resource_name, created_by and from / to (YYYY-MM-DD, on created_at) filter.
+    """
+    parsed = parse_summary_args(request.args)
+    if isinstance(parsed[0], dict):  # If an error tuple is returned
+        return jsonify(parsed[0]), parsed[1]
+
+    group_by, filters, date_range = parsed
+    return jsonify(get_summary(group_by, filters, date_range, ttl=current_app.config["ANALYTICS_CACHE_TTL"]))
@@ -1,30 +1,13 @@
 from flask import Blueprint, request, jsonify
-from functools import wraps  # Import wraps
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, get_jwt_identity
 from sqlalchemy import select
 from server.extensions import db
 from server.app.models import User
+from server.app.auth import authorize, current_principal, principal_claims
+from server.app.passwords import passwords
 
 auth_routes_blueprint = Blueprint("auth_routes_blueprint", __name__)
 
-# Role-based access control decorator
-def role_required(required_role):
-    def wrapper(fn):
-        @wraps(fn)  # Preserve function name
-        @jwt_required()
-        def decorated_function(*args, **kwargs):
-            current_user_id = get_jwt_identity()
-            stmt = select(User).where(User.id == current_user_id)
-            user = db.session.execute(stmt).scalar_one_or_none()
-
-            if not user or user.role.lower() != required_role.lower():
-                return jsonify({"error": "Access denied, insufficient permissions"}), 403
-            
-            return fn(*args, **kwargs)
-        return decorated_function
-    return wrapper
-
 @auth_routes_blueprint.route("/register", methods=["POST"])
 def register():
     """Register a new user with hashed password"""
@@ -41,7 +24,7 @@ def register():
     if existing_user:
         return jsonify({"error": "Email is already registered"}), 400
     
-    hashed_password = generate_password_hash(data["password"].strip())
+    hashed_password = passwords.hash(data["password"].strip())  # On the hashing pool, not this thread
     user = User(
         username=data["username"].strip(),
         first_name=data["first_name"].strip(),
@@ -66,14 +49,22 @@ def login():
     stmt = select(User).where(User.email == data["email"].strip())
     user = db.session.execute(stmt).scalar_one_or_none()
 
-    if not user or not check_password_hash(user.password_hash, data["password"].strip()):
+    password = data["password"].strip()
+    # Unknown emails still pay for a hash, so response time doesn't reveal which emails exist
+    if not passwords.verify(user.password_hash if user else None, password):
         return jsonify({"error": "Invalid credentials"}), 401
+
+    # Upgrade hashes made with an older method or cost now that we have the plaintext
+    if passwords.needs_rehash(user.password_hash):
+        user.password_hash = passwords.hash(password)
+        db.session.commit()
     
-    access_token = create_access_token(identity=str(user.id))
+    # Role and active flag ride along as claims, so `authorize` doesn't need to query users
+    access_token = create_access_token(identity=str(user.id), additional_claims=principal_claims(user))
     return jsonify({"message": "Login successful", "access_token": access_token}), 200
 
 @auth_routes_blueprint.route("/me", methods=["GET"])
-@jwt_required()
+@authorize()
 def get_current_user():
     """Return the currently authenticated user's info"""
     current_user_id = get_jwt_identity()
@@ -93,20 +84,20 @@ def get_current_user():
     }), 200
 
 @auth_routes_blueprint.route("/protected", methods=["GET"])
-@jwt_required()
+@authorize()
 def protected():
     """Example of a protected route that requires authentication"""
     current_user_id = get_jwt_identity()
-    return jsonify({"message": "Access granted", "user_id": current_user_id}), 200
+    return jsonify({"message": "Access granted", "user_id": current_user_id, "role": current_principal().role}), 200
 
 @auth_routes_blueprint.route("/admin-only", methods=["GET"])
-@role_required("admin")
+@authorize("admin")
 def admin_only():
     """Example route restricted to admin users"""
     return jsonify({"message": "Access granted, admin permissions verified"}), 200
 
 @auth_routes_blueprint.route("/moderator-only", methods=["GET"])
-@role_required("moderator")
+@authorize("moderator")
 def moderator_only():
     """Example route restricted to moderator users"""
     return jsonify({"message": "Access granted, moderator permissions verified"}), 200
@@ -0,0 +1,23 @@
+from flask import Blueprint, current_app, jsonify, request
+from server.app.services.batch_services import run_batch
+
+batch_routes_blueprint = Blueprint("batch_routes_blueprint", __name__)
+
+@batch_routes_blueprint.route("/batch", methods=["POST"])
+def batch_route():
+    """Run several API calls in one round trip.
+
+    Body: {"requests": [{"id": ..., "method": "GET", "path": "/proposals/1", "body": {...}, "headers": {...}}],
+           "transactional": false}
+    Each sub-request goes through its route's usual auth and validation, with the
+    caller's Authorization header unless it sets its own.
+    """
+    data = request.get_json(silent=True)
+
+    if not isinstance(data, dict) or "requests" not in data:
+        return jsonify({"error": "No input data provided"}), 400
+
+    result, status_code = run_batch(
+        data["requests"], transactional=bool(data.get("transactional")), max_items=current_app.config["BATCH_MAX_REQUESTS"]
+    )
+    return jsonify(result), status_code
@@ -0,0 +1,41 @@
+from flask import Blueprint, current_app, jsonify, request
+from server.extensions import events
+from server.app.services.proposal_services import parse_proposal_ids
+from server.app.streaming import event_stream_response
+
+event_routes_blueprint = Blueprint("event_routes_blueprint", __name__)
+
+MAX_FILTER_IDS = 100
+
+@event_routes_blueprint.route("/events", methods=["GET"])
+def events_route():
+    """Server-Sent Events stream of change notices, optionally only for ?proposal_id=1,2,3.
+
+    Each `change` event carries {"type", "action", "id", "proposal_id"} for a proposal,
+    task or subtask write that has committed; clients refetch what they display. On a
+    `resync` event (the client fell behind) refetch everything.
+    """
+    if not events.enabled:
+        return jsonify({"error": "Change notifications are disabled"}), 404
+
+    keep = None
+    if request.args.get("proposal_id"):
+        proposal_ids = parse_proposal_ids(request.args["proposal_id"], MAX_FILTER_IDS)
+        if isinstance(proposal_ids, tuple):
+            return jsonify(proposal_ids[0]), proposal_ids[1]
+        wanted = set(proposal_ids)
+        keep = lambda notice: notice["proposal_id"] in wanted
+
+    # Every open stream holds a worker thread, so cap them rather than starve other requests
+    if events.subscriber_count() >= current_app.config["EVENTS_MAX_SUBSCRIBERS"]:
+        response = jsonify({"error": "Too many open event streams; try again later"})
+        response.headers["Retry-After"] = "30"
+        return response, 503
+
+    broker = events.broker  # Unsubscribing happens on close, after the app context is gone
+    return event_stream_response(
+        broker.subscribe(),
+        broker.unsubscribe,
+        keep=keep,
+        heartbeat_seconds=current_app.config["EVENTS_HEARTBEAT_SECONDS"],
+    )
@@ -0,0 +1,87 @@
+import tempfile
+from datetime import datetime
+from flask import Blueprint, jsonify, request, send_file
+from flask_jwt_extended import get_jwt_identity
+from server.app.auth import authorize
+from server.app.services.export_services import EXPORT_MIMETYPE, build_export_query, write_proposals_export
+from server.app.services.export_jobs import export_jobs
+
+export_routes_blueprint = Blueprint("export_routes_blueprint", __name__)
+
+@export_routes_blueprint.route("/proposals/export", methods=["GET"])
+@authorize()
+def export_proposals_route():
+    """Download proposals, tasks and subtasks as an Excel workbook"""
+    stmt = build_export_query(
+        business_unit=request.args.get("business_unit"),
+        opportunity_status=request.args.get("opportunity_status"),
+        year=request.args.get("year"),
+    )
+
+    if isinstance(stmt, tuple):  # If an error tuple is returned
+        return jsonify(stmt[0]), stmt[1]
+
+    # Anonymous per-request file: unlinked on creation, gone once the response closes it
+    export_file = tempfile.TemporaryFile()
+    try:
+        write_proposals_export(export_file, stmt)
+        export_file.seek(0)
+    except Exception:
+        export_file.close()
+        raise
+
+    return send_file(
+        export_file,
+        mimetype=EXPORT_MIMETYPE,
+        as_attachment=True,
+        download_name=f"proposals_export_{datetime.utcnow():%Y%m%d_%H%M%S}.xlsx",
+    )
+
+@export_routes_blueprint.route("/exports", methods=["POST"])
+@authorize()
+def create_export_job_route():
+    """Queue an Excel export to run in the background"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"error": "Request body must be a JSON object"}), 400
+    filters = {key: data.get(key) for key in ("business_unit", "opportunity_status", "year")}
+
+    validation = build_export_query(**filters)  # Reject bad filters now rather than in the worker
+    if isinstance(validation, tuple):
+        return jsonify(validation[0]), validation[1]
+
+    job = export_jobs.submit(get_jwt_identity(), filters)
+    if isinstance(job, tuple):
+        return jsonify(job[0]), job[1]
+
+    response = jsonify({"message": "Export queued", "job": job.to_dict()})
+    response.headers["Location"] = f"/exports/{job.id}"
+    return response, 202
+
+@export_routes_blueprint.route("/exports/<job_id>", methods=["GET"])
+@authorize()
+def get_export_job_route(job_id):
+    """Poll the status and progress of a background export"""
+    job = export_jobs.get(job_id, get_jwt_identity())
+    if not job:
+        return jsonify({"error": "Export job not found"}), 404
+
+    return jsonify(job.to_dict()), 200
+
+@export_routes_blueprint.route("/exports/<job_id>/download", methods=["GET"])
+@authorize()
+def download_export_job_route(job_id):
+    """Download the workbook produced by a finished background export"""
+    job = export_jobs.get(job_id, get_jwt_identity())
+    if not job:
+        return jsonify({"error": "Export job not found"}), 404
+
+    if job.status != "finished":
+        return jsonify({"error": f"Export is {job.status}", "job": job.to_dict()}), 409
+
+    return send_file(
+        job.path,
+        mimetype=EXPORT_MIMETYPE,
+        as_attachment=True,
+        download_name=f"proposals_export_{job.finished_at:%Y%m%d_%H%M%S}.xlsx",
+    )
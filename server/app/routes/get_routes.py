@@ -1,10 +1,15 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from server.extensions import db
 from sqlalchemy import select
 from server.app.models import User, Proposal
 from server.app.services.user_services import get_all_users
-from server.app.services.proposal_services import get_filtered_proposals
-from server.app.services.task_services import get_tasks_by_proposal, get_task_by_id
+from server.app.services.proposal_services import (
+    get_filtered_proposals, stream_filtered_proposals, get_proposal_details, get_proposal_version,
+    get_proposal_tree, get_proposal_tree_version, get_proposal_trees, parse_proposal_ids,
+)
+from server.app.services.task_services import get_tasks_by_proposal, get_tasks_version, get_task_version, get_task_by_id as fetch_task_by_id  # Aliased: the view below shares the name
+from server.app.conditional import conditional_get
+from server.app.streaming import wants_ndjson, ndjson_response
 
 get_routes_blueprint = Blueprint("get_routes_blueprint", __name__)
 
@@ -23,55 +28,109 @@ def get_users():
 
     return jsonify([u.to_dict() for u in users]) """
 
-# Fetch all proposals with filtering
+# Fetch proposals with filtering, one keyset page at a time
 @get_routes_blueprint.route("/proposals", methods=["GET"])
 def get_proposals():
     name = request.args.get("name")
     client = request.args.get("client")
     client_name = request.args.get("client_name")  
     created_by = request.args.get("created_by")
+    q = request.args.get("q")  # Full-text search across name, client, client_name, quote_number, description
+    limit = request.args.get("limit")
+    after = request.args.get("after")  # Opaque cursor from the previous page's `next_cursor`
+    exact = {  # Exact-match filters
+        "opportunity_status": request.args.get("opportunity_status"),
+        "business_unit": request.args.get("business_unit"),
+        "quote_number": request.args.get("quote_number"),
+    }
+
+    if wants_ndjson():  # Every matching proposal, one per line, no pages
+        result = stream_filtered_proposals(name, client, client_name, created_by, after=after, q=q, **exact)
+    else:
+        result = get_filtered_proposals(name, client, client_name, created_by, limit=limit, after=after, q=q, **exact)
+
+    # If there's an error (e.g., invalid `created_by` or cursor), return it
+    if isinstance(result, tuple):
+        return jsonify(result[0]), result[1]
+
+    if wants_ndjson():
+        return ndjson_response(result)
+    return jsonify(result)  # {"proposals": [...], "next_cursor": None on the last page}
+
+# Fetch a single proposal by ID (conditional: ETag / Last-Modified)
+@get_routes_blueprint.route("/proposals/<int:proposal_id>", methods=["GET"])
+def get_proposal_by_id(proposal_id):
+    version = get_proposal_version(proposal_id)
+    if not version:
+        return jsonify({"error": "Proposal not found"}), 404  # ✅ Proper error handling
 
-    # Call the function with correct parameters
-    proposals = get_filtered_proposals(name, client, client_name, created_by)
+    def build():
+        proposal = get_proposal_details(proposal_id, etag=version[0])  # Cached per version
+        if not proposal:  # Deleted between the two queries
+            return jsonify({"error": "Proposal not found"}), 404
+        return jsonify(proposal)  # ✅ Return full proposal details
 
-    # If there's an error (e.g., invalid `created_by`), return it
-    if isinstance(proposals, dict) and "error" in proposals:
-        return jsonify(proposals), 400  # ✅ Properly return error response
+    return conditional_get(version, build)
 
-    return jsonify([p.to_dict() for p in proposals])  # ✅ Now properly returns proposals as JSON
+@get_routes_blueprint.route("/proposals/<int:proposal_id>/tree", methods=["GET"])
+def get_proposal_tree_by_id(proposal_id):
+    """Proposal, creator, tasks and subtasks in one response (conditional: ETag / Last-Modified)"""
+    version = get_proposal_tree_version(proposal_id)
+    if not version:
+        return jsonify({"error": "Proposal not found"}), 404
 
-# Fetch a single proposal by ID
-@get_routes_blueprint.route("/proposals/<int:proposal_id>", methods=["GET"])
-def get_proposal_by_id(proposal_id):
-    proposal = db.session.get(Proposal, proposal_id)
-    if not proposal:
-        return jsonify({"error": "Proposal not found"}), 404  # ✅ Proper error handling
+    def build():
+        tree = get_proposal_tree(proposal_id, etag=version[0])  # Cached per version
+        if not tree:  # Deleted between the two queries
+            return jsonify({"error": "Proposal not found"}), 404
+        return jsonify(tree)
+
+    return conditional_get(version, build)
 
-    return jsonify(proposal.to_dict())  # ✅ Return full proposal details
+@get_routes_blueprint.route("/proposals/tree", methods=["GET"])
+def get_proposal_trees_by_ids():
+    """Several proposal trees at once: ?ids=1,2,3 (still three queries in total)"""
+    proposal_ids = parse_proposal_ids(request.args.get("ids"), current_app.config["TREE_MAX_PROPOSALS"])
+    if isinstance(proposal_ids, tuple):
+        return jsonify(proposal_ids[0]), proposal_ids[1]
+
+    trees = get_proposal_trees(proposal_ids)
+    found = {tree["id"] for tree in trees}
+    return jsonify({"proposals": trees, "missing": [i for i in dict.fromkeys(proposal_ids) if i not in found]})
 
 @get_routes_blueprint.route("/proposals/<proposal_id>/tasks", methods=["GET"])
 def get_tasks_by_proposal_id(proposal_id):
-    """Fetch all tasks for a proposal, with optional subtasks"""
+    """Fetch all tasks for a proposal, with optional subtasks (conditional: ETag / Last-Modified)"""
     include_subtasks = request.args.get("include_subtasks", default="false").lower() == "true"
 
-    tasks = get_tasks_by_proposal(proposal_id, include_subtasks=include_subtasks)
+    version = get_tasks_version(proposal_id, include_subtasks=include_subtasks)
 
     # If there's an error (e.g., invalid proposal_id), return it
-    if isinstance(tasks, tuple) and "error" in tasks[0]:
-        return jsonify(tasks[0]), tasks[1]
+    if isinstance(version[0], dict) and "error" in version[0]:
+        return jsonify(version[0]), version[1]
 
-    return jsonify(tasks)
+    return conditional_get(
+        version, lambda: jsonify(get_tasks_by_proposal(proposal_id, include_subtasks=include_subtasks, etag=version[0]))
+    )
 
 @get_routes_blueprint.route("/tasks/<task_id>", methods=["GET"])
 def get_task_by_id(task_id):
-    """Fetch a specific task by ID, with optional proposal and subtasks"""
+    """Fetch a specific task by ID, with optional proposal and subtasks (conditional: ETag / Last-Modified)"""
     include_proposal = request.args.get("include_proposal", default="false").lower() == "true"
     include_subtasks = request.args.get("include_subtasks", default="false").lower() == "true"
 
-    task = get_task_by_id(task_id, include_proposal=include_proposal, include_subtasks=include_subtasks)
+    version = get_task_version(task_id, include_proposal=include_proposal, include_subtasks=include_subtasks)
+    if not version:
+        return jsonify({"error": "Task not found"}), 404
 
     # If there's an error (e.g., invalid task_id), return it
-    if isinstance(task, tuple) and "error" in task[0]:
-        return jsonify(task[0]), task[1]
+    if isinstance(version[0], dict) and "error" in version[0]:
+        return jsonify(version[0]), version[1]
+
+    def build():
+        task = fetch_task_by_id(task_id, include_proposal=include_proposal, include_subtasks=include_subtasks, etag=version[0])
+        if isinstance(task, tuple) and "error" in task[0]:
+            return jsonify(task[0]), task[1]
+        return jsonify(task)
 
-    return jsonify(task)
\ No newline at end of file
+    return conditional_get(version, build)
@@ -0,0 +1,53 @@
+from flask import Blueprint, jsonify, request
+from server.app.auth import authorize
+from server.app.services.order_services import (
+    reorder_tasks, reorder_subtasks, move_task, move_subtask, validate_after_id,
+)
+
+patch_routes_blueprint = Blueprint("patch_routes_blueprint", __name__)
+
+@patch_routes_blueprint.route("/proposals/<int:proposal_id>/tasks/order", methods=["PATCH"])
+@authorize()
+def reorder_tasks_route(proposal_id):
+    """Apply a whole new task order in one UPDATE. Body: {"task_ids": [every task ID, in order]}"""
+    data = request.get_json(silent=True)
+
+    if not data or "task_ids" not in data:
+        return jsonify({"error": "No input data provided"}), 400
+
+    result, status_code = reorder_tasks(proposal_id, data["task_ids"])
+    return jsonify(result), status_code
+
+@patch_routes_blueprint.route("/tasks/<int:task_id>/subtasks/order", methods=["PATCH"])
+@authorize()
+def reorder_subtasks_route(task_id):
+    """Apply a whole new subtask order in one UPDATE. Body: {"subtask_ids": [every subtask ID, in order]}"""
+    data = request.get_json(silent=True)
+
+    if not data or "subtask_ids" not in data:
+        return jsonify({"error": "No input data provided"}), 400
+
+    result, status_code = reorder_subtasks(task_id, data["subtask_ids"])
+    return jsonify(result), status_code
+
+@patch_routes_blueprint.route("/tasks/<int:task_id>/position", methods=["PATCH"])
+@authorize()
+def move_task_route(task_id):
+    """Move one task (usually a one-row update). Body: {"after_id": sibling task ID, or null for the top}"""
+    after_id = validate_after_id(request.get_json(silent=True))
+    if isinstance(after_id, tuple):
+        return jsonify(after_id[0]), after_id[1]
+
+    result, status_code = move_task(task_id, after_id)
+    return jsonify(result), status_code
+
+@patch_routes_blueprint.route("/subtasks/<int:subtask_id>/position", methods=["PATCH"])
+@authorize()
+def move_subtask_route(subtask_id):
+    """Move one subtask (usually a one-row update). Body: {"after_id": sibling subtask ID, or null for the top}"""
+    after_id = validate_after_id(request.get_json(silent=True))
+    if isinstance(after_id, tuple):
+        return jsonify(after_id[0]), after_id[1]
+
+    result, status_code = move_subtask(subtask_id, after_id)
+    return jsonify(result), status_code
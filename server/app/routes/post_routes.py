@@ -1,11 +1,11 @@
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required
-from server.app.services.proposal_services import create_proposal
+from flask import Blueprint, current_app, jsonify, request
+from server.app.auth import authorize
+from server.app.services.proposal_services import create_proposal, create_proposals_bulk
 
 post_routes_blueprint = Blueprint("post_routes_blueprint", __name__)
 
 @post_routes_blueprint.route("/proposals", methods=["POST"])
-@jwt_required()
+@authorize()
 def create_proposal_route():
     data = request.get_json()
     
@@ -14,3 +14,17 @@ def create_proposal_route():
     
     result, status_code = create_proposal(data)
     return jsonify(result), status_code
+
+@post_routes_blueprint.route("/proposals/bulk", methods=["POST"])
+@authorize()
+def create_proposals_bulk_route():
+    """Import many proposals (with tasks and subtasks) in one transaction"""
+    data = request.get_json()
+
+    if not isinstance(data, dict) or "proposals" not in data:
+        return jsonify({"error": "No input data provided"}), 400
+
+    result, status_code = create_proposals_bulk(
+        data["proposals"], max_items=current_app.config["BULK_MAX_PROPOSALS"]
+    )
+    return jsonify(result), status_code
@@ -0,0 +1,25 @@
+from flask import Blueprint, current_app, jsonify, request
+from server.app.services.sync_services import sync_proposals
+
+sync_routes_blueprint = Blueprint("sync_routes_blueprint", __name__)
+
+@sync_routes_blueprint.route("/proposals", methods=["GET"])
+def sync_proposals_route():
+    """Proposals, tasks and subtasks changed since ?since=<next_token of the previous call>, plus deletions.
+
+    Without `since` this starts a full snapshot. Keep calling with `next_token` while
+    `has_more` is true, then poll with the last token. A 410 means the token is older
+    than the tombstones kept, so the client must drop its copy and sync from scratch.
+    """
+    result = sync_proposals(
+        request.args.get("since"),
+        page_size=current_app.config["SYNC_PAGE_SIZE"],
+        settle_seconds=current_app.config["SYNC_SETTLE_SECONDS"],
+        tombstone_days=current_app.config["SYNC_TOMBSTONE_DAYS"],
+    )
+
+    # If there's an error (e.g., invalid or expired token), return it
+    if isinstance(result, tuple):
+        return jsonify(result[0]), result[1]
+
+    return jsonify(result)  # {"proposals", "tasks", "subtasks", "deleted", "next_token", "has_more"}
@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from server.app.services.user_services import get_all_users, update_user_partially, delete_user, soft_delete_user, enable_user
+from server.app.auth import authorize
+from server.app.services.user_services import get_all_users, stream_users, update_user_partially, delete_user, soft_delete_user, enable_user
+from server.app.streaming import wants_ndjson, ndjson_response
 
 user_routes_blueprint = Blueprint("user_routes_blueprint", __name__)
 
@@ -13,15 +14,20 @@ def get_users_route():
     username = request.args.get("username")
     is_active = request.args.get("is_active")
 
-    result = get_all_users(user_id, role, email, username, is_active)
+    if wants_ndjson():  # One user per line, streamed as it's read
+        result = stream_users(user_id, role, email, is_active=is_active, username=username)
+    else:
+        result = get_all_users(user_id, role, email, is_active=is_active, username=username)
     
     if isinstance(result, tuple):  # If an error tuple is returned
         return jsonify(result[0]), result[1]
     
-    return jsonify([user.to_dict() for user in result]), 200
+    if wants_ndjson():
+        return ndjson_response(result)
+    return jsonify(result), 200
 
 @user_routes_blueprint.route("/<int:user_id>", methods=["PATCH"])
-@jwt_required()
+@authorize()
 def update_user_route(user_id):
     """PATCH: Update specific fields of a user."""
     data = request.get_json()
@@ -33,30 +39,24 @@ def update_user_route(user_id):
     return jsonify(result), status_code
 
 @user_routes_blueprint.route("/<int:user_id>", methods=["DELETE"])
-@jwt_required()
+@authorize("admin", fresh=True)
 def delete_user_route(user_id):
     """Delete a user (Admins only)"""
-    current_user_id = get_jwt_identity()
-    
-    result, status_code = delete_user(current_user_id, user_id)
+    result, status_code = delete_user(user_id)
     return jsonify(result), status_code
 
 @user_routes_blueprint.route("/<int:user_id>/disable", methods=["DELETE"])
-@jwt_required()
+@authorize("admin", fresh=True)
 def disable_user_route(user_id):
-    """Soft delete a user (set is_active = False)"""
-    current_user_id = get_jwt_identity()
-
-    result, status_code = soft_delete_user(current_user_id, user_id)
+    """Soft delete a user (set is_active = False, Admins only)"""
+    result, status_code = soft_delete_user(user_id)
     return jsonify(result), status_code
 
 @user_routes_blueprint.route("/<int:user_id>/enable", methods=["PATCH"])
-@jwt_required()
+@authorize("admin", fresh=True)
 def enable_user_route(user_id):
-    """Enable a user (set is_active = True)"""
-    current_user_id = get_jwt_identity()
-
-    result, status_code = enable_user(current_user_id, user_id)
+    """Enable a user (set is_active = True, Admins only)"""
+    result, status_code = enable_user(user_id)
     return jsonify(result), status_code
 
 
@@ -0,0 +1,171 @@
+from datetime import date
+from decimal import Decimal
+from operator import itemgetter
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+from server.app.models import Proposal, Subtask, Task, User, convert_to_pr_timezone
+
+try:
+    import orjson
+except ImportError:  # Optional: without it the app keeps Flask's stdlib-json provider
+    orjson = None
+
+# Row serializers
+#
+# List endpoints select plain columns and turn each Row tuple into a dict with a function
+# built once per layout: one itemgetter pulls every value and dict(zip()) pairs them with
+# their keys, then the few converted columns and nested groups are filled in. That skips ORM instance construction, identity-map bookkeeping and per-attribute
+# descriptor access, which dominate to_dict() on large lists.
+
+def field(key, column, convert=None):
+    """A dict key filled from one selected column, optionally passed through `convert`"""
+    return ("field", key, column, convert)
+
+def group(key, fields):
+    """A nested dict built from `fields`; None when its first column is NULL (e.g. outer join miss)"""
+    return ("group", key, fields)
+
+def to_float(value):
+    return float(value) if value is not None else None
+
+def to_isoformat(value):
+    return value.isoformat() if value is not None else None
+
+class RowSerializer:
+    """Row -> dict serializer built once per layout; `columns` is what to pass to select()"""
+
+    def __init__(self, specs):
+        self.columns = []
+        self.serialize = self._build(specs)
+
+    def _build(self, specs):
+        keys, indices = [], []
+        converted = []  # (key, index, convert)
+        groups = []  # (key, first index, serializer): overwrite their placeholder in place, keeping key order
+        for spec in specs:
+            if spec[0] == "field":
+                _, key, column, convert = spec
+                index = len(self.columns)
+                self.columns.append(column)
+                if convert is not None:
+                    converted.append((key, index, convert))
+            else:
+                _, key, fields = spec
+                index = len(self.columns)
+                groups.append((key, index, self._build(fields)))
+            keys.append(key)
+            indices.append(index)
+
+        keys = tuple(keys)
+        pick = itemgetter(*indices) if len(indices) > 1 else lambda row, index=indices[0]: (row[index],)
+
+        def serialize(row):
+            result = dict(zip(keys, pick(row)))
+            for key, index, convert in converted:
+                result[key] = convert(row[index])
+            for key, index, inner in groups:
+                result[key] = inner(row) if row[index] is not None else None
+            return result
+
+        return serialize
+
+    def __call__(self, row):
+        return self.serialize(row)
+
+    def many(self, rows):
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+# Same shapes as the models' to_dict()
+PROPOSAL_ROW = RowSerializer([
+    field("id", Proposal.id),
+    field("name", Proposal.name),
+    field("site", Proposal.site),
+    field("client", Proposal.client),
+    field("quote_number", Proposal.quote_number),
+    field("client_name", Proposal.client_name),
+    field("budget", Proposal.budget, to_float),
+    field("description", Proposal.description),
+    field("created_at", Proposal.created_at, convert_to_pr_timezone),
+    field("updated_at", Proposal.updated_at, convert_to_pr_timezone),
+    group("created_by", [  # Requires an outer join to User
+        field("id", User.id.label("creator_id")),
+        field("first_name", User.first_name.label("creator_first_name")),
+        field("last_name", User.last_name.label("creator_last_name")),
+    ]),
+    field("business_unit", Proposal.business_unit),
+    field("opportunity_status", Proposal.opportunity_status),
+    field("resource_name", Proposal.resource_name),
+    field("total_hours", Proposal.total_hours),
+    field("subtask_count", Proposal.subtask_count),
+])
+
+TASK_ROW = RowSerializer([
+    field("id", Task.id),
+    field("proposal_id", Task.proposal_id),
+    field("title", Task.title),
+    field("description", Task.description),
+    field("order", Task.order),
+    field("created_at", Task.created_at, convert_to_pr_timezone),
+    field("updated_at", Task.updated_at, convert_to_pr_timezone),
+    field("total_hours", Task.total_hours),
+    field("subtask_count", Task.subtask_count),
+])
+
+SUBTASK_ROW = RowSerializer([
+    field("id", Subtask.id),
+    field("task_id", Subtask.task_id),
+    field("title", Subtask.title),
+    field("hours", Subtask.hours),
+    field("order", Subtask.order),
+    field("created_at", Subtask.created_at, convert_to_pr_timezone),
+    field("updated_at", Subtask.updated_at, convert_to_pr_timezone),
+])
+
+USER_ROW = RowSerializer([
+    field("id", User.id),
+    field("username", User.username),
+    field("email", User.email),
+    field("first_name", User.first_name),
+    field("last_name", User.last_name),
+    field("role", User.role),
+    field("is_active", User.is_active),
+    field("last_login", User.last_login, to_isoformat),
+])
+
+# JSON provider
+
+def _orjson_default(obj):
+    """Types orjson can't encode natively, encoded the way Flask's default provider does"""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):  # Datetimes are passed through to here so they match Flask's HTTP dates
+        return http_date(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify() and request.get_json()"""
+
+    def _options(self, sort_keys, for_response=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if for_response and ((self.compact is None and self._app.debug) or self.compact is False):
+            options |= orjson.OPT_INDENT_2  # Match Flask's pretty-printing in debug mode
+        return options
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_orjson_default, option=self._options(kwargs.get("sort_keys", self.sort_keys))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=self._options(self.sort_keys, for_response=True))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """Install the orjson provider unless disabled by JSON_PROVIDER or orjson is missing"""
+    if orjson is not None and app.config.get("JSON_PROVIDER", "orjson") == "orjson":
+        app.json = ORJSONProvider(app)
@@ -0,0 +1,104 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import select, func
+from server.extensions import db, cache
+from server.app.models import Proposal
+
+# Dimensions GET /analytics/summary can group by; "month" is derived from created_at
+ANALYTICS_DIMENSIONS = ("business_unit", "opportunity_status", "client", "resource_name", "month")
+ANALYTICS_FILTERS = ("business_unit", "opportunity_status", "client", "resource_name")
+
+def _month_column():
+    """created_at truncated to 'YYYY-MM', in the current database's dialect"""
+    if db.session.get_bind().dialect.name == "mysql":
+        return func.date_format(Proposal.created_at, "%Y-%m")
+    return func.strftime("%Y-%m", Proposal.created_at)
+
+def _dimension_column(name):
+    return (_month_column() if name == "month" else getattr(Proposal, name)).label(name)
+
+def _parse_date(value, name):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid {name} parameter, expected YYYY-MM-DD")
+
+def parse_summary_args(args):
+    """Validate the query string of GET /analytics/summary.
+
+    Returns (group_by, filters, date range) or an error tuple.
+    """
+    group_by = [name.strip() for name in (args.get("group_by") or "business_unit").split(",") if name.strip()]
+    unknown = [name for name in group_by if name not in ANALYTICS_DIMENSIONS]
+    if unknown or not group_by:
+        return {"error": f"group_by must be a comma-separated list of {', '.join(ANALYTICS_DIMENSIONS)}"}, 400
+    group_by = list(dict.fromkeys(group_by))  # Drop repeats, keep order
+
+    filters = {name: args[name].strip() for name in ANALYTICS_FILTERS if args.get(name, "").strip()}
+    if args.get("created_by"):
+        try:
+            filters["created_by"] = int(args["created_by"])
+        except ValueError:
+            return {"error": "Invalid created_by parameter"}, 400
+
+    try:
+        start = _parse_date(args["from"], "from") if args.get("from") else None
+        end = _parse_date(args["to"], "to") if args.get("to") else None
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    if start and end and start > end:
+        return {"error": "from must not be after to"}, 400
+
+    return group_by, filters, (start, end)
+
+def get_summary(group_by, filters, date_range, ttl=60):
+    """Proposal count, hours, subtasks and budget per combination of `group_by` values.
+
+    Totals come from the hour rollups kept on each proposal, so this is one GROUP BY over
+    `proposals` rather than a join through every task and subtask. Results are cached for
+    `ttl` seconds and not invalidated on writes: a minute-old summary is fine here.
+    """
+    start, end = date_range
+    key = "analytics:{}:{}:{}:{}".format(
+        ",".join(group_by), ",".join(f"{k}={v}" for k, v in sorted(filters.items())), start or "", end or ""
+    )
+    return cache.get_or_set(key, lambda: _load_summary(group_by, filters, start, end), ttl=ttl)
+
+def _load_summary(group_by, filters, start, end):
+    dimensions = [_dimension_column(name) for name in group_by]
+    stmt = select(
+        *dimensions,
+        func.count(Proposal.id).label("proposal_count"),
+        func.coalesce(func.sum(Proposal.total_hours), 0).label("total_hours"),
+        func.coalesce(func.sum(Proposal.subtask_count), 0).label("subtask_count"),
+        func.sum(Proposal.budget).label("budget"),
+    )
+
+    conditions = [getattr(Proposal, name) == value for name, value in filters.items()]
+    # Range predicates on created_at, like the export's year filter, so indexes stay usable
+    if start:
+        conditions.append(Proposal.created_at >= datetime.combine(start, datetime.min.time()))
+    if end:
+        conditions.append(Proposal.created_at < datetime.combine(end + timedelta(days=1), datetime.min.time()))
+    if conditions:
+        stmt = stmt.where(*conditions)
+
+    stmt = stmt.group_by(*dimensions).order_by(*dimensions)
+
+    rows = []
+    totals = {"proposal_count": 0, "total_hours": 0, "subtask_count": 0, "budget": 0.0}
+    for row in db.session.execute(stmt):
+        entry = row._asdict()
+        entry["total_hours"] = int(entry["total_hours"])
+        entry["subtask_count"] = int(entry["subtask_count"])
+        entry["budget"] = float(entry["budget"]) if entry["budget"] is not None else 0.0
+        for metric in totals:
+            totals[metric] += entry[metric]
+        rows.append(entry)
+
+    totals["budget"] = round(totals["budget"], 2)
+    return {
+        "group_by": group_by,
+        "filters": {**filters, "from": start.isoformat() if start else None, "to": end.isoformat() if end else None},
+        "rows": rows,
+        "totals": totals,
+    }
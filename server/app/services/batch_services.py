@@ -0,0 +1,156 @@
+from flask import current_app, request
+from flask_sqlalchemy.session import Session
+from werkzeug.test import EnvironBuilder
+from server.extensions import db, cache
+
+BATCH_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# Headers a sub-request inherits from the /batch request unless it sets its own
+INHERITED_HEADERS = ("Authorization", "Accept-Language")
+# Response headers copied into each sub-result
+RETURNED_HEADERS = ("ETag", "Last-Modified", "Location", "Retry-After", "X-DB-Queries", "X-DB-Time")
+# Paths a sub-request may not call: /batch itself and endless streams like GET /events
+EXCLUDED_PATHS = {"/batch", "/events"}
+
+class JoinedSession(Session):
+    """Session that runs every statement on the connection it was created with.
+
+    Flask-SQLAlchemy's Session picks an engine per model and ignores `bind`, which would
+    take statements outside the batch's transaction.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        return bind if bind is not None else self.bind
+
+def after_outer_commit(session, callback):
+    """Run `callback` once `session`'s work is really committed.
+
+    Inside a transactional batch a service's commit() only releases a savepoint, so
+    side effects like cache invalidation wait for the batch itself to commit and are
+    dropped if it rolls back. Everywhere else `callback` runs immediately.
+    """
+    pending = session.info.get("after_outer_commit")
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+def _validate_batch(items, max_items):
+    """Return an error message if the list of sub-requests is malformed"""
+    if not isinstance(items, list) or not items:
+        return "requests must be a non-empty list"
+    if len(items) > max_items:
+        return f"Too many requests in one batch (max {max_items})"
+
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not isinstance(item.get("path"), str):
+            return f"requests[{index}] must be an object with a path"
+        if not item["path"].startswith("/") or item["path"].split("?", 1)[0].rstrip("/") in EXCLUDED_PATHS:
+            return f"requests[{index}].path must be an absolute API path other than {' or '.join(sorted(EXCLUDED_PATHS))}"
+        if str(item.get("method", "GET")).upper() not in BATCH_METHODS:
+            return f"requests[{index}].method must be one of {', '.join(sorted(BATCH_METHODS))}"
+        if not isinstance(item.get("headers", {}), dict):
+            return f"requests[{index}].headers must be an object"
+
+    return None
+
+def _dispatch(app, item, index):
+    """Run one sub-request through the app's full request handling and describe its response"""
+    headers = {name: request.headers[name] for name in INHERITED_HEADERS if name in request.headers}
+    headers.update(item.get("headers", {}))
+    builder = EnvironBuilder(
+        path=item["path"],
+        base_url=request.host_url,
+        method=str(item.get("method", "GET")).upper(),
+        headers=headers,
+        json=item.get("body"),
+        environ_base={"REMOTE_ADDR": request.remote_addr},
+    )
+
+    with app.request_context(builder.get_environ()):
+        try:
+            response = app.full_dispatch_request()  # before/after_request hooks, error handlers and all
+        except Exception as e:
+            response = app.handle_exception(e)  # What wsgi_app() would have done: a 500
+
+        if response.is_streamed:
+            # NDJSON, Server-Sent Events and file downloads: some never end, none fit in a JSON batch
+            response.close()
+            return {
+                "id": item.get("id", index),
+                "status": 400,
+                "headers": {},
+                "body": {"error": "Streamed responses can't be returned in a batch"},
+            }
+
+        if response.is_json:
+            body = response.get_json(silent=True)
+        elif response.mimetype.startswith("text/"):
+            body = response.get_data(as_text=True)
+        else:
+            body = None
+        response.close()
+
+    return {
+        "id": item.get("id", index),
+        "status": response.status_code,
+        "headers": {name: response.headers[name] for name in RETURNED_HEADERS if name in response.headers},
+        "body": body,
+    }
+
+def run_batch(items, transactional=False, max_items=20):
+    """Dispatch `items` in order through the app's own routes and collect their responses.
+
+    Independent sub-requests each get their own app context and session, exactly like
+    separate HTTP requests. With `transactional`, all of them share one session on one
+    connection and transaction: services' commits become savepoints, the first response
+    with status >= 400 stops the batch and rolls everything back, and only a fully
+    successful batch commits.
+    """
+    error = _validate_batch(items, max_items)
+    if error:
+        return {"error": error}, 400
+
+    app = current_app._get_current_object()
+    if not transactional:
+        responses = []
+        for index, item in enumerate(items):
+            with app.app_context():  # Fresh g and session per sub-request
+                responses.append(_dispatch(app, item, index))
+        return {"responses": responses}, 200
+
+    responses, committed = [], False
+    with db.engine.connect() as connection:
+        transaction = connection.begin()
+        if connection.dialect.name == "sqlite":
+            # pysqlite defers BEGIN until the first write, so the savepoint would open the
+            # transaction and its RELEASE would commit it; start it explicitly instead
+            connection.exec_driver_sql("BEGIN")
+        callbacks = []
+        try:
+            with app.app_context(), cache.bypass():
+                # Scoped to this app context, so every sub-request below gets this session
+                session = JoinedSession(
+                    **{**db.session.session_factory.kw, "bind": connection, "join_transaction_mode": "create_savepoint"}
+                )
+                session.info["after_outer_commit"] = callbacks
+                db.session.registry.set(session)
+
+                for index, item in enumerate(items):
+                    responses.append(_dispatch(app, item, index))
+                    if responses[-1]["status"] >= 400:
+                        break
+                else:
+                    committed = True
+        finally:
+            if committed:
+                transaction.commit()
+            else:
+                transaction.rollback()
+
+    if committed:
+        for callback in callbacks:
+            callback()
+
+    skipped = [{"id": item.get("id", index), "status": 424, "headers": {}, "body": {"error": "Not run: an earlier request failed"}}
+               for index, item in enumerate(items) if index >= len(responses)]
+    return {"committed": committed, "responses": responses + skipped}, 200
@@ -0,0 +1,74 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from server.extensions import db, cache
+from server.app.models import Proposal, Task, Subtask, User, _committed_value
+from server.app.services.batch_services import after_outer_commit
+
+# Cache tags and write invalidation
+#
+# Every cached read is tagged with the proposal or task it was built from. Any ORM
+# write to a proposal, task, subtask or creator name is turned into the set of tags it
+# makes stale when the session flushes, and those tags are invalidated once the
+# transaction commits (and discarded if it rolls back). Core writes that bypass the
+# ORM must call `invalidate_on_commit` themselves.
+
+def proposal_tag(proposal_id):
+    """Entries built from the proposal row, its task list or its whole tree"""
+    return f"proposal:{proposal_id}"
+
+def task_tag(task_id):
+    """Entries built from one task (GET /tasks/<id> in any variant)"""
+    return f"task:{task_id}"
+
+def invalidate_on_commit(proposal_ids=(), task_ids=()):
+    """Invalidate these proposals and tasks when the current transaction commits"""
+    tags = db.session.info.setdefault("cache_tags", set())
+    tags.update(proposal_tag(proposal_id) for proposal_id in proposal_ids)
+    tags.update(task_tag(task_id) for task_id in task_ids)
+
+@event.listens_for(Session, "after_flush")
+def _collect_stale_tags(session, flush_context):
+    if not cache.enabled:
+        return
+
+    proposal_ids, task_ids, creator_ids = set(), set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Proposal):
+            proposal_ids.add(obj.id)
+        elif isinstance(obj, Task):
+            task_ids.add(obj.id)
+            proposal_ids.update((obj.proposal_id, _committed_value(obj, "proposal_id")))
+        elif isinstance(obj, Subtask):
+            task_ids.update((obj.task_id, _committed_value(obj, "task_id")))
+        elif isinstance(obj, User) and obj not in session.new:
+            if any(_committed_value(obj, attr) != getattr(obj, attr) for attr in ("first_name", "last_name")):
+                creator_ids.add(obj.id)  # Creator names are embedded in proposal payloads
+
+    if not (proposal_ids or task_ids or creator_ids):
+        return
+
+    # Subtask and task changes move the rollups on their proposal, and proposal payloads
+    # are embedded in every task of it (include_proposal), so widen both ways
+    connection = session.connection()
+    if task_ids:
+        proposal_ids.update(connection.scalars(select(Task.proposal_id).where(Task.id.in_(task_ids))))
+    if creator_ids:
+        proposal_ids.update(connection.scalars(select(Proposal.id).where(Proposal.created_by.in_(creator_ids))))
+    proposal_ids.discard(None)
+    if proposal_ids:
+        task_ids.update(connection.scalars(select(Task.id).where(Task.proposal_id.in_(proposal_ids))))
+    task_ids.discard(None)
+
+    tags = session.info.setdefault("cache_tags", set())
+    tags.update(proposal_tag(proposal_id) for proposal_id in proposal_ids)
+    tags.update(task_tag(task_id) for task_id in task_ids)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_stale_tags(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        after_outer_commit(session, lambda: cache.invalidate(*tags))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale_tags(session):
+    session.info.pop("cache_tags", None)
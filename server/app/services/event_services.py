@@ -0,0 +1,74 @@
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+from server.extensions import db, events
+from server.app.models import Proposal, Task, Subtask, _committed_value
+from server.app.services.batch_services import after_outer_commit
+# Registers the cache hooks first, so caches are invalidated before clients hear of a change
+from server.app.services import cache_services  # noqa: F401
+
+# Change notices for GET /events
+#
+# ORM writes to proposals, tasks and subtasks are turned into notices when the session
+# flushes, published once the transaction commits and dropped if it rolls back (inside a
+# transactional batch, once the whole batch commits). Core writes that bypass the ORM
+# must call `notify_on_commit` themselves.
+
+def change_notice(kind, action, item_id, proposal_id):
+    return {"type": kind, "action": action, "id": item_id, "proposal_id": proposal_id}
+
+def notify_on_commit(*notices):
+    """Publish these notices when the current transaction commits"""
+    db.session.info.setdefault("change_notices", []).extend(notices)
+
+def _action(session, obj):
+    if obj in session.new:
+        return "created"
+    if obj in session.deleted:
+        return "deleted"
+    return "updated" if session.is_modified(obj, include_collections=False) else None
+
+@event.listens_for(Session, "after_flush")
+def _collect_notices(session, flush_context):
+    if not events.enabled:
+        return
+
+    changed = []
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Proposal, Task, Subtask)):
+            action = _action(session, obj)
+            if action:
+                changed.append((obj, action))
+    if not changed:
+        return
+
+    # Subtasks only know their task; one query finds the proposals of all of them
+    task_ids = {_committed_value(obj, "task_id") for obj, _ in changed if isinstance(obj, Subtask)}
+    proposal_of_task = {}
+    if task_ids:
+        proposal_of_task = dict(session.connection().execute(
+            select(Task.id, Task.proposal_id).where(Task.id.in_(task_ids))
+        ).all())
+
+    notices = session.info.setdefault("change_notices", [])
+    for obj, action in changed:
+        if isinstance(obj, Proposal):
+            notices.append(change_notice("proposal", action, obj.id, obj.id))
+        elif isinstance(obj, Task):
+            notices.append(change_notice("task", action, obj.id, _committed_value(obj, "proposal_id")))
+            if action == "updated" and _committed_value(obj, "proposal_id") != obj.proposal_id:
+                notices.append(change_notice("task", "created", obj.id, obj.proposal_id))  # Moved to another proposal
+        else:
+            task_id = _committed_value(obj, "task_id")
+            notices.append(change_notice("subtask", action, obj.id, proposal_of_task.get(task_id)))
+
+@event.listens_for(Session, "after_commit")
+def _publish_notices(session):
+    notices = session.info.pop("change_notices", None)
+    if notices:
+        # The callback can run after the app context is gone (a transactional batch), so take the broker now
+        broker = events.broker
+        after_outer_commit(session, lambda: events.publish(notices, broker))
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notices(session):
+    session.info.pop("change_notices", None)
@@ -0,0 +1,211 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from flask import current_app
+from server.extensions import db
+from server.app.services.export_services import build_export_query, count_export_rows, write_proposals_export
+
+logger = logging.getLogger(__name__)
+
+class ExportTimeout(Exception):
+    """Raised inside a worker when a job runs past its time budget"""
+
+class ExportJob:
+    """State of one background Excel export, as reported to the client"""
+
+    def __init__(self, owner_id, filters):
+        self.id = uuid.uuid4().hex
+        self.owner_id = owner_id
+        self.filters = filters
+        self.status = "queued"  # queued -> running -> finished | failed
+        self.total_rows = None
+        self.rows_written = 0
+        self.error = None
+        self.path = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.expires_at_monotonic = None
+
+    def to_dict(self):
+        progress = None
+        if self.status == "finished":
+            progress = 100.0
+        elif self.total_rows:
+            progress = round(100.0 * self.rows_written / self.total_rows, 1)
+
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filters": self.filters,
+            "total_rows": self.total_rows,
+            "rows_written": self.rows_written,
+            "progress": progress,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+class _AppExportJobs:
+    """One app's jobs, worker pool and artifact directory"""
+
+    def __init__(self, app):
+        self.app = app
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=app.config["EXPORT_MAX_WORKERS"], thread_name_prefix="export-worker")
+        self.artifact_dir = app.config["EXPORT_ARTIFACT_DIR"]
+        self.ttl = app.config["EXPORT_ARTIFACT_TTL"]
+        self.next_sweep = 0.0
+
+class ExportJobQueue:
+    """Runs Excel exports on a bounded thread pool and keeps the artifacts until they expire.
+
+    Each app gets its own pool and job table in app.extensions["export_jobs"]; calls act
+    on the current app's. Jobs live in this process only, so status polls and downloads
+    must reach the worker process that accepted the job (e.g. a single worker or sticky
+    sessions).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("EXPORT_MAX_WORKERS", 2)
+        app.config.setdefault("EXPORT_MAX_PENDING", 20)
+        app.config.setdefault("EXPORT_JOB_TIMEOUT", 300)
+        app.config.setdefault("EXPORT_ARTIFACT_TTL", 3600)
+        app.config.setdefault("EXPORT_ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "jca_exports"))
+        app.config.setdefault("EXPORT_SWEEP_INTERVAL", 300)  # Seconds between sweeps of the artifact directory
+
+        os.makedirs(app.config["EXPORT_ARTIFACT_DIR"], exist_ok=True)
+        state = _AppExportJobs(app)
+        app.extensions["export_jobs"] = state
+        self._sweep_artifacts(state)  # Files left behind by a previous or crashed process
+
+    @staticmethod
+    def _state():
+        return current_app.extensions["export_jobs"]
+
+    def submit(self, owner_id, filters):
+        """Queue a new export, or return an error tuple if the queue is full"""
+        state = self._state()
+        self.cleanup_expired()
+
+        with state.lock:
+            pending = sum(1 for job in state.jobs.values() if job.status in ("queued", "running"))
+            if pending >= state.app.config["EXPORT_MAX_PENDING"]:
+                return {"error": "Too many exports in progress, try again later"}, 429
+
+            job = ExportJob(owner_id, filters)
+            state.jobs[job.id] = job
+
+        state.executor.submit(self._run, state, job)
+        return job
+
+    def get(self, job_id, owner_id):
+        """Fetch a job visible to `owner_id`, or None"""
+        state = self._state()
+        self.cleanup_expired()
+
+        with state.lock:
+            job = state.jobs.get(job_id)
+
+        if not job or job.owner_id != owner_id:
+            return None
+        return job
+
+    def cleanup_expired(self):
+        """Forget finished or failed jobs past their TTL and delete their artifacts.
+
+        Every EXPORT_SWEEP_INTERVAL seconds this also sweeps the artifact directory, which
+        catches files of jobs this process never knew about.
+        """
+        state = self._state()
+        now = time.monotonic()
+        with state.lock:
+            expired = [job for job in state.jobs.values()
+                       if job.expires_at_monotonic is not None and job.expires_at_monotonic <= now]
+            for job in expired:
+                del state.jobs[job.id]
+            sweep = now >= state.next_sweep
+
+        for job in expired:
+            self._remove_file(job.path)
+        if sweep:
+            self._sweep_artifacts(state)
+
+    def _sweep_artifacts(self, state):
+        """Delete workbooks and partial files in the artifact directory older than the TTL"""
+        state.next_sweep = time.monotonic() + state.app.config["EXPORT_SWEEP_INTERVAL"]
+        cutoff = time.time() - state.ttl
+        try:
+            entries = list(os.scandir(state.artifact_dir))
+        except OSError:
+            logger.warning("Could not list export artifacts in %s", state.artifact_dir)
+            return
+
+        for entry in entries:
+            if not entry.name.endswith((".xlsx", ".xlsx.part")):
+                continue
+            try:
+                stale = entry.is_file() and entry.stat().st_mtime < cutoff
+            except OSError:  # Removed by another process meanwhile
+                continue
+            if stale:
+                self._remove_file(entry.path)
+
+    def _run(self, state, job):
+        """Worker body: runs in its own app context, and therefore its own DB session"""
+        with state.app.app_context():
+            config = state.app.config
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            deadline = time.monotonic() + config["EXPORT_JOB_TIMEOUT"]
+            final_path = os.path.join(config["EXPORT_ARTIFACT_DIR"], f"{job.id}.xlsx")
+            part_path = final_path + ".part"
+
+            def report_progress(rows_written):
+                job.rows_written = rows_written
+                if time.monotonic() > deadline:  # Checked between batches, so a job overruns by at most one batch
+                    raise ExportTimeout()
+
+            try:
+                stmt = build_export_query(**job.filters)
+                job.total_rows = count_export_rows(stmt)
+
+                with open(part_path, "wb") as part_file:
+                    write_proposals_export(part_file, stmt, progress=report_progress)
+
+                os.replace(part_path, final_path)  # Downloads never see a half-written file
+                job.path = final_path
+                job.status = "finished"
+            except ExportTimeout:
+                job.status = "failed"
+                job.error = f"Export timed out after {config['EXPORT_JOB_TIMEOUT']} seconds"
+            except Exception as e:
+                logger.exception("Export job %s failed", job.id)
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                db.session.remove()
+                self._remove_file(part_path)
+                job.finished_at = datetime.utcnow()
+                job.expires_at_monotonic = time.monotonic() + config["EXPORT_ARTIFACT_TTL"]
+
+    @staticmethod
+    def _remove_file(path):
+        if path and os.path.exists(path):
+            try:
+                os.remove(path)
+            except OSError:
+                logger.warning("Could not remove export artifact %s", path)
+
+export_jobs = ExportJobQueue()
@@ -0,0 +1,118 @@
+import logging
+from datetime import datetime
+import xlsxwriter
+from sqlalchemy import select, func
+from server.extensions import db
+from server.app.models import Proposal, Subtask, Task
+
+EXPORT_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_BATCH_SIZE = 1000  # Rows pulled from the server-side cursor per round trip
+XLSX_MAX_ROWS = 1048576  # Per worksheet, header included; larger exports continue on another sheet
+
+logger = logging.getLogger(__name__)
+
+# (Header, column, width, cell format) in sheet order
+EXPORT_COLUMNS = [
+    ("Quote Number", Proposal.quote_number, 14, None),
+    ("Proposal Name", Proposal.name, 32, None),
+    ("Site", Proposal.site, 24, None),
+    ("Client", Proposal.client, 24, None),
+    ("Client Name", Proposal.client_name, 24, None),
+    ("Business Unit", Proposal.business_unit, 18, None),
+    ("Opportunity Status", Proposal.opportunity_status, 18, None),
+    ("Resource Name", Proposal.resource_name, 20, None),
+    ("Budget", Proposal.budget, 14, "money"),
+    ("Created At", Proposal.created_at, 18, "date"),
+    ("Task Order", Task.order, 10, None),
+    ("Task Title", Task.title, 32, None),
+    ("Task Description", Task.description, 40, None),
+    ("Subtask Order", Subtask.order, 12, None),
+    ("Subtask Title", Subtask.title, 32, None),
+    ("Subtask Hours", Subtask.hours, 12, None),
+]
+
+def build_export_query(business_unit=None, opportunity_status=None, year=None):
+    """Build the flattened proposal ⋈ task ⋈ subtask query behind the Excel export"""
+    stmt = (
+        select(*[column for _, column, _, _ in EXPORT_COLUMNS])
+        .select_from(Proposal)
+        .outerjoin(Task, Task.proposal_id == Proposal.id)  # Keep proposals without tasks
+        .outerjoin(Subtask, Subtask.task_id == Task.id)  # Keep tasks without subtasks
+    )
+
+    conditions = []
+    if business_unit and business_unit.strip():
+        conditions.append(Proposal.business_unit == business_unit.strip())
+    if opportunity_status and opportunity_status.strip():
+        conditions.append(Proposal.opportunity_status == opportunity_status.strip())
+    if year:
+        try:
+            year = int(year)
+            # Range predicate instead of YEAR(created_at) so an index on created_at stays usable
+            conditions.append(Proposal.created_at >= datetime(year, 1, 1))
+            conditions.append(Proposal.created_at < datetime(year + 1, 1, 1))
+        except ValueError:
+            return {"error": "Invalid year parameter"}, 400
+
+    if conditions:
+        stmt = stmt.where(*conditions)
+
+    return stmt.order_by(Proposal.id, Task.order, Task.id, Subtask.order, Subtask.id)
+
+def count_export_rows(stmt):
+    """Count the rows an export query will produce, used to report job progress"""
+    return db.session.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar()
+
+def _add_export_sheet(workbook, number, formats):
+    """Add the `number`th (1-based) sheet of an export, with its header row"""
+    worksheet = workbook.add_worksheet("Proposals" if number == 1 else f"Proposals {number}")
+    for col, (header, _, width, _) in enumerate(EXPORT_COLUMNS):
+        worksheet.set_column(col, col, width)
+        worksheet.write_string(0, col, header, formats["header"])
+    worksheet.freeze_panes(1, 0)
+    return worksheet
+
+def write_proposals_export(fileobj, stmt, progress=None, sheet_rows=XLSX_MAX_ROWS - 1):
+    """Stream the rows of `stmt` into an xlsx workbook written to `fileobj`, returning the row count.
+
+    Rows come from a server-side cursor in batches and xlsxwriter runs in constant_memory
+    mode, so neither side ever holds more than a batch of rows regardless of export size.
+    Every `sheet_rows` rows (the xlsx limit by default) the export continues on a new
+    sheet. `progress`, if given, is called with the running row count after every batch
+    and may raise to abort the export.
+    """
+    workbook = xlsxwriter.Workbook(fileobj, {"constant_memory": True})
+    formats = {
+        "header": workbook.add_format({"bold": True}),
+        "money": workbook.add_format({"num_format": "#,##0.00"}),
+        "date": workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"}),
+    }
+    cell_formats = [formats.get(fmt) for _, _, _, fmt in EXPORT_COLUMNS]
+    worksheet = _add_export_sheet(workbook, 1, formats)
+
+    row_count = 0
+    truncated = 0
+    try:
+        result = db.session.execute(stmt.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        for row_count, row in enumerate(result, start=1):
+            sheet_number, sheet_row = divmod(row_count - 1, sheet_rows)
+            if sheet_row == 0 and sheet_number:
+                worksheet = _add_export_sheet(workbook, sheet_number + 1, formats)
+            for col, value in enumerate(row):
+                # constant_memory needs rows in order
+                status = worksheet.write(sheet_row + 1, col, value, cell_formats[col])
+                if status == -2:  # Text over Excel's 32,767 characters per cell was cut short
+                    truncated += 1
+                elif status < 0:
+                    raise ValueError(f"Could not write export row {row_count}, column {col + 1} (xlsxwriter error {status})")
+            if progress and row_count % EXPORT_BATCH_SIZE == 0:
+                progress(row_count)
+    finally:
+        workbook.close()
+
+    if truncated:
+        logger.warning("Export truncated %d cell(s) to Excel's 32,767 character limit", truncated)
+    if progress:
+        progress(row_count)
+
+    return row_count
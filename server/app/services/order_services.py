@@ -0,0 +1,164 @@
+from sqlalchemy import and_, case, or_, select, update
+from server.extensions import db
+from server.app.models import Task, Subtask, Proposal
+from server.app.services.cache_services import invalidate_on_commit
+from server.app.services.event_services import change_notice, notify_on_commit
+
+# Display order keys
+#
+# Siblings are numbered ORDER_GAP apart, so moving one item between two others writes a
+# key halfway between theirs and touches only that row. About ten moves into the same
+# spot use up a gap; the next one there renumbers the siblings with a single UPDATE,
+# which restores every gap. These UPDATEs bypass the ORM, hence the explicit cache
+# invalidation and change notices below.
+
+ORDER_GAP = 1024
+
+def gapped_order(position):
+    """Order key for the item at 0-based `position` of a freshly numbered list"""
+    return (position + 1) * ORDER_GAP
+
+def _renumber(model, parent_column, parent_id, ids):
+    """Give `ids` evenly spaced keys in list order with one set-based UPDATE"""
+    keys = {item_id: gapped_order(position) for position, item_id in enumerate(ids)}
+    db.session.execute(
+        update(model)
+        .where(parent_column == parent_id, model.id.in_(keys))
+        .values(order=case(keys, value=model.id, else_=model.order)),
+        execution_options={"synchronize_session": False},
+    )
+    return keys
+
+def _reorder(model, parent_column, parent_id, ids, field):
+    """Renumber all children of a parent to the order of `ids`, or return an error tuple"""
+    if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        return {"error": f"{field} must be a list of IDs"}, 400
+
+    current = set(db.session.scalars(select(model.id).where(parent_column == parent_id)))
+    if len(ids) != len(current) or set(ids) != current:
+        return {"error": f"{field} must list every current ID exactly once"}, 400
+
+    keys = _renumber(model, parent_column, parent_id, ids) if ids else {}
+    return [{"id": item_id, "order": keys[item_id]} for item_id in ids]
+
+def _move(model, parent_column, parent_id, item_id, after_id):
+    """Place an item right after sibling `after_id` (first, if None).
+
+    Reads at most two neighbouring rows through the (parent, order) index and updates one
+    row, unless the neighbours' keys are adjacent and the list has to be renumbered.
+    Returns the item's new key and the IDs whose keys changed.
+    """
+    if after_id == item_id:
+        return {"error": "after_id must be the ID of another item"}, 400
+
+    siblings = select(model.order).where(parent_column == parent_id, model.id != item_id)
+    if after_id is None:
+        lower = None
+        upper = db.session.scalar(siblings.order_by(model.order, model.id).limit(1))
+    else:
+        lower = db.session.scalar(select(model.order).where(model.id == after_id, parent_column == parent_id))
+        if lower is None:
+            return {"error": "after_id must be the ID of a sibling"}, 400
+        # Next sibling in display order; equal keys are ordered by ID
+        upper = db.session.scalar(
+            siblings.where(or_(model.order > lower, and_(model.order == lower, model.id > after_id)))
+            .order_by(model.order, model.id).limit(1)
+        )
+
+    if upper is None:
+        key = (lower if lower is not None else 0) + ORDER_GAP  # Last (or only) item
+    elif lower is None:
+        key = upper - ORDER_GAP  # First item; keys may go below zero
+    elif upper - lower >= 2:
+        key = (lower + upper) // 2
+    else:
+        # No free key between the neighbours
+        ids = list(db.session.scalars(
+            select(model.id).where(parent_column == parent_id, model.id != item_id).order_by(model.order, model.id)
+        ))
+        ids.insert(ids.index(after_id) + 1, item_id)
+        keys = _renumber(model, parent_column, parent_id, ids)
+        return keys[item_id], ids
+
+    db.session.execute(
+        update(model).where(model.id == item_id).values(order=key),
+        execution_options={"synchronize_session": False},
+    )
+    return key, [item_id]
+
+def _commit(result, proposal_ids, task_ids, notices):
+    try:
+        invalidate_on_commit(proposal_ids=proposal_ids, task_ids=task_ids)
+        notify_on_commit(*notices)
+        db.session.commit()
+        return result, 200
+    except Exception as e:
+        db.session.rollback()
+        return {"error": "Database error", "details": str(e)}, 500
+
+def reorder_tasks(proposal_id, task_ids):
+    """Set the display order of every task of a proposal (IDs in their new order)"""
+    if db.session.get(Proposal, proposal_id) is None:
+        return {"error": "Proposal not found"}, 404
+
+    order = _reorder(Task, Task.proposal_id, proposal_id, task_ids, "task_ids")
+    if isinstance(order, tuple):
+        return order
+
+    notices = [change_notice("task", "updated", task_id, proposal_id) for task_id in task_ids]
+    return _commit({"message": "Tasks reordered", "tasks": order}, [proposal_id], task_ids, notices)
+
+def reorder_subtasks(task_id, subtask_ids):
+    """Set the display order of every subtask of a task (IDs in their new order)"""
+    proposal_id = db.session.scalar(select(Task.proposal_id).where(Task.id == task_id))
+    if proposal_id is None:
+        return {"error": "Task not found"}, 404
+
+    order = _reorder(Subtask, Subtask.task_id, task_id, subtask_ids, "subtask_ids")
+    if isinstance(order, tuple):
+        return order
+
+    notices = [change_notice("subtask", "updated", subtask_id, proposal_id) for subtask_id in subtask_ids]
+    return _commit({"message": "Subtasks reordered", "subtasks": order}, [proposal_id], [task_id], notices)
+
+def move_task(task_id, after_id):
+    """Move one task right after another task of its proposal, or to the top if `after_id` is None"""
+    proposal_id = db.session.scalar(select(Task.proposal_id).where(Task.id == task_id))
+    if proposal_id is None:
+        return {"error": "Task not found"}, 404
+
+    moved = _move(Task, Task.proposal_id, proposal_id, task_id, after_id)
+    if isinstance(moved[0], dict):
+        return moved
+
+    key, changed_ids = moved
+    notices = [change_notice("task", "updated", changed_id, proposal_id) for changed_id in changed_ids]
+    return _commit({"message": "Task moved", "task": {"id": task_id, "order": key}}, [proposal_id], changed_ids, notices)
+
+def move_subtask(subtask_id, after_id):
+    """Move one subtask right after another subtask of its task, or to the top if `after_id` is None"""
+    row = db.session.execute(
+        select(Subtask.task_id, Task.proposal_id).join(Task, Task.id == Subtask.task_id).where(Subtask.id == subtask_id)
+    ).first()
+    if row is None:
+        return {"error": "Subtask not found"}, 404
+
+    moved = _move(Subtask, Subtask.task_id, row.task_id, subtask_id, after_id)
+    if isinstance(moved[0], dict):
+        return moved
+
+    key, changed_ids = moved
+    notices = [change_notice("subtask", "updated", changed_id, row.proposal_id) for changed_id in changed_ids]
+    return _commit(
+        {"message": "Subtask moved", "subtask": {"id": subtask_id, "order": key}}, [row.proposal_id], [row.task_id], notices
+    )
+
+def validate_after_id(data):
+    """The `after_id` of a move request: an ID, or None to move to the top"""
+    if not isinstance(data, dict) or "after_id" not in data:
+        return {"error": "after_id is required (null moves to the top)"}, 400
+
+    after_id = data["after_id"]
+    if after_id is not None and (not isinstance(after_id, int) or isinstance(after_id, bool)):
+        return {"error": "after_id must be an ID or null"}, 400
+    return after_id
@@ -1,20 +1,134 @@
+from datetime import datetime
 from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from sqlalchemy import select
-from sqlalchemy.orm import load_only
-from server.extensions import db
-from server.app.models import Proposal, Subtask, Task
+from sqlalchemy import select, insert, func, distinct, or_, and_
+from sqlalchemy.orm import load_only, joinedload, selectinload
+from server.extensions import db, cache
+from server.app.models import Proposal, Subtask, Task, User
+from server.app.pagination import parse_limit, encode_cursor, decode_cursor
+from server.app.services.search_services import apply_proposal_search
+from server.app.serializers import PROPOSAL_ROW
+from server.app.streaming import stream_rows
+from server.app.conditional import make_version
+from server.app.services.cache_services import proposal_tag, invalidate_on_commit
+from server.app.services.event_services import change_notice, notify_on_commit
+from server.app.services.task_services import load_tasks
+from server.app.services.order_services import gapped_order
 
-def get_filtered_proposals(name=None, client=None, client_name=None, created_by=None):
-    """Fetch proposals with filtering based on the latest Proposal model."""
-    
-    stmt = select(Proposal).options(
-        load_only(
-            Proposal.id, Proposal.name, Proposal.site, Proposal.client, Proposal.client_name, 
-            Proposal.quote_number, Proposal.opportunity_status, Proposal.budget, 
-            Proposal.description, Proposal.created_at, Proposal.created_by,
-            Proposal.business_unit, Proposal.resource_name
+def creator_loader():
+    """Eager-load strategy for the proposal creator, limited to the fields `to_dict` reads"""
+    return joinedload(Proposal.user).load_only(User.id, User.first_name, User.last_name)
+
+def get_proposal(proposal_id):
+    """Fetch a single proposal together with its creator in one SELECT"""
+    return db.session.get(Proposal, proposal_id, options=[creator_loader()])
+
+def get_proposal_details(proposal_id, etag=""):
+    """Serialized proposal for GET /proposals/<id>, read through the cache; None if missing.
+
+    Pass the ETag the response will carry: it's part of the cache key, so a worker whose
+    cache missed another worker's invalidation can't send the old body under the new ETag.
+    """
+    def load():
+        proposal = get_proposal(proposal_id)
+        return proposal.to_dict() if proposal else None
+
+    return cache.get_or_set(f"proposal:{proposal_id}:{etag}", load, tags=[proposal_tag(proposal_id)])
+
+def get_proposal_version(proposal_id):
+    """Version of GET /proposals/<id> from its own and its creator's timestamps, or None if missing"""
+    stmt = (
+        select(Proposal.updated_at, User.updated_at)
+        .outerjoin(User, User.id == Proposal.created_by)
+        .where(Proposal.id == proposal_id)
+    )
+    row = db.session.execute(stmt).first()
+    if row is None:
+        return None
+
+    return make_version("proposal", proposal_id, *row)
+
+def get_proposal_trees(proposal_ids):
+    """Serialized proposals with their creator, ordered tasks and ordered subtasks, in three SELECTs.
+
+    Trees come back in `proposal_ids` order; IDs that don't exist are left out. Hour
+    totals are the rollup columns on each proposal and task.
+    """
+    stmt = (
+        select(*PROPOSAL_ROW.columns)
+        .select_from(Proposal)
+        .outerjoin(User, User.id == Proposal.created_by)
+        .where(Proposal.id.in_(proposal_ids))
+    )
+    proposals = {proposal["id"]: proposal for proposal in PROPOSAL_ROW.many(db.session.execute(stmt))}
+    if not proposals:
+        return []
+
+    for proposal in proposals.values():
+        proposal["tasks"] = []
+    for task in load_tasks(Task.proposal_id.in_(proposals), include_subtasks=True):
+        proposals[task["proposal_id"]]["tasks"].append(task)
+
+    return [proposals[proposal_id] for proposal_id in dict.fromkeys(proposal_ids) if proposal_id in proposals]
+
+def get_proposal_tree(proposal_id, etag=""):
+    """Serialized tree for GET /proposals/<id>/tree, read through the cache; None if missing.
+
+    Keyed by `etag` like get_proposal_details.
+    """
+    def load():
+        trees = get_proposal_trees([proposal_id])
+        return trees[0] if trees else None
+
+    return cache.get_or_set(f"tree:{proposal_id}:{etag}", load, tags=[proposal_tag(proposal_id)])
+
+def get_proposal_tree_version(proposal_id):
+    """Version of GET /proposals/<id>/tree from one aggregate over the whole tree, or None if missing"""
+    stmt = (
+        select(
+            Proposal.updated_at, User.updated_at,
+            func.max(Task.updated_at), func.count(distinct(Task.id)),
+            func.max(Subtask.updated_at), func.count(Subtask.id),
         )
+        .outerjoin(User, User.id == Proposal.created_by)
+        .outerjoin(Task, Task.proposal_id == Proposal.id)
+        .outerjoin(Subtask, Subtask.task_id == Task.id)
+        .where(Proposal.id == proposal_id)
+        .group_by(Proposal.id, Proposal.updated_at, User.updated_at)
+    )
+    row = db.session.execute(stmt).first()
+    if row is None:
+        return None
+
+    return make_version("tree", proposal_id, *row)
+
+def parse_proposal_ids(value, max_items):
+    """Parse a comma-separated `ids` parameter; returns a list of ints or an error tuple"""
+    try:
+        proposal_ids = [int(part) for part in (value or "").split(",") if part.strip()]
+    except ValueError:
+        return {"error": "Invalid ids parameter"}, 400
+
+    if not proposal_ids:
+        return {"error": "Missing ids parameter"}, 400
+    if len(proposal_ids) > max_items:
+        return {"error": f"Too many ids (max {max_items})"}, 400
+    return proposal_ids
+
+def _proposal_list_query(name=None, client=None, client_name=None, created_by=None, after=None, q=None,
+                         opportunity_status=None, business_unit=None, quote_number=None):
+    """Build the filtered, ordered SELECT behind GET /proposals, without a row limit.
+
+    Returns (statement, searching, offset), or an error tuple for invalid parameters.
+    """
+    searching = bool(q and q.strip())
+    offset = 0
+
+    # Plain columns (creator included via the join) serialized straight from Row tuples
+    stmt = (
+        select(*PROPOSAL_ROW.columns)
+        .select_from(Proposal)
+        .outerjoin(User, User.id == Proposal.created_by)
     )
 
     conditions = []
@@ -30,12 +144,98 @@ def get_filtered_proposals(name=None, client=None, client_name=None, created_by=
             conditions.append(Proposal.created_by == int(created_by))
         except ValueError:
             return {"error": "Invalid created_by parameter"}, 400
+    # Exact matches, each served by an index that also keeps the (created_at, id) order
+    if opportunity_status:
+        conditions.append(Proposal.opportunity_status == opportunity_status)
+    if business_unit:
+        conditions.append(Proposal.business_unit == business_unit)
+    if quote_number and quote_number.strip():
+        conditions.append(Proposal.quote_number == quote_number.strip())
+    if after and searching:
+        try:
+            offset = int(decode_cursor(after)["offset"])
+        except (ValueError, KeyError, TypeError):
+            return {"error": "Invalid after cursor"}, 400
+    elif after:
+        try:
+            position = decode_cursor(after)
+            after_created_at = datetime.fromisoformat(position["created_at"])
+            after_id = int(position["id"])
+        except (ValueError, KeyError, TypeError):
+            return {"error": "Invalid after cursor"}, 400
+
+        # Seek past the last row of the previous page instead of using OFFSET. The OR alone
+        # can't seek an index; the redundant `<=` bound gives the planner a range to start from
+        conditions.append(Proposal.created_at <= after_created_at)
+        conditions.append(or_(
+            Proposal.created_at < after_created_at,
+            and_(Proposal.created_at == after_created_at, Proposal.id < after_id)
+        ))
 
     if conditions:
         stmt = stmt.where(*conditions)
 
-    result = db.session.execute(stmt)
-    return result.scalars().all()
+    if searching:
+        stmt = apply_proposal_search(stmt, q)
+        if stmt is None:
+            return {"error": "Search query must contain letters or numbers"}, 400
+        # Relevance scores have no stable seek key, so ranked results page by position
+        stmt = stmt.offset(offset)
+    else:
+        # Stable sort on (created_at, id) so ties never shuffle rows between pages
+        stmt = stmt.order_by(Proposal.created_at.desc(), Proposal.id.desc())
+
+    return stmt, searching, offset
+
+def get_filtered_proposals(name=None, client=None, client_name=None, created_by=None, limit=None, after=None, q=None,
+                           opportunity_status=None, business_unit=None, quote_number=None):
+    """Fetch one page of proposals as serialized dicts.
+
+    Plain listings are newest first, using keyset pagination on (created_at, id). A
+    full-text `q` search is ordered by relevance instead and pages by position.
+    """
+    try:
+        limit = parse_limit(limit)
+    except ValueError:
+        return {"error": "Invalid limit parameter"}, 400
+
+    query = _proposal_list_query(
+        name, client, client_name, created_by, after=after, q=q,
+        opportunity_status=opportunity_status, business_unit=business_unit, quote_number=quote_number,
+    )
+    if isinstance(query[0], dict):
+        return query
+    stmt, searching, offset = query
+
+    result = db.session.execute(stmt.limit(limit + 1))
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:  # The extra row only tells us another page exists
+        rows = rows[:limit]
+        if searching:
+            next_cursor = encode_cursor({"offset": offset + limit})
+        else:
+            last = rows[-1]
+            next_cursor = encode_cursor({"created_at": last.created_at.isoformat(), "id": last.id})
+
+    return {"proposals": PROPOSAL_ROW.many(rows), "next_cursor": next_cursor}
+
+def stream_filtered_proposals(name=None, client=None, client_name=None, created_by=None, after=None, q=None,
+                              opportunity_status=None, business_unit=None, quote_number=None):
+    """Every proposal matching the filters, as batches of serialized dicts read from a server-side cursor.
+
+    Same filters and order as `get_filtered_proposals`, without pages. Returns an error
+    tuple for invalid parameters before any row is read.
+    """
+    query = _proposal_list_query(
+        name, client, client_name, created_by, after=after, q=q,
+        opportunity_status=opportunity_status, business_unit=business_unit, quote_number=quote_number,
+    )
+    if isinstance(query[0], dict):
+        return query
+
+    return stream_rows(query[0], PROPOSAL_ROW)
 
 def update_proposal(proposal_id, data):
     """Update an existing proposal with validation checks."""
@@ -70,7 +270,6 @@ def update_proposal(proposal_id, data):
         return {"error": "Invalid opportunity status. Allowed: Quote, Approved, Rejected, Pending"}, 400
 
     if "created_by" in data:
-        from server.app.models import User
         user = db.session.get(User, data["created_by"])
         if not user:
             return {"error": "User does not exist"}, 400
@@ -86,14 +285,120 @@ def update_proposal(proposal_id, data):
         db.session.rollback()
         return {"error": "Database error", "details": str(e)}, 500
 
-@jwt_required()
-def create_proposal(data):
-    """Creates a new proposal along with optional tasks and subtasks, requiring authentication"""
-    
+def _validate_proposal_tree(data):
+    """Return an error message if a proposal/task/subtask tree is missing required fields"""
+    if not isinstance(data, dict):
+        return "Proposal must be an object"
+
     required_fields = ["name", "site", "client", "quote_number", "client_name"]
     for field in required_fields:
         if field not in data:
-            return {"error": f"Missing required field: {field}"}, 400
+            return f"Missing required field: {field}"
+
+    tasks = data.get("tasks", [])
+    if not isinstance(tasks, list):
+        return "tasks must be a list"
+    for task_data in tasks:
+        if not isinstance(task_data, dict):
+            return "Each task must be an object"
+        if "title" not in task_data:
+            return "Missing required field: tasks[].title"
+        subtasks = task_data.get("subtasks", [])
+        if not isinstance(subtasks, list):
+            return "tasks[].subtasks must be a list"
+        for subtask_data in subtasks:
+            if not isinstance(subtask_data, dict):
+                return "Each subtask must be an object"
+            if "title" not in subtask_data:
+                return "Missing required field: tasks[].subtasks[].title"
+
+    return None
+
+def _insert_returning_ids(model, rows, parent_column=None, parent_ids=None):
+    """Insert `rows` with batched multi-row INSERTs and return their new IDs in row order.
+
+    Auto-increment IDs are handed out in row order within a statement, so sorting the
+    IDs from INSERT ... RETURNING restores the row order. Without RETURNING, rows that
+    belong to freshly inserted parents are read back by parent ordered by ID instead,
+    so either way a whole batch costs at most two statements.
+    """
+    if not rows:
+        return []
+
+    table = model.__table__  # Core insert: plain executemany, no ORM bulk regrouping of rows
+    if db.session.get_bind().dialect.insert_executemany_returning:
+        return sorted(db.session.scalars(insert(table).returning(table.c.id), rows))
+
+    if parent_column is not None:
+        db.session.execute(insert(table), rows)
+        stmt = select(model.id).where(parent_column.in_(parent_ids)).order_by(model.id)
+        return list(db.session.scalars(stmt))
+
+    # Top-level rows without RETURNING: nothing to read them back by, so insert singly
+    return [db.session.execute(insert(table).values(**row)).inserted_primary_key[0] for row in rows]
+
+def _insert_proposal_trees(trees, user_id):
+    """Insert proposals with their tasks and subtasks using one batched statement per table.
+
+    Core inserts skip the ORM rollup events, so task and proposal hour totals are
+    computed from the tree here and written with the rows.
+    """
+    def subtask_hours(subtask_data):
+        return subtask_data.get("hours") or 0
+
+    proposal_rows = []
+    for data in trees:
+        subtasks = [subtask for task_data in data.get("tasks", []) for subtask in task_data.get("subtasks", [])]
+        proposal_rows.append({
+            "name": data["name"],
+            "site": data["site"],
+            "client": data["client"],
+            "quote_number": data["quote_number"],
+            "client_name": data["client_name"],
+            "budget": data.get("budget"),
+            "description": data.get("description"),
+            "business_unit": data.get("business_unit", "In House Project"),
+            "opportunity_status": data.get("opportunity_status", "Quote"),
+            "resource_name": data.get("resource_name", "Automation Team"),
+            "created_by": user_id,  # Automatically set from JWT token
+            "total_hours": sum(subtask_hours(subtask) for subtask in subtasks),
+            "subtask_count": len(subtasks)
+        })
+    proposal_ids = _insert_returning_ids(Proposal, proposal_rows)
+
+    task_rows = []
+    task_subtasks = []
+    for proposal_id, data in zip(proposal_ids, trees):
+        for position, task_data in enumerate(data.get("tasks", [])):
+            subtasks = task_data.get("subtasks", [])
+            task_rows.append({
+                "proposal_id": proposal_id,
+                "title": task_data["title"],
+                "description": task_data.get("description"),
+                "order": task_data.get("order", gapped_order(position)),
+                "total_hours": sum(subtask_hours(subtask) for subtask in subtasks),
+                "subtask_count": len(subtasks)
+            })
+            task_subtasks.append(subtasks)
+    task_ids = _insert_returning_ids(Task, task_rows, parent_column=Task.proposal_id, parent_ids=proposal_ids)
+
+    subtask_rows = [{
+        "task_id": task_id,
+        "title": subtask_data["title"],
+        "hours": subtask_hours(subtask_data),
+        "order": subtask_data.get("order", gapped_order(position))
+    } for task_id, subtasks in zip(task_ids, task_subtasks) for position, subtask_data in enumerate(subtasks)]
+    if subtask_rows:
+        db.session.execute(insert(Subtask.__table__), subtask_rows)  # IDs aren't needed, so no RETURNING
+
+    return proposal_ids
+
+@jwt_required()
+def create_proposal(data):
+    """Creates a new proposal along with optional tasks and subtasks, requiring authentication"""
+    error = _validate_proposal_tree(data)
+    if error:
+        return {"error": error}, 400
     
     try:
         # Get the authenticated user ID
@@ -101,48 +406,18 @@ def create_proposal(data):
         if not user_id:
             return {"error": "User authentication required"}, 401
         
-        # Create Proposal
-        proposal = Proposal(
-            name=data["name"],
-            site=data["site"],
-            client=data["client"],
-            quote_number=data["quote_number"],
-            client_name=data["client_name"],
-            budget=data.get("budget"),
-            description=data.get("description"),
-            business_unit=data.get("business_unit", "In House Project"),
-            opportunity_status=data.get("opportunity_status", "Quote"),
-            resource_name=data.get("resource_name", "Automation Team"),
-            created_by=user_id  # Automatically set from JWT token
-        )
-        db.session.add(proposal)
-        db.session.flush()  # Flush to get the proposal ID
-        
-        # Create Tasks (if provided)
-        tasks = []
-        for task_data in data.get("tasks", []):
-            task = Task(
-                proposal_id=proposal.id,
-                title=task_data["title"],
-                description=task_data.get("description"),
-                order=task_data.get("order", 0)
-            )
-            db.session.add(task)
-            db.session.flush()  # Flush to get the task ID
-            
-            # Create Subtasks (if provided)
-            for subtask_data in task_data.get("subtasks", []):
-                subtask = Subtask(
-                    task_id=task.id,
-                    title=subtask_data["title"],
-                    hours=subtask_data.get("hours", 0),
-                    order=subtask_data.get("order", 0)
-                )
-                db.session.add(subtask)
-            
-            tasks.append(task)
-        
+        proposal_id = _insert_proposal_trees([data], user_id)[0]
+        invalidate_on_commit(proposal_ids=[proposal_id])  # Core inserts skip the flush hooks
+        notify_on_commit(change_notice("proposal", "created", proposal_id, proposal_id))
         db.session.commit()
+
+        proposal = get_proposal(proposal_id)
+        stmt = (
+            select(Task).where(Task.proposal_id == proposal_id)
+            .options(selectinload(Task.subtasks))
+            .order_by(Task.order, Task.id)
+        )
+        tasks = db.session.execute(stmt).scalars().all()
         
         return {
             "message": "Proposal created successfully",
@@ -153,3 +428,37 @@ def create_proposal(data):
     except Exception as e:
         db.session.rollback()
         return {"error": str(e)}, 500
+
+@jwt_required()
+def create_proposals_bulk(items, max_items=1000):
+    """Import many full proposal trees in a single transaction, requiring authentication"""
+    if not isinstance(items, list) or not items:
+        return {"error": "Expected a non-empty list of proposals"}, 400
+
+    if len(items) > max_items:
+        return {"error": f"Too many proposals in one request (max {max_items})"}, 400
+
+    for index, data in enumerate(items):
+        error = _validate_proposal_tree(data)
+        if error:
+            return {"error": f"proposals[{index}]: {error}"}, 400
+
+    try:
+        user_id = get_jwt_identity()
+        if not user_id:
+            return {"error": "User authentication required"}, 401
+
+        proposal_ids = _insert_proposal_trees(items, user_id)
+        invalidate_on_commit(proposal_ids=proposal_ids)  # Core inserts skip the flush hooks
+        notify_on_commit(*[change_notice("proposal", "created", proposal_id, proposal_id) for proposal_id in proposal_ids])
+        db.session.commit()
+
+        return {
+            "message": "Proposals created successfully",
+            "created": len(proposal_ids),
+            "proposal_ids": proposal_ids
+        }, 201
+
+    except Exception as e:
+        db.session.rollback()
+        return {"error": str(e)}, 500
@@ -0,0 +1,33 @@
+from sqlalchemy import func, select, update, or_
+from server.extensions import db
+from server.app.models import Proposal, Subtask, Task
+
+def recompute_rollups():
+    """Rebuild task and proposal hour rollups from subtasks with two set-based UPDATEs.
+
+    Only rows whose stored totals disagree are touched, so a healthy database is left
+    (and its updated_at timestamps) unchanged. Returns (tasks repaired, proposals repaired).
+    """
+    tasks = Task.__table__
+    proposals = Proposal.__table__
+    subtasks = Subtask.__table__
+
+    task_hours = select(func.coalesce(func.sum(subtasks.c.hours), 0)).where(subtasks.c.task_id == tasks.c.id).scalar_subquery()
+    task_count = select(func.count(subtasks.c.id)).where(subtasks.c.task_id == tasks.c.id).scalar_subquery()
+    task_result = db.session.execute(
+        update(tasks)
+        .where(or_(tasks.c.total_hours != task_hours, tasks.c.subtask_count != task_count))
+        .values(total_hours=task_hours, subtask_count=task_count)
+    )
+
+    # Proposals roll up the (now correct) task totals rather than re-joining subtasks
+    proposal_hours = select(func.coalesce(func.sum(tasks.c.total_hours), 0)).where(tasks.c.proposal_id == proposals.c.id).scalar_subquery()
+    proposal_count = select(func.coalesce(func.sum(tasks.c.subtask_count), 0)).where(tasks.c.proposal_id == proposals.c.id).scalar_subquery()
+    proposal_result = db.session.execute(
+        update(proposals)
+        .where(or_(proposals.c.total_hours != proposal_hours, proposals.c.subtask_count != proposal_count))
+        .values(total_hours=proposal_hours, subtask_count=proposal_count)
+    )
+
+    db.session.commit()
+    return task_result.rowcount, proposal_result.rowcount
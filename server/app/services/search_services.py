@@ -0,0 +1,57 @@
+import re
+from sqlalchemy import or_, literal_column, table, column
+from sqlalchemy.dialects.mysql import match
+from server.extensions import db
+from server.app.models import Proposal, PROPOSAL_SEARCH_COLUMNS
+
+MAX_SEARCH_TERMS = 8
+# innodb_ft_min_token_size's default: shorter words aren't in a MySQL FULLTEXT index, so
+# MATCH can't find them (raise this if the server's setting is higher)
+MYSQL_MIN_TOKEN_SIZE = 3
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Lightweight handle on the SQLite FTS5 table created alongside `proposals`
+proposals_fts = table("proposals_fts", column("rowid"), column("rank"))
+
+def search_terms(q):
+    """Split a raw search string into plain word terms, dropping FTS operators and punctuation"""
+    return _TERM_PATTERN.findall(q or "")[:MAX_SEARCH_TERMS]
+
+def apply_proposal_search(stmt, q):
+    """Restrict a proposal query to rows matching `q`, ordered by relevance.
+
+    Every term must match (as a prefix, so partially typed words still hit) in any of
+    name, client, client_name, quote_number or description. Returns None if `q` has no
+    searchable terms. On MySQL, terms too short for the FULLTEXT index (the "Q" of
+    "Q-150000") are matched as substrings among the index's hits instead, and a query
+    made only of such terms falls back to substring matching altogether.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return None
+
+    dialect = db.session.get_bind().dialect.name
+    search_columns = [getattr(Proposal, name) for name in PROPOSAL_SEARCH_COLUMNS]
+
+    if dialect == "mysql" and any(len(term) >= MYSQL_MIN_TOKEN_SIZE for term in terms):
+        # Served by the FULLTEXT index ft_proposals_search
+        indexed = [term for term in terms if len(term) >= MYSQL_MIN_TOKEN_SIZE]
+        short = [term for term in terms if len(term) < MYSQL_MIN_TOKEN_SIZE]
+        relevance = match(*search_columns, against=" ".join(f"+{term}*" for term in indexed)).in_boolean_mode()
+        return stmt.where(relevance, *_substring_matches(search_columns, short)).order_by(relevance.desc(), Proposal.id.desc())
+
+    if dialect == "sqlite":
+        # Served by the FTS5 table; `rank` is bm25(), where lower means more relevant
+        fts_query = " ".join('"{}"*'.format(term) for term in terms)
+        return (
+            stmt.join(proposals_fts, proposals_fts.c.rowid == Proposal.id)
+            .where(literal_column("proposals_fts").op("MATCH")(fts_query))
+            .order_by(proposals_fts.c.rank, Proposal.id.desc())
+        )
+
+    # Other backends have no full-text index wired up; fall back to substring matching
+    return stmt.where(*_substring_matches(search_columns, terms)).order_by(Proposal.created_at.desc(), Proposal.id.desc())
+
+def _substring_matches(search_columns, terms):
+    """One condition per term: it appears somewhere in any of `search_columns`"""
+    return [or_(*[col.ilike(f"%{term}%") for col in search_columns]) for term in terms]
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from sqlalchemy import and_, delete, event, insert, or_, select
+from server.extensions import db
+from server.app.models import Proposal, Task, Subtask, User, DeletedRecord
+from server.app.serializers import PROPOSAL_ROW, TASK_ROW, SUBTASK_ROW
+from server.app.pagination import encode_cursor, decode_cursor
+
+# Delta sync
+#
+# GET /sync/proposals walks each table in (updated_at, id) order from where the client's
+# token left off, and deletes leave a tombstone in deleted_records. Rows are only handed
+# out once they are `settle_seconds` old: a transaction that commits late can't carry an
+# updated_at behind a position a client has already moved past, as long as it commits
+# within that window. updated_at is stamped at flush, so a transaction that commits more
+# than `settle_seconds` after flushing a row can be missed by clients that synced in
+# between; they only see it after a full resync. Only the deleted row itself gets a tombstone: tasks removed by the
+# database's ON DELETE CASCADE don't, so clients drop a deleted parent's children themselves.
+
+SYNC_ENTITIES = {"proposal": Proposal, "task": Task, "subtask": Subtask}
+
+def _record_deletion(entity):
+    def listener(mapper, connection, target):
+        connection.execute(insert(DeletedRecord.__table__).values(
+            entity=entity, entity_id=target.id, deleted_at=datetime.utcnow()
+        ))
+    return listener
+
+for _entity, _model in SYNC_ENTITIES.items():
+    event.listen(_model, "after_delete", _record_deletion(_entity))
+
+def _sync_queries():
+    """(response key, serializer, statement, (updated_at, id) columns) per synced table"""
+    return [
+        ("proposals", PROPOSAL_ROW,
+         select(*PROPOSAL_ROW.columns).select_from(Proposal).outerjoin(User, User.id == Proposal.created_by),
+         (Proposal.updated_at, Proposal.id)),
+        ("tasks", TASK_ROW, select(*TASK_ROW.columns), (Task.updated_at, Task.id)),
+        ("subtasks", SUBTASK_ROW, select(*SUBTASK_ROW.columns), (Subtask.updated_at, Subtask.id)),
+        ("deleted", None, select(DeletedRecord.id, DeletedRecord.entity, DeletedRecord.entity_id, DeletedRecord.deleted_at),
+         (DeletedRecord.deleted_at, DeletedRecord.id)),
+    ]
+
+def _parse_token(since, tombstone_days):
+    """Positions {key: (updated_at, id)} from a sync token, an error tuple, or None for a first sync"""
+    if not since:
+        return None
+
+    try:
+        token = decode_cursor(since)
+        positions = {
+            key: (datetime.fromisoformat(token[key][0]), int(token[key][1]))
+            for key in ("proposals", "tasks", "subtasks", "deleted")
+        }
+    except (ValueError, KeyError, TypeError, IndexError):
+        return {"error": "Invalid since token"}, 400
+
+    # Tombstones older than this have been pruned, so the client may have missed deletions
+    if positions["deleted"][0] < datetime.utcnow() - timedelta(days=tombstone_days):
+        return {"error": "Sync token expired; sync again without since", "resync": True}, 410
+
+    return positions
+
+def sync_proposals(since=None, page_size=1000, settle_seconds=2, tombstone_days=30):
+    """Proposals, tasks and subtasks changed since the token `since`, plus tombstones.
+
+    Without `since`, the first call starts a full snapshot. Each table returns at most
+    `page_size` rows; while `has_more` is true the client should call again right away
+    with `next_token`.
+    """
+    positions = _parse_token(since, tombstone_days)
+    if isinstance(positions, tuple):
+        return positions
+
+    settled = datetime.utcnow() - timedelta(seconds=settle_seconds)
+    result = {"has_more": False}
+    next_positions = {}
+
+    for key, serializer, stmt, (updated_at, row_id) in _sync_queries():
+        if positions is None and key == "deleted":
+            # A snapshot has nothing to delete locally; start the tombstone feed from now
+            next_positions[key] = (settled, 0)
+            result[key] = []
+            continue
+
+        conditions = [updated_at <= settled]
+        if positions is not None:
+            last_at, last_id = positions[key]
+            # The redundant `>=` bound gives the planner a range to seek on the (updated_at, id) index
+            conditions.append(updated_at >= last_at)
+            conditions.append(or_(updated_at > last_at, and_(updated_at == last_at, row_id > last_id)))
+
+        rows = db.session.execute(
+            stmt.where(*conditions).order_by(updated_at, row_id).limit(page_size + 1)
+        ).all()
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            result["has_more"] = True
+            last = rows[-1]
+            next_positions[key] = (last.deleted_at if key == "deleted" else last.updated_at, last.id)
+        else:
+            # Caught up: nothing else is settled yet, so resume from the settle point. This
+            # keeps tokens fresh even when a table sees no changes for weeks.
+            next_positions[key] = (settled, 0)
+
+        if key == "deleted":
+            result[key] = [{"type": row.entity, "id": row.entity_id} for row in rows]
+        else:
+            result[key] = serializer.many(rows)
+
+    result["next_token"] = encode_cursor({key: [at.isoformat(), row_id] for key, (at, row_id) in next_positions.items()})
+    return result
+
+def prune_tombstones(tombstone_days=30):
+    """Delete tombstones older than `tombstone_days`; returns how many were removed"""
+    cutoff = datetime.utcnow() - timedelta(days=tombstone_days)
+    deleted = db.session.execute(delete(DeletedRecord).where(DeletedRecord.deleted_at < cutoff)).rowcount
+    db.session.commit()
+    return deleted
@@ -1,25 +1,108 @@
-from sqlalchemy import select
-from sqlalchemy.orm import load_only
-from server.extensions import db
-from server.app.models import Task
+from sqlalchemy import select, func, distinct
+from sqlalchemy.orm import load_only, joinedload, selectinload
+from server.extensions import db, cache
+from server.app.models import Task, Subtask, Proposal, User
+from server.app.serializers import TASK_ROW, SUBTASK_ROW
+from server.app.conditional import make_version
+from server.app.services.cache_services import proposal_tag, task_tag
 
-def get_tasks_by_proposal(proposal_id, include_subtasks=False):
-    """Fetch all tasks for a specific proposal, optionally including subtasks"""
+def get_tasks_version(proposal_id, include_subtasks=False):
+    """Version of GET /proposals/<id>/tasks from one aggregate over the tasks (and subtasks)"""
     if not proposal_id.isdigit():  # Ensure proposal_id is numeric
         return {"error": "Invalid proposal_id parameter"}, 400
 
-    stmt = select(Task).where(Task.proposal_id == int(proposal_id))
-    result = db.session.execute(stmt)
-    tasks = result.scalars().all()
+    stmt = select(func.max(Task.updated_at), func.count(distinct(Task.id))).where(Task.proposal_id == int(proposal_id))
+    if include_subtasks:
+        stmt = stmt.outerjoin(Subtask, Subtask.task_id == Task.id).add_columns(func.max(Subtask.updated_at), func.count(Subtask.id))
+
+    return make_version("tasks", int(proposal_id), include_subtasks, *db.session.execute(stmt).one())
+
+def get_tasks_by_proposal(proposal_id, include_subtasks=False, etag=""):
+    """Fetch all tasks for a specific proposal, optionally including subtasks (cached per `etag`)"""
+    if not proposal_id.isdigit():  # Ensure proposal_id is numeric
+        return {"error": "Invalid proposal_id parameter"}, 400
+
+    proposal_id = int(proposal_id)
+    return cache.get_or_set(
+        f"tasks:{proposal_id}:{int(include_subtasks)}:{etag}",
+        lambda: _load_tasks_by_proposal(proposal_id, include_subtasks),
+        tags=[proposal_tag(proposal_id)],
+    )
+
+def _load_tasks_by_proposal(proposal_id, include_subtasks):
+    return load_tasks(Task.proposal_id == proposal_id, include_subtasks)
+
+def load_tasks(condition, include_subtasks=False):
+    """Serialized tasks matching `condition`, ordered by proposal then display order.
+
+    With subtasks this is still two SELECTs however many tasks match: every subtask of
+    those tasks comes back in one query and is grouped onto its task in Python.
+    """
+    stmt = select(*TASK_ROW.columns).where(condition).order_by(Task.proposal_id, Task.order, Task.id)
+    tasks = TASK_ROW.many(db.session.execute(stmt))
+
+    if include_subtasks and tasks:
+        for task in tasks:
+            task["subtasks"] = []
+        by_id = {task["id"]: task for task in tasks}
 
-    return [t.to_dict(include_subtasks=include_subtasks) for t in tasks]
+        stmt = (
+            select(*SUBTASK_ROW.columns)
+            .join(Task, Task.id == Subtask.task_id)
+            .where(condition)
+            .order_by(Subtask.task_id, Subtask.order, Subtask.id)
+        )
+        for subtask in SUBTASK_ROW.many(db.session.execute(stmt)):
+            by_id[subtask["task_id"]]["subtasks"].append(subtask)
 
-def get_task_by_id(task_id, include_proposal=False, include_subtasks=False):
-    """Fetch a single task by ID with optional proposal and subtasks"""
+    return tasks
+
+def get_task_version(task_id, include_proposal=False, include_subtasks=False):
+    """Version of GET /tasks/<id> covering whichever parts the response includes, or None if missing"""
     if not task_id.isdigit():  # Ensure task_id is numeric
         return {"error": "Invalid task_id parameter"}, 400
 
-    stmt = select(Task).where(Task.id == int(task_id))
+    stmt = select(Task.updated_at).where(Task.id == int(task_id))
+    if include_proposal:
+        stmt = (
+            stmt.outerjoin(Proposal, Proposal.id == Task.proposal_id)
+            .outerjoin(User, User.id == Proposal.created_by)
+            .add_columns(Proposal.updated_at, User.updated_at)
+        )
+    if include_subtasks:
+        in_task = Subtask.task_id == Task.id  # Correlated to the outer task row
+        stmt = stmt.add_columns(
+            select(func.max(Subtask.updated_at)).where(in_task).scalar_subquery(),
+            select(func.count(Subtask.id)).where(in_task).scalar_subquery(),
+        )
+
+    row = db.session.execute(stmt).first()
+    if row is None:
+        return None
+
+    return make_version("task", int(task_id), include_proposal, include_subtasks, *row)
+
+def get_task_by_id(task_id, include_proposal=False, include_subtasks=False, etag=""):
+    """Fetch a single task by ID with optional proposal and subtasks (cached per `etag`)"""
+    if not task_id.isdigit():  # Ensure task_id is numeric
+        return {"error": "Invalid task_id parameter"}, 400
+
+    task_id = int(task_id)
+    return cache.get_or_set(
+        f"task:{task_id}:{int(include_proposal)}:{int(include_subtasks)}:{etag}",
+        lambda: _load_task(task_id, include_proposal, include_subtasks),
+        tags=[task_tag(task_id)],
+    )
+
+def _load_task(task_id, include_proposal, include_subtasks):
+    stmt = select(Task).where(Task.id == task_id)
+    if include_proposal:
+        stmt = stmt.options(
+            joinedload(Task.proposal).joinedload(Proposal.user).load_only(User.id, User.first_name, User.last_name)
+        )
+    if include_subtasks:
+        stmt = stmt.options(selectinload(Task.subtasks))
+
     result = db.session.execute(stmt)
     task = result.scalars().first()
 
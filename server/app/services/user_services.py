@@ -2,10 +2,12 @@ from sqlalchemy import select
 from sqlalchemy.orm import load_only
 from server.extensions import db
 from server.app.models import User
+from server.app.serializers import USER_ROW
+from server.app.streaming import stream_rows
 
-def get_all_users(user_id=None, role=None, email=None, is_active=None, username=None,):
-    """Fetch users with optional filtering"""
-    stmt = select(User).options(load_only(User.id, User.username, User.email, User.role, User.is_active))
+def _user_list_query(user_id=None, role=None, email=None, is_active=None, username=None):
+    """Build the filtered SELECT behind GET /users/all, or return an error tuple"""
+    stmt = select(*USER_ROW.columns)
     conditions = []
     if user_id:
         try:
@@ -29,8 +31,24 @@ def get_all_users(user_id=None, role=None, email=None, is_active=None, username=
     if conditions:
         stmt = stmt.where(*conditions)
 
+    return stmt.order_by(User.id)
+
+def get_all_users(user_id=None, role=None, email=None, is_active=None, username=None,):
+    """Fetch users with optional filtering, as serialized dicts"""
+    stmt = _user_list_query(user_id, role, email, is_active, username)
+    if isinstance(stmt, tuple):
+        return stmt
+
     result = db.session.execute(stmt)
-    return result.scalars().all()  # ✅ Return all results as a list
+    return USER_ROW.many(result)  # ✅ Return all results as a list
+
+def stream_users(user_id=None, role=None, email=None, is_active=None, username=None):
+    """Same users as `get_all_users`, as batches of serialized dicts read from a server-side cursor"""
+    stmt = _user_list_query(user_id, role, email, is_active, username)
+    if isinstance(stmt, tuple):
+        return stmt
+
+    return stream_rows(stmt, USER_ROW)
 
 def update_user_partially(user_id, data):
     """PATCH: Update specific user fields without modifying the entire record."""
@@ -52,13 +70,8 @@ def update_user_partially(user_id, data):
         db.session.rollback()
         return {"error": "Database error", "details": str(e)}, 500
 
-def delete_user(current_user_id, user_id):
-    """Delete a user (Admins only)"""
-    current_user = db.session.get(User, current_user_id)
-    
-    if not current_user or current_user.role != "admin":
-        return {"error": "Access denied, only admins can delete users"}, 403
-
+def delete_user(user_id):
+    """Delete a user (the route restricts this to admins)"""
     user = db.session.get(User, user_id)
     
     if not user:
@@ -73,13 +86,8 @@ def delete_user(current_user_id, user_id):
         db.session.rollback()
         return {"error": "Database error", "details": str(e)}, 500
     
-def soft_delete_user(current_user_id, user_id):
-    """Soft delete a user (Admins only) by setting is_active=False."""
-    current_user = db.session.get(User, current_user_id)
-
-    if not current_user or current_user.role != "admin":
-        return {"error": "Access denied, only admins can disable users"}, 403
-
+def soft_delete_user(user_id):
+    """Soft delete a user by setting is_active=False (the route restricts this to admins)."""
     user = db.session.get(User, user_id)
     
     if not user:
@@ -97,13 +105,8 @@ def soft_delete_user(current_user_id, user_id):
         db.session.rollback()
         return {"error": "Database error", "details": str(e)}, 500
     
-def enable_user(current_user_id, user_id):
-    """Enable a previously disabled user (Admins only)."""
-    current_user = db.session.get(User, current_user_id)
-
-    if not current_user or current_user.role != "admin":
-        return {"error": "Access denied, only admins can enable users"}, 403
-
+def enable_user(user_id):
+    """Enable a previously disabled user (the route restricts this to admins)."""
     user = db.session.get(User, user_id)
     
     if not user:
@@ -0,0 +1,72 @@
+from flask import Response, current_app, request, stream_with_context
+from server.extensions import db
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+STREAM_BATCH_SIZE = 500  # Rows fetched, serialized and sent per chunk
+
+def wants_ndjson():
+    """True if the client asked for a stream: `Accept: application/x-ndjson` or `?stream=1`"""
+    if request.args.get("stream", "").lower() in ("1", "true"):
+        return True
+    return request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def stream_rows(stmt, serializer, batch_size=STREAM_BATCH_SIZE):
+    """Yield lists of serialized rows of `stmt`, `batch_size` at a time.
+
+    yield_per uses a server-side cursor where the driver has one (MySQL), so only one
+    batch of rows is in memory however large the result is.
+    """
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for rows in result.partitions():
+            yield serializer.many(rows)
+    finally:
+        result.close()  # Also runs if the client disconnects mid-stream
+
+def ndjson_response(batches):
+    """Stream batches of dicts as NDJSON (one JSON document per line), one chunk per batch.
+
+    The query runs as the body is sent, after the 200 has gone out, so a failure part
+    way through ends the stream early instead of returning an error status.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        for batch in batches:
+            yield "".join([dumps(row) + "\n" for row in batch]).encode("utf-8")
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.headers["X-Accel-Buffering"] = "no"  # Let nginx pass chunks through as they come
+    return response
+
+EVENT_STREAM_MIMETYPE = "text/event-stream"
+
+def event_stream_response(subscription, unsubscribe, keep=None, heartbeat_seconds=15, retry_ms=5000):
+    """Stream a broker subscription as Server-Sent Events until the client goes away.
+
+    Each notice `keep` accepts is sent as an `event: change`. A comment line goes out
+    after `heartbeat_seconds` of quiet so proxies don't drop the connection, and that's
+    also when a closed client is noticed. A subscriber that fell too far behind gets an
+    `event: resync` and the stream ends; the browser reconnects after `retry_ms`.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        yield f"retry: {retry_ms}\n\n"
+        while True:
+            notice = subscription.get(timeout=heartbeat_seconds)
+            if subscription.overflowed:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            if notice is None:
+                yield ": keep-alive\n\n"
+            elif keep is None or keep(notice):
+                yield f"event: change\ndata: {dumps(notice)}\n\n"
+
+    # No stream_with_context: the stream can stay open for hours and needs nothing from the request
+    response = Response(generate(), mimetype=EVENT_STREAM_MIMETYPE)
+    # On close rather than in the generator, which never runs if the body is never read
+    response.call_on_close(lambda: unsubscribe(subscription))
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Let nginx pass events through as they come
+    return response
@@ -0,0 +1,98 @@
+"""Measure proposal-tree insert throughput: legacy per-row ORM flushes vs the batched path.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bench_bulk_insert --tasks 200 --subtasks 10 --repeat 5
+"""
+import argparse
+import json
+import time
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from server.benchmarks.common import make_app, seed_proposals, summarize
+from server.extensions import db
+from server.app.models import Proposal, Task, Subtask
+
+def proposal_tree(index, tasks, subtasks):
+    return {
+        "name": f"Bulk proposal {index}", "site": "Ponce", "client": "Acme Pharma",
+        "quote_number": f"B-{index}", "client_name": "Rivera", "budget": 10000,
+        "tasks": [{
+            "title": f"Task {t}", "order": t,
+            "subtasks": [{"title": f"Subtask {t}.{s}", "hours": s % 8 + 1, "order": s} for s in range(subtasks)]
+        } for t in range(tasks)]
+    }
+
+def legacy_create(data, user_id):
+    """The pre-batching create_proposal body: one flush per task, one ORM object per row"""
+    proposal = Proposal(name=data["name"], site=data["site"], client=data["client"],
+                        quote_number=data["quote_number"], client_name=data["client_name"],
+                        budget=data.get("budget"), created_by=user_id)
+    db.session.add(proposal)
+    db.session.flush()
+    for task_data in data["tasks"]:
+        task = Task(proposal_id=proposal.id, title=task_data["title"], order=task_data["order"])
+        db.session.add(task)
+        db.session.flush()
+        for subtask_data in task_data["subtasks"]:
+            db.session.add(Subtask(task_id=task.id, title=subtask_data["title"],
+                                   hours=subtask_data["hours"], order=subtask_data["order"]))
+    db.session.commit()
+
+def run(tasks, subtasks, repeat, batch, database_url=None):
+    app = make_app(database_url)
+    client = app.test_client()
+    statements = []
+
+    with app.app_context():
+        user_id = seed_proposals(0)
+        headers = {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+        event.listen(db.engine, "before_cursor_execute", lambda *args: statements.append(1))
+
+        def measure(label, fn, trees_per_call):
+            samples, counts = [], []
+            for i in range(repeat):
+                statements.clear()
+                started = time.perf_counter()
+                fn(i)
+                samples.append((time.perf_counter() - started) * 1000)
+                counts.append(len(statements))
+                db.session.remove()
+            rows = trees_per_call * (1 + tasks + tasks * subtasks)
+            stats = summarize(sorted(samples))
+            return {"path": label, "statements": max(counts), "rows_per_call": rows,
+                    "rows_per_second": round(rows / (stats["p50_ms"] / 1000)), **stats}
+
+        results = [
+            measure("legacy ORM flush per task", lambda i: legacy_create(proposal_tree(i, tasks, subtasks), user_id), 1),
+            measure("POST /proposals", lambda i: client.post(
+                "/proposals", json=proposal_tree(i, tasks, subtasks), headers=headers), 1),
+            measure(f"POST /proposals/bulk x{batch}", lambda i: client.post(
+                "/proposals/bulk", json={"proposals": [proposal_tree(i, tasks, subtasks) for _ in range(batch)]},
+                headers=headers), batch),
+        ]
+
+    return {"benchmark": "bulk_insert", "tasks": tasks, "subtasks_per_task": subtasks,
+            "repeat": repeat, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--subtasks", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=10, help="Proposal trees per /proposals/bulk call")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = run(args.tasks, args.subtasks, args.repeat, args.batch, args.database_url)
+
+    print(f"{'path':<30}{'statements':>12}{'p50 ms':>10}{'rows/s':>10}")
+    for row in report["results"]:
+        print(f"{row['path']:<30}{row['statements']:>12}{row['p50_ms']:>10.1f}{row['rows_per_second']:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
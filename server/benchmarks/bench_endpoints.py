@@ -0,0 +1,219 @@
+"""Time every route in get/post/put/auth/user routes against a seeded dataset.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bench_endpoints --scale 10k --json results/10k.json
+    python -m server.benchmarks.compare results/base.json results/10k.json
+
+Every request is issued through the WSGI test client, so timings include routing,
+auth, the service layer, serialization and the after_request hooks, but no network.
+The dataset and the sequence of requested IDs are fixed by --seed, so two runs on
+different commits time exactly the same requests.
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import subprocess
+import time
+from datetime import datetime
+import sqlalchemy
+from flask_jwt_extended import create_access_token
+from werkzeug.security import generate_password_hash
+from server.benchmarks.common import make_app, seed_dataset, summarize, PROJECT_WORDS, COMPANY_WORDS, OPPORTUNITY_STATUSES
+from server.extensions import db
+from server.app.models import User
+from server.app.auth import principal_claims
+from server.app.pagination import encode_cursor
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+PASSWORD = "password123"
+
+def proposal_tree(rng, index, tasks=4, subtasks=5):
+    return {
+        "name": f"Benchmark proposal {index}", "site": "Ponce", "client": f"{rng.choice(COMPANY_WORDS)} Pharma",
+        "quote_number": f"BE-{index}", "client_name": "Rivera", "budget": 25000,
+        "tasks": [{
+            "title": f"Task {t}", "order": t,
+            "subtasks": [{"title": f"Subtask {t}.{s}", "hours": rng.randint(1, 8), "order": s} for s in range(subtasks)],
+        } for t in range(tasks)],
+    }
+
+def scenarios(dataset, admin, user):
+    """(name, expected status, request factory) for every benchmarked route.
+
+    Factories take the iteration number and that route's RNG, and return
+    (method, path, kwargs for the test client). Throwaway users for the disable ->
+    enable -> delete routes have IDs right after the dataset's users.
+    """
+    proposals, tasks, users = dataset["proposals"], dataset["tasks"], dataset["users"]
+    counter = itertools.count(1)
+
+    def caught_up():
+        """Sync token of a client that has everything up to now"""
+        now = datetime.utcnow().isoformat()
+        return encode_cursor({key: [now, 0] for key in ("proposals", "tasks", "subtasks", "deleted")})
+
+    return [
+        # get_routes
+        ("GET /proposals", 200, lambda i, rng: ("GET", "/proposals", {})),
+        ("GET /proposals?limit=200", 200, lambda i, rng: ("GET", "/proposals?limit=200", {})),
+        ("GET /proposals?client=", 200, lambda i, rng: ("GET", f"/proposals?client={rng.choice(COMPANY_WORDS)}", {})),
+        ("GET /proposals?q=", 200, lambda i, rng: ("GET", f"/proposals?q={rng.choice(PROJECT_WORDS)}", {})),
+        ("GET /proposals?stream=1 (all rows)", 200, lambda i, rng: ("GET", "/proposals?stream=1", {})),
+        ("GET /proposals/<id>", 200, lambda i, rng: ("GET", f"/proposals/{rng.randint(1, proposals)}", {})),
+        ("GET /proposals/<id>/tasks", 200, lambda i, rng: ("GET", f"/proposals/{rng.randint(1, proposals)}/tasks", {})),
+        ("GET /proposals/<id>/tasks?include_subtasks", 200,
+         lambda i, rng: ("GET", f"/proposals/{rng.randint(1, proposals)}/tasks?include_subtasks=true", {})),
+        ("GET /proposals/<id>/tree", 200, lambda i, rng: ("GET", f"/proposals/{rng.randint(1, proposals)}/tree", {})),
+        ("GET /proposals/tree?ids= x20", 200, lambda i, rng: (
+            "GET", "/proposals/tree?ids=" + ",".join(str(rng.randint(1, proposals)) for _ in range(20)), {})),
+        ("GET /tasks/<id>", 200, lambda i, rng: ("GET", f"/tasks/{rng.randint(1, tasks)}", {})),
+        ("GET /tasks/<id>?include_proposal&include_subtasks", 200,
+         lambda i, rng: ("GET", f"/tasks/{rng.randint(1, tasks)}?include_proposal=true&include_subtasks=true", {})),
+        # post_routes
+        ("POST /proposals", 201, lambda i, rng: ("POST", "/proposals", {"json": proposal_tree(rng, next(counter)), "headers": user})),
+        ("POST /proposals/bulk x10", 201, lambda i, rng: ("POST", "/proposals/bulk", {
+            "json": {"proposals": [proposal_tree(rng, next(counter)) for _ in range(10)]}, "headers": user})),
+        # batch_routes: the proposal screen's reads in one round trip
+        ("POST /batch x3", 200, lambda i, rng: ("POST", "/batch", {"headers": user, "json": {"requests": [
+            {"path": f"/proposals/{(proposal_id := rng.randint(1, proposals))}"},
+            {"path": f"/proposals/{proposal_id}/tasks?include_subtasks=true"},
+            {"path": "/auth/me"},
+        ]}})),
+        # put_routes
+        ("PUT /proposals/<id>", 200, lambda i, rng: ("PUT", f"/proposals/{rng.randint(1, proposals)}", {
+            "json": {"name": f"Renamed {i}", "opportunity_status": rng.choice(["Quote", "Approved", "Pending"])}})),
+        # patch_routes
+        ("PATCH /tasks/<id>/position", 200, lambda i, rng: ("PATCH", f"/tasks/{rng.randint(1, tasks)}/position", {
+            "json": {"after_id": None}, "headers": user})),
+        # analytics_routes
+        ("GET /analytics/summary", 200, lambda i, rng: ("GET", "/analytics/summary", {"headers": user})),
+        ("GET /analytics/summary?group_by=business_unit,month", 200, lambda i, rng: (
+            "GET", f"/analytics/summary?group_by=business_unit,month&opportunity_status={rng.choice(OPPORTUNITY_STATUSES)}",
+            {"headers": user})),
+        # sync_routes
+        ("GET /sync/proposals (snapshot page)", 200, lambda i, rng: ("GET", "/sync/proposals", {})),
+        ("GET /sync/proposals?since= (no changes)", 200, lambda i, rng: ("GET", f"/sync/proposals?since={caught_up()}", {})),
+        # auth_routes
+        ("POST /auth/login", 200, lambda i, rng: ("POST", "/auth/login", {
+            "json": {"email": f"bench{rng.randint(1, users)}@example.com", "password": PASSWORD}})),
+        ("POST /auth/register", 201, lambda i, rng: ("POST", "/auth/register", {"json": {
+            "username": f"new{i}", "first_name": "New", "last_name": "User", "email": f"new{i}@example.com",
+            "password": PASSWORD, "role": "user"}})),
+        ("GET /auth/me", 200, lambda i, rng: ("GET", "/auth/me", {"headers": user})),
+        ("GET /auth/protected", 200, lambda i, rng: ("GET", "/auth/protected", {"headers": user})),
+        ("GET /auth/admin-only", 200, lambda i, rng: ("GET", "/auth/admin-only", {"headers": admin})),
+        # user_routes
+        ("GET /users/all", 200, lambda i, rng: ("GET", "/users/all", {})),
+        ("GET /users/all?stream=1", 200, lambda i, rng: ("GET", "/users/all?stream=1", {})),
+        ("GET /users/all?role=admin", 200, lambda i, rng: ("GET", "/users/all?role=admin", {})),
+        ("PATCH /users/<id>", 200, lambda i, rng: ("PATCH", f"/users/{rng.randint(2, users)}", {
+            "json": {"first_name": f"Name{i}"}, "headers": admin})),
+        ("DELETE /users/<id>/disable", 200, lambda i, rng: ("DELETE", f"/users/{users + i}/disable", {"headers": admin})),
+        ("PATCH /users/<id>/enable", 200, lambda i, rng: ("PATCH", f"/users/{users + i}/enable", {"headers": admin})),
+        ("DELETE /users/<id>", 200, lambda i, rng: ("DELETE", f"/users/{users + i}", {"headers": admin})),
+    ]
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(proposals, requests, warmup, seed, database_url=None, only=None, cache="memory"):
+    app = make_app(database_url, SQL_METRICS_HEADERS=True, CACHE_BACKEND=cache)
+    client = app.test_client()
+
+    with app.app_context():
+        method = app.config["PASSWORD_HASH_METHOD"]
+        started = time.perf_counter()
+        dataset = seed_dataset(proposals, seed=seed, password_hash=generate_password_hash(PASSWORD, method))
+        seed_seconds = time.perf_counter() - started
+        db.session.execute(sqlalchemy.insert(User), [{
+            "id": dataset["users"] + i, "username": f"victim{i}", "email": f"victim{i}@example.com", "password_hash": "x",
+        } for i in range(1, warmup + requests + 1)])
+        db.session.commit()
+
+        admin_user, regular_user = db.session.get(User, 1), db.session.get(User, 2)
+        admin = {"Authorization": f"Bearer {create_access_token(identity='1', additional_claims=principal_claims(admin_user))}"}
+        user = {"Authorization": f"Bearer {create_access_token(identity='2', additional_claims=principal_claims(regular_user))}"}
+
+    results = []
+    for name, expected, factory in scenarios(dataset, admin, user):
+        if only and not any(term in name for term in only):
+            continue
+
+        rng = random.Random(f"{seed}:{name}")  # Per route, so --route doesn't change which IDs get requested
+        gc.collect()  # Don't bill one route for the previous route's garbage
+        samples, db_queries, errors = [], [], 0
+        for i in range(1, warmup + requests + 1):
+            method, path, kwargs = factory(i, rng)
+            started = time.perf_counter()
+            response = client.open(path, method=method, **kwargs)
+            response.get_data()  # Streamed bodies are only produced as they're read
+            elapsed = (time.perf_counter() - started) * 1000
+            response.close()
+            if response.status_code != expected:
+                errors += 1
+            if i > warmup:
+                samples.append(elapsed)
+                db_queries.append(int(response.headers.get("X-DB-Queries", 0)))
+
+        samples.sort()
+        results.append({
+            "route": name,
+            "requests": len(samples),
+            "errors": errors,
+            "throughput_rps": round(len(samples) / (sum(samples) / 1000), 1),
+            "db_queries": round(sum(db_queries) / len(db_queries), 2),
+            **summarize(samples),
+        })
+
+    return {
+        "benchmark": "endpoints",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "database": "sqlite" if database_url is None else database_url.split(":", 1)[0],
+        "seed": seed,
+        "dataset": dataset,
+        "seed_seconds": round(seed_seconds, 1),
+        "requests_per_route": requests,
+        "warmup_per_route": warmup,
+        "cache": cache,
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--scale", choices=sorted(SCALES), default="1k", help="Dataset size in proposals")
+    size.add_argument("--proposals", type=int, help="Exact number of proposals instead of --scale")
+    parser.add_argument("--requests", type=int, default=200, help="Timed requests per route")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per route first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--route", action="append", help="Only routes whose name contains this (repeatable)")
+    parser.add_argument("--cache", default="memory", choices=["memory", "none"], help="CACHE_BACKEND for the run")
+    parser.add_argument("--database-url", help="e.g. sqlite:// for in-memory; default is a temp SQLite file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    proposals = args.proposals or SCALES[args.scale]
+    report = run(proposals, args.requests, args.warmup, args.seed, args.database_url, args.route, args.cache)
+
+    dataset = report["dataset"]
+    print(f"{dataset['proposals']} proposals, {dataset['tasks']} tasks, {dataset['subtasks']} subtasks "
+          f"(seeded in {report['seed_seconds']} s), commit {report['commit']}")
+    print(f"{'route':<52}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'queries':>9}{'errors':>8}")
+    for row in report["results"]:
+        print(f"{row['route']:<52}{row['throughput_rps']:>9}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}"
+              f"{row['p99_ms']:>9.2f}{row['db_queries']:>9}{row['errors']:>8}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
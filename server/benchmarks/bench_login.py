@@ -0,0 +1,89 @@
+"""Measure login throughput and its effect on other requests, with hashing inline vs. on the pool.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bench_login --logins 8 --duration 10
+"""
+import argparse
+import json
+import threading
+import time
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from server.benchmarks.common import make_app, seed_proposals, summarize
+from server.extensions import db
+from server.app.models import User
+
+def run_mode(workers, logins, duration, method, database_url=None):
+    app = make_app(database_url, PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_METHOD=method, CACHE_BACKEND="none")
+    with app.app_context():
+        seed_proposals(200)
+        db.session.execute(insert(User).values(
+            username="login", email="login@example.com", first_name="L", last_name="U",
+            password_hash=generate_password_hash("password123", method),
+        ))
+        db.session.commit()
+
+    stop = threading.Event()
+    login_times, other_times = [], []
+    failures = []
+
+    def login_loop():
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = client.post("/auth/login", json={"email": "login@example.com", "password": "password123"})
+            if response.status_code != 200:
+                failures.append(response.status_code)
+            login_times.append((time.perf_counter() - started) * 1000)
+
+    def other_loop():
+        client = app.test_client()
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/proposals/1")
+            other_times.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)  # A steady trickle of ordinary traffic, not a second load generator
+
+    threads = [threading.Thread(target=login_loop) for _ in range(logins)] + [threading.Thread(target=other_loop)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "hash_workers": workers,
+        "logins_per_s": round(len(login_times) / duration, 1),
+        "login": summarize(sorted(login_times)),
+        "other_requests": summarize(sorted(other_times)),
+        "login_failures": len(failures),
+    }
+
+def run(logins, duration, method, database_url=None):
+    results = [run_mode(workers, logins, duration, method, database_url) for workers in (0, 1)]
+    return {"benchmark": "login", "concurrent_logins": logins, "duration_s": duration, "method": method, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=8, help="Threads logging in back to back")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per mode")
+    parser.add_argument("--method", default="scrypt:32768:8:1", help="werkzeug hash method")
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = run(args.logins, args.duration, args.method, args.database_url)
+
+    print(f"{'hashing':<12}{'logins/s':>10}{'login p50':>11}{'other p50':>11}{'other p95':>11}{'other p99':>11}")
+    for row in report["results"]:
+        mode = "inline" if row["hash_workers"] == 0 else f"pool({row['hash_workers']})"
+        other = row["other_requests"]
+        print(f"{mode:<12}{row['logins_per_s']:>10}{row['login']['p50_ms']:>11.1f}{other['p50_ms']:>11.1f}{other['p95_ms']:>11.1f}{other['p99_ms']:>11.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare the legacy ILIKE filter with the full-text `q=` search on a seeded database.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bench_search --proposals 100000 --repeat 20
+"""
+import argparse
+import json
+from server.benchmarks.common import make_app, seed_proposals, summarize, time_call
+from server.app.services.proposal_services import get_filtered_proposals
+
+SEARCHES = ["acme", "validation", "coqui pharma", "Q-150000", "retrofit scada"]
+
+def run(proposals, repeat, database_url=None):
+    app = make_app(database_url)
+    results = []
+    with app.app_context():
+        seed_proposals(proposals)
+
+        for term in SEARCHES:
+            ilike = time_call(lambda: get_filtered_proposals(name=term), repeat)
+            fulltext = time_call(lambda: get_filtered_proposals(q=term), repeat)
+            results.append({
+                "term": term,
+                "ilike": summarize(ilike),
+                "fulltext": summarize(fulltext),
+                "speedup_p50": round(summarize(ilike)["p50_ms"] / summarize(fulltext)["p50_ms"], 3),
+            })
+
+    return {"benchmark": "search", "proposals": proposals, "repeat": repeat, "results": results}
+
+def describe_speedup(speedup):
+    """"7.3x faster" or "29.2x slower": a ratio below 1 rounds to a meaningless 0.0x"""
+    return f"{speedup:.1f}x faster" if speedup >= 1 else f"{1 / speedup:.1f}x slower"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proposals", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = run(args.proposals, args.repeat, args.database_url)
+
+    print(f"{'term':<18}{'ILIKE p50 ms':>14}{'q= p50 ms':>12}{'q= vs ILIKE':>15}")
+    for row in report["results"]:
+        print(f"{row['term']:<18}{row['ilike']['p50_ms']:>14.2f}{row['fulltext']['p50_ms']:>12.2f}"
+              f"{describe_speedup(row['speedup_p50']):>15}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
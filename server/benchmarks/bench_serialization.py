@@ -0,0 +1,75 @@
+"""Compare ORM to_dict() + stdlib json with Row serializers + orjson for the proposal list.
+
+Usage (from the repository root):
+    python -m server.benchmarks.bench_serialization --proposals 20000 --page 1000 --repeat 20
+"""
+import argparse
+import json
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+from server.benchmarks.common import make_app, seed_proposals, summarize, time_call
+from server.extensions import db
+from server.app.models import Proposal, User
+from server.app.serializers import PROPOSAL_ROW, ORJSONProvider
+
+def legacy_page(page):
+    """What GET /proposals did before: ORM instances, to_dict() per row"""
+    stmt = select(Proposal).options(joinedload(Proposal.user)).order_by(Proposal.created_at.desc(), Proposal.id.desc())
+    return [p.to_dict() for p in db.session.execute(stmt.limit(page)).scalars()]
+
+def row_page(page):
+    """What GET /proposals does now: plain columns through PROPOSAL_ROW"""
+    stmt = (
+        select(*PROPOSAL_ROW.columns)
+        .outerjoin(User, User.id == Proposal.created_by)
+        .order_by(Proposal.created_at.desc(), Proposal.id.desc())
+    )
+    return PROPOSAL_ROW.many(db.session.execute(stmt.limit(page)))
+
+def run(proposals, page, repeat, database_url=None):
+    app = make_app(database_url)
+    stdlib, fast = DefaultJSONProvider(app), ORJSONProvider(app)
+    results = []
+    with app.app_context():
+        seed_proposals(proposals)
+        assert legacy_page(page) == row_page(page)  # Same payload either way
+        db.session.remove()
+
+        payload = row_page(page)
+        paths = [
+            ("to_dict()", lambda: legacy_page(page)),
+            ("Row serializer", lambda: row_page(page)),
+            ("stdlib json encode", lambda: stdlib.dumps(payload)),
+            ("orjson encode", lambda: fast.dumps(payload)),
+            ("to_dict() + stdlib json", lambda: stdlib.dumps(legacy_page(page))),
+            ("Row serializer + orjson", lambda: fast.dumps(row_page(page))),
+        ]
+        for name, fn in paths:
+            summary = summarize(time_call(fn, repeat))
+            summary["rows_per_s"] = round(page / (summary["p50_ms"] / 1000))
+            results.append({"path": name, **summary})
+
+    return {"benchmark": "serialization", "proposals": proposals, "page": page, "repeat": repeat, "results": results}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--proposals", type=int, default=20_000)
+    parser.add_argument("--page", type=int, default=1000, help="Rows serialized per call")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--database-url", help="Benchmark against this database instead of a temp SQLite file")
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    report = run(args.proposals, args.page, args.repeat, args.database_url)
+
+    print(f"{'path':<28}{'p50 ms':>10}{'p95 ms':>10}{'rows/s':>10}")
+    for row in report["results"]:
+        print(f"{row['path']:<28}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['rows_per_s']:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
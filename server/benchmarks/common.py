@@ -0,0 +1,168 @@
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from sqlalchemy import insert
+from server.app import create_app
+from server.config import DevelopmentConfig
+from server.extensions import db
+from server.app.models import User, Proposal, Task, Subtask
+from server.app.services.order_services import gapped_order
+
+COMPANY_WORDS = [
+    "Acme", "Borinquen", "Caribe", "Coqui", "Delta", "Eagle", "Flamboyan", "Global", "Harbor",
+    "Island", "Jibaro", "Kinetic", "Luquillo", "Mayaguez", "Northstar", "Oceanic", "Ponce",
+    "Quantum", "Rincon", "Summit", "Tropical", "Union", "Vega", "Western", "Yunque", "Zenith",
+]
+COMPANY_SUFFIXES = ["Pharma", "Biotech", "Medical", "Foods", "Energy", "Devices", "Labs", "Industries"]
+PROJECT_WORDS = [
+    "automation", "validation", "upgrade", "migration", "calibration", "commissioning", "packaging",
+    "filling", "serialization", "historian", "SCADA", "PLC", "HMI", "batch", "cleanroom", "utilities",
+    "boiler", "chiller", "conveyor", "vision", "reporting", "integration", "retrofit", "audit",
+]
+SITES = ["Ponce", "Mayaguez", "Caguas", "Carolina", "Humacao", "Barceloneta", "Juncos", "Guayama"]
+BUSINESS_UNITS = ["In House Project", "Field Services", "Engineering", "Validation"]
+OPPORTUNITY_STATUSES = ["Quote", "Approved", "Rejected", "Pending"]
+
+def make_app(database_url=None, **config):
+    """Build the real application against a throwaway database (a temp SQLite file by default).
+
+    Extra keyword arguments override config values, e.g. make_app(PASSWORD_HASH_WORKERS=0).
+    """
+    if database_url is None:
+        handle, path = tempfile.mkstemp(prefix="jca_bench_", suffix=".db")
+        os.close(handle)
+        database_url = f"sqlite:///{path}"
+
+    class BenchmarkConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = database_url
+
+    for key, value in config.items():
+        setattr(BenchmarkConfig, key, value)
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+def company(rng):
+    return f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}"
+
+def proposal_row(rng, index, user_id, start=datetime(2020, 1, 1)):
+    """One plausible proposals row; `index` keeps quote numbers unique"""
+    return {
+        "name": " ".join(rng.sample(PROJECT_WORDS, 3)).title(),
+        "site": rng.choice(SITES),
+        "client": company(rng),
+        "quote_number": f"Q-{100000 + index}",
+        "client_name": f"{rng.choice(COMPANY_WORDS)} {rng.choice(['Ortiz', 'Rivera', 'Colon', 'Santiago', 'Cruz'])}",
+        "budget": round(rng.uniform(1000, 250000), 2),
+        "description": " ".join(rng.choices(PROJECT_WORDS, k=12)),
+        "created_at": start + timedelta(minutes=rng.randrange(0, 60 * 24 * 365 * 5)),
+        "created_by": user_id,
+        "business_unit": rng.choice(BUSINESS_UNITS),
+        "opportunity_status": rng.choice(OPPORTUNITY_STATUSES),
+    }
+
+def seed_proposals(n, seed=42, batch_size=5000):
+    """Insert one user and `n` proposals with plausible text, using multi-row INSERTs"""
+    rng = random.Random(seed)
+    user_id = db.session.execute(insert(User).values(
+        username="bench", email="bench@example.com", password_hash="x", first_name="Bench", last_name="User"
+    )).inserted_primary_key[0]
+
+    rows = []
+    for i in range(n):
+        rows.append(proposal_row(rng, i, user_id))
+        if len(rows) == batch_size:
+            db.session.execute(insert(Proposal), rows)
+            rows = []
+    if rows:
+        db.session.execute(insert(Proposal), rows)
+    db.session.commit()
+    return user_id
+
+def seed_dataset(proposals, users=20, tasks=(1, 8), subtasks=(0, 10), seed=42, password_hash="x", batch_size=5000):
+    """Insert users and `proposals` full proposal trees with a random task/subtask fan-out.
+
+    IDs are assigned here, so the same arguments always produce the same database.
+    Rollup columns are filled in, since Core inserts bypass the ORM events. Returns the
+    dataset's shape: user, proposal, task and subtask counts.
+    """
+    rng = random.Random(seed)
+    db.session.execute(insert(User), [{
+        "id": user_id,
+        "username": f"bench{user_id}",
+        "email": f"bench{user_id}@example.com",
+        "password_hash": password_hash,
+        "first_name": rng.choice(["Ana", "Luis", "Carmen", "Jose", "Maria", "Pedro"]),
+        "last_name": rng.choice(["Ortiz", "Rivera", "Colon", "Santiago", "Cruz"]),
+        "role": "admin" if user_id == 1 else "user",
+    } for user_id in range(1, users + 1)])
+
+    task_id = subtask_id = 0
+    proposal_rows, task_rows, subtask_rows = [], [], []
+
+    def flush():
+        for model, rows in ((Proposal, proposal_rows), (Task, task_rows), (Subtask, subtask_rows)):
+            if rows:
+                db.session.execute(insert(model), rows)
+                rows.clear()
+
+    for proposal_id in range(1, proposals + 1):
+        row = proposal_row(rng, proposal_id, rng.randint(1, users))
+        row.update(id=proposal_id, total_hours=0, subtask_count=0)
+        for order in range(rng.randint(*tasks)):
+            task_id += 1
+            task = {"id": task_id, "proposal_id": proposal_id, "title": " ".join(rng.sample(PROJECT_WORDS, 2)).title(),
+                    "order": gapped_order(order), "total_hours": 0, "subtask_count": 0}
+            for sub_order in range(rng.randint(*subtasks)):
+                subtask_id += 1
+                hours = rng.randint(1, 16)
+                subtask_rows.append({"id": subtask_id, "task_id": task_id, "title": rng.choice(PROJECT_WORDS).title(),
+                                     "hours": hours, "order": gapped_order(sub_order)})
+                task["total_hours"] += hours
+                task["subtask_count"] += 1
+            row["total_hours"] += task["total_hours"]
+            row["subtask_count"] += task["subtask_count"]
+            task_rows.append(task)
+        proposal_rows.append(row)
+        if len(subtask_rows) >= batch_size:
+            flush()
+    flush()
+    db.session.commit()
+
+    return {"users": users, "proposals": proposals, "tasks": task_id, "subtasks": subtask_id}
+
+def time_call(fn, repeat):
+    """Run `fn` `repeat` times and return the sorted wall-clock samples in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+        db.session.remove()
+    return sorted(samples)
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of already-sorted samples"""
+    if not samples:
+        return None
+    index = max(0, min(len(samples) - 1, round(pct / 100 * len(samples) + 0.5) - 1))
+    return samples[index]
+
+def summarize(samples):
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
@@ -0,0 +1,73 @@
+"""Diff two bench_endpoints JSON reports and fail on regressions.
+
+Usage (from the repository root):
+    python -m server.benchmarks.compare baseline.json candidate.json --threshold 20
+
+Exits 1 if any route's p50 or p95 got more than --threshold percent slower (and by more
+than --min-ms, so sub-millisecond jitter doesn't count), if it now runs more queries per
+request, or if it started returning unexpected statuses. Routes present in only one
+report are listed but don't fail the comparison.
+"""
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report, {row["route"]: row for row in report["results"]}
+
+def change(before, after):
+    return (after - before) / before * 100 if before else 0.0
+
+def compare(baseline, candidate, threshold, min_ms):
+    """[(route, row before, row after, [problems])] for routes in both reports"""
+    rows = []
+    for route, after in candidate.items():
+        before = baseline.get(route)
+        if before is None:
+            continue
+        problems = []
+        for metric in ("p50_ms", "p95_ms"):
+            if change(before[metric], after[metric]) > threshold and after[metric] - before[metric] > min_ms:
+                problems.append(f"{metric} {before[metric]:.2f} -> {after[metric]:.2f}")
+        if after["db_queries"] > before["db_queries"] + 0.01:
+            problems.append(f"queries {before['db_queries']} -> {after['db_queries']}")
+        if after["errors"] > before["errors"]:
+            problems.append(f"errors {before['errors']} -> {after['errors']}")
+        rows.append((route, before, after, problems))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=20, help="Allowed slowdown in percent")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    base_report, baseline = load(args.baseline)
+    cand_report, candidate = load(args.candidate)
+    if base_report["dataset"] != cand_report["dataset"]:
+        print(f"warning: datasets differ ({base_report['dataset']} vs {cand_report['dataset']})")
+
+    print(f"{base_report['commit']} -> {cand_report['commit']}")
+    print(f"{'route':<52}{'p50 ms':>18}{'p95 ms':>18}{'queries':>14}")
+    rows = compare(baseline, candidate, args.threshold, args.min_ms)
+    for route, before, after, problems in rows:
+        print(f"{route:<52}"
+              f"{before['p50_ms']:>8.2f} {change(before['p50_ms'], after['p50_ms']):>+8.1f}%"
+              f"{before['p95_ms']:>8.2f} {change(before['p95_ms'], after['p95_ms']):>+8.1f}%"
+              f"{before['db_queries']:>7} -> {after['db_queries']:<4}"
+              f"{'  REGRESSED' if problems else ''}")
+
+    for route in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"{route:<52}only in {'baseline' if route in baseline else 'candidate'}")
+
+    regressions = [(route, problems) for route, _, _, problems in rows if problems]
+    for route, problems in regressions:
+        print(f"REGRESSION {route}: {'; '.join(problems)}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
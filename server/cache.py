@@ -0,0 +1,296 @@
+import contextvars
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for CACHE_BACKEND = "redis"
+    redis = None
+
+# Read-through cache with tag-based invalidation
+#
+# Entries are stored under a key plus a set of tags (e.g. "proposal:12"). Writers bump a
+# tag, which drops every entry carrying it. Each tag also has a generation counter: a
+# loader snapshots the generations of its tags before it queries the database, and its
+# result is only stored if none of them moved in the meantime, so a read that races a
+# write can't put the pre-write value back into the cache.
+
+class MemoryBackend:
+    """In-process LRU with per-entry TTL. Each worker process has its own copy.
+
+    Values are stored as-is, not copied, so callers must treat cached values as read-only.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value, tags), least recently used first
+        self._tags = {}  # tag -> set of keys
+        self._generations = {}  # tag -> int
+        self._epoch = 0  # Bumped by clear(), so it also fences loads for tags with no generation yet
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return (hit, value)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                return False, None
+            self._entries.move_to_end(key)
+            return True, entry[1]
+
+    def generations(self, tags):
+        with self._lock:
+            return [self._epoch] + [self._generations.get(tag, 0) for tag in tags]
+
+    def set(self, key, value, ttl, tags, generations):
+        """Store `value` unless one of `tags` was invalidated since `generations` was read"""
+        with self._lock:
+            if [self._epoch] + [self._generations.get(tag, 0) for tag in tags] != generations:
+                return False
+
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, tags):
+        """Drop every entry carrying one of `tags`, returning how many were dropped"""
+        dropped = 0
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tags.pop(tag, ()):
+                    if key in self._entries:
+                        self._drop(key)
+                        dropped += 1
+        return dropped
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "evictions": self.evictions, "expirations": self.expirations}
+
+    def _drop(self, key):
+        """Remove `key` and its tag memberships; caller holds the lock"""
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisBackend:
+    """Shared cache on any Redis-protocol server, so every worker sees the same entries.
+
+    `client` may be any redis-py compatible client (e.g. a local stand-in such as
+    fakeredis); otherwise one is built from `url`. Either way the redis package is
+    needed, for its exception types. Values are stored as JSON.
+    """
+
+    name = "redis"
+
+    def __init__(self, url=None, prefix="jca:cache:", client=None):
+        if redis is None:
+            raise RuntimeError("CACHE_BACKEND = 'redis' requires the redis package (pip install redis)")
+        if client is None:
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f"{self.prefix}k:{key}"
+
+    def _tag_key(self, tag):
+        return f"{self.prefix}t:{tag}"
+
+    def _generation_key(self, tag):
+        return f"{self.prefix}g:{tag}"
+
+    def _generation_keys(self, tags):
+        return [f"{self.prefix}epoch"] + [self._generation_key(tag) for tag in tags]
+
+    def get(self, key):
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            return False, None
+        return True, json.loads(raw)
+
+    def generations(self, tags):
+        return [int(gen or 0) for gen in self.client.mget(self._generation_keys(tags))]
+
+    def set(self, key, value, ttl, tags, generations):
+        generation_keys = self._generation_keys(tags)
+        raw = json.dumps(value, separators=(",", ":"))
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(*generation_keys)  # The MULTI below aborts if a writer bumps any of them
+                if [int(gen or 0) for gen in pipe.mget(generation_keys)] != generations:
+                    return False
+                pipe.multi()
+                pipe.set(self._key(key), raw, ex=ttl)
+                for tag in tags:
+                    pipe.sadd(self._tag_key(tag), self._key(key))
+                    # A tag set must outlive its longest-lived member (NX/GT need Redis 7+)
+                    pipe.expire(self._tag_key(tag), ttl, nx=True)
+                    pipe.expire(self._tag_key(tag), ttl, gt=True)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                return False
+
+    def invalidate(self, tags):
+        if not tags:
+            return 0
+        # Bump generations first: a set() that started before this can no longer commit,
+        # and one that already committed has its key in the tag set read below
+        with self.client.pipeline(transaction=True) as pipe:
+            for tag in tags:
+                pipe.incr(self._generation_key(tag))
+            pipe.execute()
+
+        dropped = 0
+        for tag in tags:
+            members = self.client.smembers(self._tag_key(tag))
+            if members:
+                dropped += self.client.delete(*members)
+            self.client.delete(self._tag_key(tag))
+        return dropped
+
+    def clear(self):
+        self.client.incr(f"{self.prefix}epoch")  # Fence in-flight loads before deleting
+        keys = list(self.client.scan_iter(match=f"{self.prefix}[kt]:*", count=1000))
+        for start in range(0, len(keys), 1000):
+            self.client.delete(*keys[start:start + 1000])
+
+    def stats(self):
+        try:
+            info = self.client.info("stats")
+        except redis.RedisError:  # Stand-ins and proxies may not implement INFO
+            return {}
+        return {"server_evicted_keys": info.get("evicted_keys"), "server_expired_keys": info.get("expired_keys")}
+
+class Cache:
+    """Flask extension fronting a cache backend, with per-process hit/miss counters"""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._bypassed = contextvars.ContextVar("cache_bypassed", default=False)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, backend=None):
+        app.config.setdefault("CACHE_BACKEND", "memory")  # "memory", "redis" or "none"
+        app.config.setdefault("CACHE_DEFAULT_TTL", 300)
+        app.config.setdefault("CACHE_MAX_ENTRIES", 10000)
+        app.config.setdefault("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        app.config.setdefault("CACHE_KEY_PREFIX", "jca:cache:")
+
+        if backend is None:
+            kind = app.config["CACHE_BACKEND"]
+            if kind == "memory":
+                backend = MemoryBackend(app.config["CACHE_MAX_ENTRIES"])
+            elif kind == "redis":
+                backend = RedisBackend(app.config["CACHE_REDIS_URL"], app.config["CACHE_KEY_PREFIX"])
+            elif kind != "none":
+                raise ValueError(f"Unknown CACHE_BACKEND: {kind}")
+
+        self.backend = backend
+        self.default_ttl = app.config["CACHE_DEFAULT_TTL"]
+        self.reset_stats()
+        app.extensions["cache"] = self
+
+    @property
+    def enabled(self):
+        return self.backend is not None
+
+    def get_or_set(self, key, loader, tags=(), ttl=None):
+        """Return the cached value for `key`, or call `loader()` and cache its result.
+
+        None results (e.g. not found) and error tuples are returned but never cached.
+        """
+        if not self.enabled or self._bypassed.get():
+            return loader()
+
+        hit, value = self.backend.get(key)
+        if hit:
+            self._count("hits")
+            return value
+
+        self._count("misses")
+        tags = list(tags)
+        generations = self.backend.generations(tags)
+        value = loader()
+        if value is not None and not isinstance(value, tuple):
+            if self.backend.set(key, value, ttl or self.default_ttl, tags, generations):
+                self._count("sets")
+            else:
+                self._count("stale_sets_skipped")
+        return value
+
+    @contextmanager
+    def bypass(self):
+        """Within this block (this thread/context only) reads go straight to the loader and store nothing.
+
+        For reads inside a transaction that hasn't committed yet: the cache must neither
+        hide its uncommitted writes nor be filled from them.
+        """
+        token = self._bypassed.set(True)
+        try:
+            yield
+        finally:
+            self._bypassed.reset(token)
+
+    def invalidate(self, *tags):
+        """Drop every entry carrying any of `tags`"""
+        if self.enabled and tags:
+            dropped = self.backend.invalidate(sorted(set(tags)))
+            self._count("invalidations", dropped)
+
+    def clear(self):
+        if self.enabled:
+            self.backend.clear()
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def reset_stats(self):
+        with self._lock:
+            self._counters = {"hits": 0, "misses": 0, "sets": 0, "stale_sets_skipped": 0, "invalidations": 0}
+
+    def stats(self):
+        """Counters for sizing the cache; hit/miss counts are for this process only"""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_ratio"] = round(counters["hits"] / lookups, 4) if lookups else None
+        counters["backend"] = self.backend.name if self.enabled else "none"
+        if self.enabled:
+            counters.update(self.backend.stats())
+        return counters
@@ -0,0 +1,128 @@
+import gzip
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # Optional: without it only gzip is offered
+    brotli = None
+
+# Text formats worth compressing. Binary downloads like xlsx are zip files already, and
+# event streams must reach the client one event at a time.
+DEFAULT_MIMETYPES = (
+    "application/json", "application/x-ndjson", "application/javascript", "application/xml",
+    "text/html", "text/plain", "text/csv", "text/css", "text/xml",
+)
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+
+    def chunk(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+class _AppCompression:
+    """One app's compression settings"""
+
+    def __init__(self, config):
+        self.min_size = config["COMPRESSION_MIN_SIZE"]
+        self.level = config["COMPRESSION_LEVEL"]
+        self.brotli_quality = config["COMPRESSION_BROTLI_QUALITY"]
+        self.mimetypes = frozenset(config["COMPRESSION_MIMETYPES"])
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]  # Server preference on equal q-values
+
+class Compression:
+    """Compress responses with gzip or brotli, whichever the client prefers (Accept-Encoding).
+
+    Whole bodies under COMPRESSION_MIN_SIZE bytes are sent as they are. Streamed bodies
+    are compressed chunk by chunk and flushed after each one, so NDJSON rows still reach
+    the client as they are produced and nothing is buffered. Compressed responses
+    get a weak ETag, since the bytes differ per encoding but the content doesn't, and
+    If-None-Match comparisons are weak anyway. Settings are kept per app in
+    app.extensions["compression"].
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("COMPRESSION_ENABLED", True)
+        app.config.setdefault("COMPRESSION_MIN_SIZE", 1024)  # Bytes; smaller bodies aren't worth the CPU
+        app.config.setdefault("COMPRESSION_LEVEL", 6)  # gzip, 1 (fast) - 9 (small)
+        app.config.setdefault("COMPRESSION_BROTLI_QUALITY", 5)  # 0 (fast) - 11 (small)
+        app.config.setdefault("COMPRESSION_MIMETYPES", DEFAULT_MIMETYPES)
+
+        if not app.config["COMPRESSION_ENABLED"]:
+            return
+
+        app.extensions["compression"] = _AppCompression(app.config)
+        app.after_request(self._compress)
+
+    def _compress(self, response):
+        settings = current_app.extensions["compression"]
+        if response.status_code == 304:
+            encoding = request.accept_encodings.best_match(settings.encodings)
+            if encoding and response.headers.get("ETag"):
+                response.set_etag(response.get_etag()[0], weak=True)  # Match the compressed 200's validator
+            return response
+
+        if (
+            response.mimetype not in settings.mimetypes
+            or response.status_code < 200
+            or response.status_code == 204
+            or "Content-Encoding" in response.headers
+            or response.direct_passthrough  # send_file() bodies
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")  # Caches must keep one copy per encoding
+        encoding = request.accept_encodings.best_match(settings.encodings)
+        if encoding is None or request.method == "HEAD":
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding, settings)
+            response.headers.pop("Content-Length", None)
+        else:
+            data = response.get_data()
+            if len(data) < settings.min_size:
+                return response
+            if encoding == "br":
+                response.set_data(brotli.compress(data, quality=settings.brotli_quality))
+            else:
+                response.set_data(gzip.compress(data, settings.level, mtime=0))  # mtime=0: same bytes for the same body
+
+        response.headers["Content-Encoding"] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _stream(self, chunks, encoding, settings):
+        compressor = _BrotliStream(settings.brotli_quality) if encoding == "br" else _GzipStream(settings.level)
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode("utf-8")
+                if chunk:
+                    yield compressor.chunk(chunk)
+            yield compressor.finish()
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()  # e.g. stream_with_context's generator, which closes the DB result
+
+compression = Compression()
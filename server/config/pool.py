@@ -0,0 +1,14 @@
+import os
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+def engine_options(pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800, pool_pre_ping=True):
+    """SQLALCHEMY_ENGINE_OPTIONS for the connection pool; each value can be overridden with a DB_POOL_* env var"""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", pool_size)),  # Connections kept open
+        "max_overflow": int(os.getenv("DB_POOL_MAX_OVERFLOW", max_overflow)),  # Extra connections opened under load, closed when returned
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", pool_timeout)),  # Seconds to wait for a free connection before erroring
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", pool_recycle)),  # Reconnect connections older than this, before MySQL's wait_timeout drops them
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", pool_pre_ping),  # Test each connection on checkout and replace it if it went stale
+    }
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+class PoolStats:
+    """Counters shared by a pool and the pools it is recreated into (e.g. after dispose())"""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=window)  # Seconds, for percentiles over the last `window` checkouts
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.overflow_checkouts = 0
+
+    def record_checkout(self, wait, checked_out, overflow):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self._recent_waits.append(wait)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+            if overflow > 0:
+                self.overflow_checkouts += 1
+
+    def increment(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self):
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "overflow_checkouts": self.overflow_checkouts,
+                "wait_ms_avg": round(1000 * self.wait_total / self.checkouts, 3) if self.checkouts else None,
+                "wait_ms_max": round(1000 * self.wait_max, 3),
+            }
+
+        def recent(pct):
+            return round(1000 * waits[min(len(waits) - 1, int(pct / 100 * len(waits)))], 3) if waits else None
+
+        data.update({"recent_wait_ms_p50": recent(50), "recent_wait_ms_p95": recent(95), "recent_wait_ms_p99": recent(99)})
+        return data
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection and how far the pool stretches.
+
+    Wait time covers everything `connect()` does before handing a connection back: queueing
+    for a free one, opening a new one, and the pre-ping, if enabled.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats  # Keep the history across engine.dispose()
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.increment("timeouts")
+            raise
+        self.stats.record_checkout(time.perf_counter() - started, self.checkedout(), max(0, self.overflow()))
+        return connection
+
+    def _create_connection(self):
+        self.stats.increment("connects")
+        return super()._create_connection()
+
+    def _invalidate(self, connection, exception=None, _checkin=True):
+        self.stats.increment("invalidations")  # Typically a dropped connection found by pre-ping or a failed query
+        return super()._invalidate(connection, exception, _checkin)
+
+def configure_pool(app):
+    """Use InstrumentedQueuePool for the app's engine, unless the database can't use a QueuePool.
+
+    Must run before db.init_app(). In-memory SQLite keeps SQLAlchemy's default single-connection
+    pool, so queue sizing options are dropped for it.
+    """
+    options = dict(app.config.get("SQLALCHEMY_ENGINE_OPTIONS") or {})  # Copy: the dict is shared by config classes
+    url = make_url(app.config["SQLALCHEMY_DATABASE_URI"])
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        for key in ("pool_size", "max_overflow", "pool_timeout"):
+            options.pop(key, None)
+    else:
+        options.setdefault("poolclass", InstrumentedQueuePool)
+
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+
+def pool_status(engine):
+    """Current occupancy, configuration and counters of `engine`'s pool, for /admin/pool"""
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+            "recycle_s": pool._recycle,
+            "pre_ping": pool._pre_ping,
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.stats.snapshot())
+    return status
@@ -0,0 +1,187 @@
+import json
+import logging
+import queue
+import threading
+import time
+from flask import current_app, has_app_context
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for EVENTS_BACKEND = "redis"
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Change notifications
+#
+# Writers publish small notices ({"type": "task", "action": "updated", "id": 7,
+# "proposal_id": 3}) once their transaction commits, and every open GET /events stream
+# gets a copy. Notices only say what changed; clients refetch what they show. A broker
+# delivers them: in-process by default, or through Redis pub/sub so a write handled by
+# one worker reaches streams held open by the others.
+
+class Subscription:
+    """One listener's bounded queue of notices.
+
+    A listener that falls `queue_size` notices behind is marked `overflowed` instead of
+    blocking publishers; it should tell its client to resync and stop.
+    """
+
+    def __init__(self, queue_size):
+        self._queue = queue.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, notice):
+        try:
+            self._queue.put_nowait(notice)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Next notice, or None if none arrived within `timeout` seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class MemoryBroker:
+    """Fans notices out to the subscribers of this process only"""
+
+    name = "memory"
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, notices):
+        self.deliver(notices)
+
+    def deliver(self, notices):
+        """Hand `notices` to every local subscriber"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            for notice in notices:
+                subscription.put(notice)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+class RedisBroker(MemoryBroker):
+    """Publishes through a Redis channel, so subscribers in every worker process see each notice.
+
+    `client` may be any redis-py compatible client (e.g. a local stand-in such as
+    fakeredis); otherwise one is built from `url`. A daemon thread per process, started
+    with the first subscriber, reads the channel and delivers to local subscribers.
+    """
+
+    name = "redis"
+
+    def __init__(self, url=None, channel="jca:events", client=None, queue_size=100):
+        super().__init__(queue_size)
+        if client is None:
+            if redis is None:
+                raise RuntimeError("EVENTS_BACKEND = 'redis' requires the redis package (pip install redis)")
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.channel = channel
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def subscribe(self):
+        self._ensure_listener()
+        return super().subscribe()
+
+    def publish(self, notices):
+        self.client.publish(self.channel, json.dumps(notices, separators=(",", ":")))
+
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)  # Before returning, so nothing published after this is missed
+                self._listener = threading.Thread(target=self._listen, args=(pubsub,), name="events-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self, pubsub):
+        while True:
+            try:
+                message = pubsub.get_message(timeout=1.0)
+            except Exception:  # Connection dropped: resubscribe and carry on
+                logger.exception("Lost the events channel; resubscribing")
+                time.sleep(1.0)
+                try:
+                    pubsub.subscribe(self.channel)
+                except Exception:
+                    pass
+                continue
+            if message and message["type"] == "message":
+                self.deliver(json.loads(message["data"]))
+
+class Events:
+    """Flask extension fronting a notice broker.
+
+    Each app's broker is kept in app.extensions["events"] (None when EVENTS_BACKEND is
+    "none") and resolved through current_app; outside an app context there is none.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app, broker=None):
+        app.config.setdefault("EVENTS_BACKEND", "memory")  # "memory", "redis" or "none"
+        app.config.setdefault("EVENTS_REDIS_URL", "redis://localhost:6379/0")
+        app.config.setdefault("EVENTS_CHANNEL", "jca:events")
+        app.config.setdefault("EVENTS_QUEUE_SIZE", 100)
+
+        if broker is None:
+            kind = app.config["EVENTS_BACKEND"]
+            if kind == "memory":
+                broker = MemoryBroker(app.config["EVENTS_QUEUE_SIZE"])
+            elif kind == "redis":
+                broker = RedisBroker(
+                    app.config["EVENTS_REDIS_URL"], app.config["EVENTS_CHANNEL"], queue_size=app.config["EVENTS_QUEUE_SIZE"]
+                )
+            elif kind != "none":
+                raise ValueError(f"Unknown EVENTS_BACKEND: {kind}")
+
+        app.extensions["events"] = broker
+
+    @property
+    def broker(self):
+        return current_app.extensions.get("events") if has_app_context() else None
+
+    @property
+    def enabled(self):
+        return self.broker is not None
+
+    def publish(self, notices, broker=None):
+        """Send committed-change notices to every subscriber of `broker` (default: the current app's).
+
+        Never raises: a write has already committed.
+        """
+        if broker is None:
+            broker = self.broker
+        if broker is None or not notices:
+            return
+        try:
+            broker.publish(list(notices))
+        except Exception:
+            logger.exception("Could not publish %d change notice(s)", len(notices))
+
+    def subscriber_count(self):
+        broker = self.broker
+        return broker.subscriber_count() if broker is not None else 0
@@ -1,12 +1,20 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from server.cache import Cache
+from server.events import Events
+from server.db_pool import configure_pool
 
 db = SQLAlchemy()
 cors = CORS()
 jwt = JWTManager()
+cache = Cache()
+events = Events()
 
 def init_extensions(app):
+    configure_pool(app)  # Before the engine is created
     db.init_app(app)
     cors.init_app(app)
-    jwt.init_app(app)
\ No newline at end of file
+    jwt.init_app(app)
+    cache.init_app(app)
+    events.init_app(app)
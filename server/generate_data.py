@@ -1,107 +1,247 @@
-import sys
+"""Fill the database with synthetic users, proposals, tasks and subtasks for load testing.
+
+Usage (from the repository root, or `python generate_data.py` inside server/):
+    python -m server.generate_data --users 5000 --proposals 1000000 --workers 4
+    python -m server.generate_data --database-url sqlite:///load.db --create-tables --proposals 100000
+
+Rows are appended after the highest existing IDs. The same --seed on an empty database
+always produces the same rows, whatever --workers is: each chunk has its own RNG and
+chunks are inserted in order. Workers only build rows; the parent process does every
+INSERT, so generating the next chunks overlaps with writing the current one. Every user
+shares one password, hashed once with the app's PASSWORD_HASH_METHOD (its salt is the
+only thing that differs between runs), so load tests can log in as anyone.
+"""
+import argparse
+import multiprocessing
 import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from sqlalchemy import func, insert, select, text
 from server.app import create_app
-from server.extensions import db
+from server.config import DevelopmentConfig
+from server.extensions import db, cache
 from server.app.models import User, Proposal, Task, Subtask
-from faker import Faker
-from random import choice, randint, uniform
-from datetime import datetime
-from werkzeug.security import generate_password_hash
-
-fake = Faker()
-
-# Initialize Flask
-app = create_app()
-with app.app_context():
-    def create_users(n=5):
-        """Generate random users"""
-        users = []
-        for _ in range(n):
-            user = User(
-                username=fake.user_name(),
-                email=fake.email(),
-                password_hash=generate_password_hash("password123"),
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                role=choice(["user", "admin", "moderator"]),
-                created_at=fake.date_time_between(start_date="-2y", end_date="now"),
-                updated_at=datetime.utcnow(),
-                is_active=True
-            )
-            db.session.add(user)
-            users.append(user)
-        db.session.commit()
-        return users
-
-    def create_proposals(users, n=10):
-        """Generate random proposals"""
-        proposals = []
-        for _ in range(n):
-            proposal = Proposal(
-                name=fake.company(),
-                site=fake.address(),
-                client=fake.company(),
-                status=choice(["pending", "approved", "rejected", "in_review"]),
-                budget=round(uniform(1000, 100000), 2),
-                deadline=fake.date_between(start_date="today", end_date="+1y"),
-                description=fake.text(),
-                created_at=fake.date_time_between(start_date="-1y", end_date="now"),
-                updated_at=datetime.utcnow(),
-                created_by=choice(users).id,
-                attachments=None
-            )
-            db.session.add(proposal)
-            proposals.append(proposal)
-        db.session.commit()
-        return proposals
-
-    def create_tasks(proposals, n=20):
-        """Generate random tasks"""
-        tasks = []
-        for _ in range(n):
-            task = Task(
-                proposal_id=choice(proposals).id,
-                title=fake.sentence(nb_words=5),
-                description=fake.text(),
-                order=randint(1, 10),
-                created_at=fake.date_time_between(start_date="-6m", end_date="now"),
-                updated_at=datetime.utcnow(),
-            )
-            db.session.add(task)
+from server.app.passwords import passwords
+from server.app.services.order_services import gapped_order
+
+FIRST_NAMES = ["Ana", "Luis", "Carmen", "Jose", "Maria", "Pedro", "Sofia", "Javier", "Isabel", "Carlos",
+               "Gabriela", "Miguel", "Valeria", "Rafael", "Natalia", "Angel", "Camila", "Jorge", "Lucia", "Ramon"]
+LAST_NAMES = ["Ortiz", "Rivera", "Colon", "Santiago", "Cruz", "Torres", "Rodriguez", "Morales", "Vazquez",
+              "Reyes", "Medina", "Diaz", "Figueroa", "Soto", "Ramos", "Velez", "Nieves", "Acosta"]
+COMPANY_WORDS = ["Acme", "Borinquen", "Caribe", "Coqui", "Delta", "Eagle", "Flamboyan", "Global", "Harbor",
+                 "Island", "Jibaro", "Kinetic", "Luquillo", "Northstar", "Oceanic", "Quantum", "Rincon",
+                 "Summit", "Tropical", "Union", "Vega", "Western", "Yunque", "Zenith"]
+COMPANY_SUFFIXES = ["Pharma", "Biotech", "Medical", "Foods", "Energy", "Devices", "Labs", "Industries"]
+PROJECT_WORDS = ["automation", "validation", "upgrade", "migration", "calibration", "commissioning", "packaging",
+                 "filling", "serialization", "historian", "SCADA", "PLC", "HMI", "batch", "cleanroom", "utilities",
+                 "boiler", "chiller", "conveyor", "vision", "reporting", "integration", "retrofit", "audit"]
+SITES = ["Ponce", "Mayaguez", "Caguas", "Carolina", "Humacao", "Barceloneta", "Juncos", "Guayama", "Manati", "Dorado"]
+BUSINESS_UNITS = ["In House Project", "Field Services", "Engineering", "Validation"]
+# (status, weight): most proposals never get past the quote
+OPPORTUNITY_STATUSES = [("Quote", 55), ("Pending", 20), ("Approved", 15), ("Rejected", 10)]
+ROLES = [("user", 93), ("moderator", 5), ("admin", 2)]
+
+CHUNK_SIZE = 2000  # Proposals generated per task handed to a worker
+
+def bounded_count(rng, mean, low, high):
+    """Right-skewed count in [low, high] averaging about `mean`: most trees are small, a few are large"""
+    if mean <= low:
+        return low
+    return min(high, low + int(rng.expovariate(1 / (mean - low))))
+
+def subtask_hours(rng):
+    """Log-normal hours: mostly 2-8, occasionally a multi-week item"""
+    return max(1, min(160, round(rng.lognormvariate(1.5, 0.7))))
+
+def generate_users(args):
+    """User rows with IDs first_id .. first_id + count - 1"""
+    seed, first_id, count, password_hash, start = args
+    rng = random.Random(f"{seed}:users:{first_id}")
+    roles, role_weights = zip(*ROLES)
+    rows = []
+    for user_id in range(first_id, first_id + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        created_at = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        rows.append({
+            "id": user_id,
+            "username": f"{first.lower()}.{last.lower()}{user_id}",
+            "email": f"{first.lower()}.{last.lower()}{user_id}@example.com",
+            "password_hash": password_hash,
+            "first_name": first,
+            "last_name": last,
+            "role": rng.choices(roles, role_weights)[0],
+            "created_at": created_at,
+            "updated_at": created_at,
+            "is_active": rng.random() > 0.03,
+        })
+    return rows
+
+def generate_proposals(args):
+    """Proposal, task and subtask rows for one chunk of proposals.
+
+    Proposal IDs are final. Task IDs aren't known until earlier chunks are counted, so
+    tasks come back in order and subtasks point at their task by index in the chunk.
+    """
+    seed, first_id, count, users, options, start, span_minutes = args
+    rng = random.Random(f"{seed}:proposals:{first_id}")
+    statuses, status_weights = zip(*OPPORTUNITY_STATUSES)
+    proposals, tasks, subtasks = [], [], []
+
+    for proposal_id in range(first_id, first_id + count):
+        created_at = start + timedelta(minutes=rng.randrange(0, span_minutes))
+        proposal = {
+            "id": proposal_id,
+            "name": " ".join(rng.sample(PROJECT_WORDS, 3)).title(),
+            "site": rng.choice(SITES),
+            "client": f"{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)}",
+            "quote_number": f"Q-{created_at.year}-{proposal_id:07d}",
+            "client_name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "budget": round(min(99_999_999, rng.lognormvariate(10.5, 1.0)), 2),
+            "description": " ".join(rng.choices(PROJECT_WORDS, k=rng.randint(5, 30))),
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(minutes=rng.randrange(0, 60 * 24 * 30)),
+            # A few heavy users create most proposals
+            "created_by": users[0] + int((users[1] - users[0] + 1) * rng.random() ** 3),
+            "business_unit": rng.choice(BUSINESS_UNITS),
+            "opportunity_status": rng.choices(statuses, status_weights)[0],
+            "resource_name": "Automation Team",
+            "total_hours": 0,
+            "subtask_count": 0,
+        }
+        for order in range(bounded_count(rng, options["tasks"], 1, options["max_tasks"])):
+            task = {
+                "proposal_id": proposal_id,
+                "title": " ".join(rng.sample(PROJECT_WORDS, 2)).title(),
+                "description": None if rng.random() < 0.5 else " ".join(rng.choices(PROJECT_WORDS, k=8)),
+                "order": gapped_order(order),
+                "created_at": created_at,
+                "updated_at": created_at,
+                "total_hours": 0,
+                "subtask_count": 0,
+            }
+            for sub_order in range(bounded_count(rng, options["subtasks"], 0, options["max_subtasks"])):
+                hours = subtask_hours(rng)
+                subtasks.append({
+                    "task": len(tasks), "title": rng.choice(PROJECT_WORDS).title(), "hours": hours,
+                    "order": gapped_order(sub_order), "created_at": created_at, "updated_at": created_at,
+                })
+                task["total_hours"] += hours
+                task["subtask_count"] += 1
+            # Rollups are filled in here because Core inserts skip the ORM events that maintain them
+            proposal["total_hours"] += task["total_hours"]
+            proposal["subtask_count"] += task["subtask_count"]
             tasks.append(task)
-        db.session.commit()
-        return tasks
-
-    def create_subtasks(tasks, n=50):
-        """Generate random subtasks with integer hours"""
-        for _ in range(n):
-            subtask = Subtask(
-                task_id=choice(tasks).id,
-                title=fake.sentence(nb_words=4),
-                hours=randint(1, 10),  # Generates only whole numbers
-                order=randint(1, 5),
-                created_at=fake.date_time_between(start_date="-3m", end_date="now"),
-                updated_at=datetime.utcnow(),
-            )
-            db.session.add(subtask)
-        db.session.commit()
-
-    def generate_random_data():
-        print("Generating users...")
-        users = create_users(10)
-
-        print("Generating proposals...")
-        proposals = create_proposals(users, 20)
-
-        print("Generating tasks...")
-        tasks = create_tasks(proposals, 40)
-
-        print("Generating subtasks...")
-        create_subtasks(tasks, 100)
-
-        print("Data generation complete!")
-
-    generate_random_data()
+        proposals.append(proposal)
+
+    return proposals, tasks, subtasks
+
+def insert_rows(connection, model, rows, batch_size):
+    for i in range(0, len(rows), batch_size):
+        connection.execute(insert(model.__table__), rows[i:i + batch_size])
+
+def chunks(first_id, total, size):
+    for start in range(first_id, first_id + total, size):
+        yield start, min(size, first_id + total - start)
+
+def generate(connection, args):
+    span_minutes = 60 * 24 * 365 * args.years
+    start = datetime.combine(args.end_date, datetime.min.time()) - timedelta(minutes=span_minutes)
+    next_id = {
+        model: (connection.scalar(select(func.max(model.id))) or 0) + 1 for model in (User, Proposal, Task, Subtask)
+    }
+    if connection.dialect.name == "mysql":
+        # Every row is consistent by construction, so skip per-row uniqueness/foreign key checks while loading.
+        # Session variables, so they only affect this connection of this short-lived process.
+        connection.execute(text("SET unique_checks = 0, foreign_key_checks = 0"))
+
+    password_hash = passwords.hash(args.password)  # Once, not once per user
+    pool = multiprocessing.Pool(args.workers) if args.workers > 1 else None
+    imap = pool.imap if pool else map
+    started = time.perf_counter()
+
+    try:
+        first_user = next_id[User]
+        for rows in imap(generate_users, [
+            (args.seed, first_id, count, password_hash, start)
+            for first_id, count in chunks(first_user, args.users, CHUNK_SIZE * 5)
+        ]):
+            insert_rows(connection, User, rows, args.batch_size)
+        connection.commit()
+        users = (first_user, first_user + args.users - 1)
+        print(f"{args.users} users ({time.perf_counter() - started:.1f} s)")
+
+        options = {"tasks": args.tasks, "subtasks": args.subtasks,
+                   "max_tasks": args.max_tasks, "max_subtasks": args.max_subtasks}
+        task_id, subtask_id, done = next_id[Task], next_id[Subtask], 0
+        for proposals, tasks, subtasks in imap(generate_proposals, [
+            (args.seed, first_id, count, users, options, start, span_minutes)
+            for first_id, count in chunks(next_id[Proposal], args.proposals, CHUNK_SIZE)
+        ]):
+            for task in tasks:
+                task["id"] = task_id
+                task_id += 1
+            for subtask in subtasks:
+                subtask["id"] = subtask_id
+                subtask["task_id"] = tasks[subtask.pop("task")]["id"]
+                subtask_id += 1
+
+            insert_rows(connection, Proposal, proposals, args.batch_size)
+            insert_rows(connection, Task, tasks, args.batch_size)
+            insert_rows(connection, Subtask, subtasks, args.batch_size)
+            connection.commit()
+
+            done += len(proposals)
+            elapsed = time.perf_counter() - started
+            print(f"\r{done}/{args.proposals} proposals, {task_id - next_id[Task]} tasks, "
+                  f"{subtask_id - next_id[Subtask]} subtasks ({elapsed:.1f} s)", end="", flush=True)
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    print()
+    cache.clear()  # Reaches other workers only with a shared (redis) backend
+    print(f"Data generation complete in {time.perf_counter() - started:.1f} s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100, help="Users to create; they own the new proposals")
+    parser.add_argument("--proposals", type=int, default=1000)
+    parser.add_argument("--tasks", type=float, default=5, help="Mean tasks per proposal")
+    parser.add_argument("--max-tasks", type=int, default=40)
+    parser.add_argument("--subtasks", type=float, default=4, help="Mean subtasks per task")
+    parser.add_argument("--max-subtasks", type=int, default=30)
+    parser.add_argument("--years", type=int, default=5, help="Spread created_at over this many years before --end-date")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2026, 1, 1),
+                        help="YYYY-MM-DD; fixed by default so reruns produce the same timestamps")
+    parser.add_argument("--password", default="password123", help="Password shared by every generated user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help="Processes generating rows; 1 generates in this process")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per multi-row INSERT")
+    parser.add_argument("--database-url", help="Defaults to DATABASE_URL / the development config")
+    parser.add_argument("--create-tables", action="store_true", help="Run db.create_all() first (e.g. a new SQLite file)")
+    args = parser.parse_args()
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+
+    class GeneratorConfig(DevelopmentConfig):
+        DEBUG = False
+        SQL_INSTRUMENTATION = False  # Don't time millions of rows of INSERTs
+        PASSWORD_HASH_WORKERS = 0
+        SQLALCHEMY_DATABASE_URI = args.database_url or DevelopmentConfig.SQLALCHEMY_DATABASE_URI
+
+    app = create_app(GeneratorConfig)
+    with app.app_context():
+        if args.create_tables:
+            db.create_all()
+        with db.engine.connect() as connection:
+            generate(connection, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Store updated_at with microsecond precision on MySQL
+
+Revision ID: 5b9e3f7a1c28
+Revises: c47a2f9d1b63
+Create Date: 2026-10-18 15:22:47.310582
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b9e3f7a1c28'
+down_revision = 'c47a2f9d1b63'
+branch_labels = None
+depends_on = None
+
+TABLES = ('proposals', 'tasks', 'subtasks', 'users')
+
+
+def upgrade():
+    # SQLite already keeps microseconds in its text timestamps
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=mysql.DATETIME(), type_=mysql.DATETIME(fsp=6), existing_nullable=True)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('updated_at', existing_type=mysql.DATETIME(fsp=6), type_=mysql.DATETIME(), existing_nullable=True)
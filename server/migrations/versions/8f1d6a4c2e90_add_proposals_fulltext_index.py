@@ -0,0 +1,73 @@
+"""Add proposals full-text search index
+
+Revision ID: 8f1d6a4c2e90
+Revises: 3c5e0d2a7b41
+Create Date: 2026-10-18 11:47:02.503914
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1d6a4c2e90'
+down_revision = '3c5e0d2a7b41'
+branch_labels = None
+depends_on = None
+
+
+# SQLite has no FULLTEXT index: mirror the searchable columns into an external-content
+# FTS5 table kept in sync by triggers (the same DDL models.py runs on create_all)
+FTS_COLUMNS = 'name, client, client_name, quote_number, description'
+FTS_NEW = ', '.join('new.' + column for column in FTS_COLUMNS.split(', '))
+FTS_OLD = ', '.join('old.' + column for column in FTS_COLUMNS.split(', '))
+FTS_TRIGGERS = ('proposals_fts_ai', 'proposals_fts_ad', 'proposals_fts_au')
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS proposals_fts USING fts5({FTS_COLUMNS}, "
+            "content='proposals', content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS proposals_fts_ai AFTER INSERT ON proposals BEGIN "
+            f"INSERT INTO proposals_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS proposals_fts_ad AFTER DELETE ON proposals BEGIN "
+            f"INSERT INTO proposals_fts(proposals_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {FTS_OLD}); END"
+        )
+        op.execute(
+            f"CREATE TRIGGER IF NOT EXISTS proposals_fts_au AFTER UPDATE OF {FTS_COLUMNS} ON proposals BEGIN "
+            f"INSERT INTO proposals_fts(proposals_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {FTS_OLD}); "
+            f"INSERT INTO proposals_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END"
+        )
+        # Index the proposals that already exist
+        op.execute("INSERT INTO proposals_fts(proposals_fts) VALUES ('rebuild')")
+        return
+
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    with op.batch_alter_table('proposals', schema=None) as batch_op:
+        batch_op.create_index(
+            'ft_proposals_search',
+            ['name', 'client', 'client_name', 'quote_number', 'description'],
+            unique=False,
+            mysql_prefix='FULLTEXT'
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in FTS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS proposals_fts")
+        return
+
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    with op.batch_alter_table('proposals', schema=None) as batch_op:
+        batch_op.drop_index('ft_proposals_search')
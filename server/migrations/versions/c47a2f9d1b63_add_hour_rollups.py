@@ -0,0 +1,48 @@
+"""Add hour rollups to tasks and proposals
+
+Revision ID: c47a2f9d1b63
+Revises: 8f1d6a4c2e90
+Create Date: 2026-10-18 14:05:31.842177
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c47a2f9d1b63'
+down_revision = '8f1d6a4c2e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_hours', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('subtask_count', sa.Integer(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('proposals', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_hours', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('subtask_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing subtasks (same set-based logic as `flask rollups repair`)
+    op.execute(
+        "UPDATE tasks SET "
+        "total_hours = (SELECT COALESCE(SUM(subtasks.hours), 0) FROM subtasks WHERE subtasks.task_id = tasks.id), "
+        "subtask_count = (SELECT COUNT(subtasks.id) FROM subtasks WHERE subtasks.task_id = tasks.id)"
+    )
+    op.execute(
+        "UPDATE proposals SET "
+        "total_hours = (SELECT COALESCE(SUM(tasks.total_hours), 0) FROM tasks WHERE tasks.proposal_id = proposals.id), "
+        "subtask_count = (SELECT COALESCE(SUM(tasks.subtask_count), 0) FROM tasks WHERE tasks.proposal_id = proposals.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('proposals', schema=None) as batch_op:
+        batch_op.drop_column('subtask_count')
+        batch_op.drop_column('total_hours')
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('subtask_count')
+        batch_op.drop_column('total_hours')
@@ -0,0 +1,161 @@
+import heapq
+import logging
+import re
+import time
+from collections import Counter
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from server.extensions import db
+
+logger = logging.getLogger("server.sql")
+
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_PARAM_STYLES = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+")
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(statement):
+    """Reduce SQL to its shape: placeholders, literals and IN-lists of any length compare equal"""
+    shape = _PARAM_STYLES.sub("?", statement)
+    shape = _LITERALS.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _IN_LIST.sub("(?...)", shape)
+
+def describe_parameters(parameters):
+    """Bind parameters by type only, e.g. "3 params (int, str, datetime)", so values never reach the log"""
+    if not parameters:
+        return "no params"
+    if isinstance(parameters, (list, tuple)) and isinstance(parameters[0], (list, tuple, dict)):
+        return f"{len(parameters)} rows of {describe_parameters(parameters[0])}"  # executemany
+    values = parameters.values() if isinstance(parameters, dict) else parameters
+    types = [type(value).__name__ for value in values]
+    return f"{len(types)} params ({', '.join(types[:20])}{', ...' if len(types) > 20 else ''})"
+
+class RequestSQLMetrics:
+    """Statements executed while handling one request"""
+
+    def __init__(self, keep_slowest):
+        self.count = 0
+        self.total = 0.0
+        self.shapes = Counter()
+        self.examples = {}
+        self.slowest = []  # Min-heap of (seconds, sequence, statement), at most keep_slowest long
+        self.keep_slowest = keep_slowest
+
+    def record(self, statement, elapsed):
+        self.count += 1
+        self.total += elapsed
+        shape = normalize_statement(statement)
+        self.shapes[shape] += 1
+        self.examples.setdefault(shape, statement)
+        entry = (elapsed, self.count, statement)
+        if len(self.slowest) < self.keep_slowest:
+            heapq.heappush(self.slowest, entry)
+        elif entry > self.slowest[0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def repeated(self, threshold):
+        """[(count, example statement)] for statement shapes run at least `threshold` times"""
+        return [(count, self.examples[shape]) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def slowest_statements(self):
+        return [(elapsed, statement) for elapsed, _, statement in sorted(self.slowest, reverse=True)]
+
+class _AppSQLMetrics:
+    """One app's instrumentation settings"""
+
+    def __init__(self, config):
+        self.slow_seconds = config["SQL_SLOW_QUERY_MS"] / 1000
+        self.n_plus_one_threshold = config["SQL_N_PLUS_ONE_THRESHOLD"]
+        self.headers = config["SQL_METRICS_HEADERS"]
+        self.keep_slowest = config["SQL_SLOWEST_KEPT"]
+        self.log_parameters = config["SQL_LOG_PARAMETERS"]
+
+class SQLInstrumentation:
+    """Per-request query count, DB time, slow-query log and N+1 detection from engine events.
+
+    Per-request stats only cover statements run while a request is being handled; the
+    slow-query log also covers CLI commands and background export workers. Queries run while a streamed response body
+    is being generated happen after the headers are sent and aren't counted. Settings are kept per app in
+    app.extensions["sql_metrics"].
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault("SQL_INSTRUMENTATION", True)
+        app.config.setdefault("SQL_METRICS_HEADERS", False)  # X-DB-Queries / X-DB-Time / Server-Timing
+        app.config.setdefault("SQL_SLOW_QUERY_MS", 200)
+        app.config.setdefault("SQL_N_PLUS_ONE_THRESHOLD", 5)  # Same statement shape this many times in one request
+        app.config.setdefault("SQL_SLOWEST_KEPT", 3)
+        app.config.setdefault("SQL_LOG_PARAMETERS", False)  # Bind values in the slow-query log; they include password hashes and emails
+
+        if not app.config["SQL_INSTRUMENTATION"]:
+            return
+
+        settings = app.extensions["sql_metrics"] = _AppSQLMetrics(app.config)
+        with app.app_context():
+            engine = db.engine
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault("sql_metrics_started", []).append(time.perf_counter())
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info["sql_metrics_started"].pop()
+            if elapsed >= settings.slow_seconds:  # Logged wherever it ran, requests or not
+                logger.warning(
+                    "Slow query (%.1f ms) during %s: %s | %s",
+                    elapsed * 1000, f"{request.method} {request.path}" if has_request_context() else "background work",
+                    _WHITESPACE.sub(" ", statement),
+                    f"params={parameters!r:.300}" if settings.log_parameters else describe_parameters(parameters),
+                )
+
+            metrics = g.get("sql_metrics") if has_app_context() else None
+            if metrics is not None:
+                metrics.record(statement, elapsed)
+
+        @event.listens_for(engine, "handle_error")
+        def _drop_timer(exception_context):
+            started = exception_context.connection.info.get("sql_metrics_started") if exception_context.connection else None
+            if started:
+                started.pop()
+
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def _start_request(self):
+        g.sql_metrics = RequestSQLMetrics(current_app.extensions["sql_metrics"].keep_slowest)
+
+    def _finish_request(self, response):
+        metrics = g.pop("sql_metrics", None)
+        if metrics is None:
+            return response
+
+        settings = current_app.extensions["sql_metrics"]
+        repeated = metrics.repeated(settings.n_plus_one_threshold)
+        for count, statement in repeated:
+            logger.warning(
+                "Possible N+1 in %s %s: statement ran %d times: %s",
+                request.method, request.path, count, _WHITESPACE.sub(" ", statement),
+            )
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s: %d queries, %.1f ms; slowest: %s", request.method, request.path, metrics.count,
+                metrics.total * 1000, "; ".join(f"{elapsed * 1000:.1f} ms {_WHITESPACE.sub(' ', sql)[:200]}"
+                                                for elapsed, sql in metrics.slowest_statements()),
+            )
+
+        if settings.headers:
+            response.headers["X-DB-Queries"] = str(metrics.count)
+            response.headers["X-DB-Time"] = f"{metrics.total * 1000:.2f}"  # Milliseconds
+            response.headers.add("Server-Timing", f"db;desc=\"{metrics.count} queries\";dur={metrics.total * 1000:.2f}")
+            if repeated:
+                response.headers["X-DB-Repeated-Statements"] = str(max(count for count, _ in repeated))
+        return response
+
+sql_metrics = SQLInstrumentation()
@@ -0,0 +1,35 @@
+import pytest
+from server.benchmarks.common import make_app, seed_dataset
+from server.extensions import db
+
+# Each test gets the real application on its own SQLite file, with the cache and change
+# notifications off so every request reaches the database.
+TEST_CONFIG = {
+    "CACHE_BACKEND": "none", "EVENTS_BACKEND": "none", "PASSWORD_HASH_WORKERS": 0, "SQL_METRICS_HEADERS": False,
+    "JWT_SECRET_KEY": "test-only-jwt-secret-long-enough-for-hs256",
+}
+
+@pytest.fixture
+def make_seeded_app(tmp_path):
+    """Factory: an app whose database holds `seed_dataset(proposals, **shape)`, with `config` overrides"""
+    created = []
+
+    def factory(proposals, config=None, **shape):
+        app = make_app(f"sqlite:///{tmp_path / f'test{len(created)}.db'}", **{**TEST_CONFIG, **(config or {})})
+        with app.app_context():
+            seed_dataset(proposals, **shape)
+        created.append(app)
+        return app
+
+    yield factory
+    for app in created:
+        with app.app_context():
+            db.engine.dispose()
+
+@pytest.fixture
+def app(make_seeded_app):
+    return make_seeded_app(20, users=5, tasks=(2, 4), subtasks=(1, 3))
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
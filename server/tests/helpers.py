@@ -0,0 +1,28 @@
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from server.extensions import db
+from server.app.auth import principal_claims
+from server.app.models import User
+
+def count_statements(app, path, headers=None):
+    """GET `path` on `app`; returns the response and every SQL statement it executed"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = app.test_client().get(path, headers=headers)
+        response.get_data()  # Streamed bodies run their queries as they're read
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return response, statements
+
+def auth_headers(app, user_id=1):
+    """Bearer token headers for a seeded user (user 1 is an admin)"""
+    with app.app_context():
+        token = create_access_token(identity=str(user_id), additional_claims=principal_claims(db.session.get(User, user_id)))
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,9 @@
+import pytest
+from server.tests.helpers import auth_headers
+
+@pytest.mark.parametrize("body", ["requests", ["requests"], {"transactional": True}])
+def test_batch_body_must_be_an_object_with_requests(client, app, body):
+    response = client.post("/batch", json=body, headers=auth_headers(app))
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "No input data provided"}
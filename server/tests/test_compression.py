@@ -0,0 +1,13 @@
+from server.tests.helpers import auth_headers
+
+def test_each_app_keeps_its_own_compression_settings(make_seeded_app):
+    first = make_seeded_app(2, config={"COMPRESSION_MIN_SIZE": 1})
+    second = make_seeded_app(2, config={"COMPRESSION_MIN_SIZE": 10 ** 9})
+
+    response = first.test_client().get("/proposals", headers={**auth_headers(first), "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    response = second.test_client().get("/proposals", headers={**auth_headers(second), "Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
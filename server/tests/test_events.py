@@ -0,0 +1,92 @@
+import pytest
+from server.extensions import db, events
+from server.events import RedisBroker
+from server.app.models import Subtask
+from server.tests.helpers import auth_headers
+
+MEMORY = {"EVENTS_BACKEND": "memory"}
+
+def drain(subscription, wait=0.05):
+    """Queued notices; waits up to `wait` seconds for the first, as Redis delivers them from another thread"""
+    notices = []
+    while (notice := subscription.get(wait if not notices else 0.05)) is not None:
+        notices.append(notice)
+    return notices
+
+def renamed(proposal_id):
+    return {"type": "proposal", "action": "updated", "id": proposal_id, "proposal_id": proposal_id}
+
+def test_each_app_publishes_to_its_own_broker(make_seeded_app):
+    first = make_seeded_app(2, config=MEMORY)
+    second = make_seeded_app(2, config=MEMORY)
+    first_subscription = first.extensions["events"].subscribe()
+    second_subscription = second.extensions["events"].subscribe()
+
+    response = first.test_client().put("/proposals/1", json={"name": "Renamed"}, headers=auth_headers(first))
+
+    assert response.status_code == 200
+    assert drain(first_subscription) == [renamed(1)]
+    assert drain(second_subscription) == []
+
+@pytest.fixture(params=["memory", "redis"])
+def events_app(request, make_seeded_app):
+    """An app publishing through a MemoryBroker, or a RedisBroker on a local stand-in for Redis"""
+    app = make_seeded_app(3, config={**MEMORY, "EVENTS_HEARTBEAT_SECONDS": 5}, users=1, tasks=(2, 2), subtasks=(2, 2))
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        events.init_app(app, broker=RedisBroker(client=fakeredis.FakeRedis()))
+    return app
+
+def test_notices_are_published_on_commit(events_app):
+    subscription = events_app.extensions["events"].subscribe()
+
+    response = events_app.test_client().put("/proposals/2", json={"name": "Renamed"}, headers=auth_headers(events_app))
+
+    assert response.status_code == 200
+    assert drain(subscription, wait=2) == [renamed(2)]
+
+def test_notices_are_dropped_on_rollback(events_app):
+    subscription = events_app.extensions["events"].subscribe()
+
+    with events_app.app_context():
+        db.session.get(Subtask, 1).hours = 10
+        db.session.flush()  # Notices are collected at flush
+        db.session.rollback()
+    # Published after the rollback, so it arrives first only if the rolled-back write sent nothing
+    events_app.test_client().put("/proposals/2", json={"name": "Renamed"}, headers=auth_headers(events_app))
+
+    assert drain(subscription, wait=2) == [renamed(2)]
+
+def test_transactional_batch_publishes_once_everything_commits(events_app):
+    subscription = events_app.extensions["events"].subscribe()
+    client = events_app.test_client()
+    headers = auth_headers(events_app)
+
+    failed = client.post("/batch", headers=headers, json={"transactional": True, "requests": [
+        {"method": "PUT", "path": "/proposals/1", "body": {"name": "Kept back"}},
+        {"method": "PUT", "path": "/proposals/999", "body": {"name": "Missing"}},
+    ]})
+    succeeded = client.post("/batch", headers=headers, json={"transactional": True, "requests": [
+        {"method": "PUT", "path": "/proposals/2", "body": {"name": "First"}},
+        {"method": "PUT", "path": "/proposals/3", "body": {"name": "Second"}},
+    ]})
+
+    assert failed.status_code == 200 and succeeded.status_code == 200
+    # The first item of the failed batch had flushed, but its notice went with the rollback
+    assert drain(subscription, wait=2) == [renamed(2), renamed(3)]
+
+def test_event_stream_filters_by_proposal(events_app):
+    client = events_app.test_client()
+    headers = auth_headers(events_app)
+    stream = client.get("/events?proposal_id=3", headers=headers, buffered=False)
+    assert stream.status_code == 200
+    assert events_app.extensions["events"].subscriber_count() == 1
+
+    client.put("/proposals/2", json={"name": "Filtered out"}, headers=headers)
+    client.put("/proposals/3", json={"name": "Kept"}, headers=headers)
+    chunks = iter(stream.response)
+
+    assert next(chunks) == b"retry: 5000\n\n"
+    assert next(chunks) == b'event: change\ndata: {"action":"updated","id":3,"proposal_id":3,"type":"proposal"}\n\n'
+    stream.close()
+    assert events_app.extensions["events"].subscriber_count() == 0
@@ -0,0 +1,41 @@
+import os
+import time
+from server.tests.helpers import auth_headers
+
+def wait_for(client, headers, job_id, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/exports/{job_id}", headers=headers).get_json()
+        if job["status"] in ("finished", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Export {job_id} still {job['status']}")
+
+def test_each_app_runs_jobs_against_its_own_database(make_seeded_app, tmp_path):
+    config = {"EXPORT_ARTIFACT_DIR": str(tmp_path / "exports")}
+    small = make_seeded_app(2, config=config, users=1, tasks=(1, 1), subtasks=(1, 1))
+    make_seeded_app(10, config=config, users=1, tasks=(1, 1), subtasks=(1, 1))  # Created last
+
+    client, headers = small.test_client(), auth_headers(small)
+    response = client.post("/exports", json={}, headers=headers)
+    assert response.status_code == 202
+
+    job = wait_for(client, headers, response.get_json()["job"]["id"])
+    assert (job["status"], job["total_rows"]) == ("finished", 2)
+
+def test_startup_sweeps_stale_artifacts(make_seeded_app, tmp_path):
+    artifact_dir = tmp_path / "exports"
+    artifact_dir.mkdir()
+    old = time.time() - 7200
+    for name in ("old.xlsx", "old.xlsx.part", "fresh.xlsx", "notes.txt"):
+        (artifact_dir / name).write_bytes(b"x")
+    for name in ("old.xlsx", "old.xlsx.part", "notes.txt"):
+        os.utime(artifact_dir / name, (old, old))
+
+    make_seeded_app(1, config={"EXPORT_ARTIFACT_DIR": str(artifact_dir), "EXPORT_ARTIFACT_TTL": 3600}, users=1)
+
+    assert sorted(os.listdir(artifact_dir)) == ["fresh.xlsx", "notes.txt"]
+
+def test_export_body_must_be_an_object(app, client):
+    for body in ([1, 2], "year"):
+        assert client.post("/exports", json=body, headers=auth_headers(app)).status_code == 400
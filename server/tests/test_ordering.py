@@ -0,0 +1,69 @@
+import pytest
+from server.app.services.order_services import ORDER_GAP
+from server.tests.helpers import auth_headers
+
+@pytest.fixture
+def app(make_seeded_app):
+    # Proposal 1 has tasks 1-4; task 1 has subtasks 1-3
+    return make_seeded_app(1, users=1, tasks=(4, 4), subtasks=(3, 3))
+
+def task_orders(client):
+    """[(task ID, order key)] of proposal 1 in display order"""
+    return [(task["id"], task["order"]) for task in client.get("/proposals/1/tasks").get_json()]
+
+def test_reorder_tasks_applies_the_whole_order(app, client):
+    response = client.patch("/proposals/1/tasks/order", json={"task_ids": [3, 1, 4, 2]}, headers=auth_headers(app))
+
+    assert response.status_code == 200
+    assert [task_id for task_id, _ in task_orders(client)] == [3, 1, 4, 2]
+
+@pytest.mark.parametrize("task_ids", [[1, 2, 3], [1, 2, 3, 3], [1, 2, 3, 4, 99], ["1", 2, 3, 4]])
+def test_reorder_tasks_rejects_anything_but_every_task_once(app, client, task_ids):
+    response = client.patch("/proposals/1/tasks/order", json={"task_ids": task_ids}, headers=auth_headers(app))
+
+    assert response.status_code == 400
+    assert [task_id for task_id, _ in task_orders(client)] == [1, 2, 3, 4]
+
+def test_move_updates_only_the_moved_task(app, client):
+    before = dict(task_orders(client))
+
+    response = client.patch("/tasks/4/position", json={"after_id": 1}, headers=auth_headers(app))
+
+    assert response.status_code == 200
+    after = task_orders(client)
+    assert [task_id for task_id, _ in after] == [1, 4, 2, 3]
+    assert {task_id: key for task_id, key in after if task_id != 4} == {task_id: before[task_id] for task_id in (1, 2, 3)}
+
+def test_move_to_top(app, client):
+    client.patch("/tasks/3/position", json={"after_id": None}, headers=auth_headers(app))
+
+    assert [task_id for task_id, _ in task_orders(client)] == [3, 1, 2, 4]
+
+def test_repeated_moves_into_one_gap_renumber_and_keep_the_order(app, client):
+    headers = auth_headers(app)
+    # Alternately move 3 and 4 in right after 1: the gap behind 1 halves every time
+    expected = [1, 2, 3, 4]
+    for move in range(2 * ORDER_GAP.bit_length()):
+        task_id = 3 if move % 2 == 0 else 4
+        assert client.patch(f"/tasks/{task_id}/position", json={"after_id": 1}, headers=headers).status_code == 200
+        expected.remove(task_id)
+        expected.insert(1, task_id)
+
+    orders = task_orders(client)
+    assert [task_id for task_id, _ in orders] == expected
+    keys = [key for _, key in orders]
+    assert keys == sorted(set(keys))  # Distinct and ascending, so the order is stable
+
+def test_move_subtask_within_its_task(app, client):
+    headers = auth_headers(app)
+
+    response = client.patch("/subtasks/1/position", json={"after_id": 3}, headers=headers)
+
+    assert response.status_code == 200
+    subtasks = client.get("/tasks/1?include_subtasks=true").get_json()["subtasks"]
+    assert [subtask["id"] for subtask in subtasks] == [2, 3, 1]
+
+def test_move_rejects_an_item_of_another_parent(app, client):
+    response = client.patch("/subtasks/1/position", json={"after_id": 4}, headers=auth_headers(app))  # Subtask 4 is on task 2
+
+    assert response.status_code == 400
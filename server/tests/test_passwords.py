@@ -0,0 +1,23 @@
+from server.app.passwords import passwords, PasswordHasherBusy
+
+WORKERS = {"PASSWORD_HASH_WORKERS": 1, "PASSWORD_HASH_METHOD": "pbkdf2:sha256:1000"}
+
+def test_each_app_keeps_its_own_hashing_pool(make_seeded_app):
+    first = make_seeded_app(1, config=WORKERS, users=1)
+    make_seeded_app(1, config={**WORKERS, "PASSWORD_HASH_METHOD": "pbkdf2:sha256:2000"}, users=1)
+
+    with first.app_context():  # Still hashes on its own, live pool with its own method
+        password_hash = passwords.hash("secret")
+        assert password_hash.startswith("pbkdf2:sha256:1000$")
+        assert passwords.verify(password_hash, "secret")
+        assert not passwords.needs_rehash(password_hash)
+
+def test_busy_hasher_is_a_503_on_any_route(app):
+    @app.route("/needs-a-hash")
+    def needs_a_hash():
+        raise PasswordHasherBusy()
+
+    response = app.test_client().get("/needs-a-hash")
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,28 @@
+import pytest
+from server.tests.helpers import auth_headers
+
+PROPOSAL = {"name": "New", "site": "Site", "client": "Client", "quote_number": "Q-1", "client_name": "Contact"}
+
+@pytest.mark.parametrize("tree, error", [
+    ({**PROPOSAL, "tasks": 5}, "tasks must be a list"),
+    ({**PROPOSAL, "tasks": [1]}, "Each task must be an object"),
+    ({**PROPOSAL, "tasks": [{"title": "T", "subtasks": "none"}]}, "tasks[].subtasks must be a list"),
+    ({**PROPOSAL, "tasks": [{"title": "T", "subtasks": [None]}]}, "Each subtask must be an object"),
+])
+def test_malformed_trees_are_rejected_with_400(app, tree, error):
+    client = app.test_client()
+    headers = auth_headers(app)
+
+    response = client.post("/proposals", json=tree, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": error}
+
+    response = client.post("/proposals/bulk", json={"proposals": [tree]}, headers=headers)
+    assert response.status_code == 400
+    assert response.get_json() == {"error": f"proposals[0]: {error}"}
+
+@pytest.mark.parametrize("body", ["proposals", ["proposals"]])
+def test_bulk_body_must_be_an_object(app, body):
+    response = app.test_client().post("/proposals/bulk", json=body, headers=auth_headers(app))
+
+    assert response.status_code == 400
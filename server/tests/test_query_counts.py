@@ -0,0 +1,26 @@
+import pytest
+from server.tests.helpers import count_statements
+
+# The same routes against a tiny and a much larger dataset: every creator, task and
+# subtask has to come from a fixed number of statements, not one per row.
+SMALL = {"proposals": 3, "users": 3, "tasks": (1, 1), "subtasks": (1, 1)}
+LARGE = {"proposals": 60, "users": 20, "tasks": (8, 8), "subtasks": (6, 6)}
+
+@pytest.mark.parametrize("path", [
+    "/proposals",
+    "/proposals/1",
+    "/proposals/1/tree",
+    "/proposals/1/tasks?include_subtasks=true",
+    "/tasks/1?include_proposal=true&include_subtasks=true",
+])
+def test_statement_count_does_not_grow_with_result_size(make_seeded_app, path):
+    results = []
+    for shape in (SMALL, LARGE):
+        app = make_seeded_app(**shape)
+        response, statements = count_statements(app, path)
+        assert response.status_code == 200
+        results.append((response.get_json(), len(statements)))
+
+    (small_body, small_count), (large_body, large_count) = results
+    assert small_body != large_body  # The larger dataset really returned more rows
+    assert large_count == small_count
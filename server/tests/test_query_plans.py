@@ -0,0 +1,8 @@
+from server.benchmarks.explain_plans import run
+
+def test_hot_queries_use_indexes(tmp_path):
+    """Every hot read route's statements seek an index at a seeded size (see benchmarks/explain_plans.py)"""
+    _, results = run(3000, 300, f"sqlite:///{tmp_path / 'plans.db'}")
+
+    problems = {name: problems for name, _, _, problems, _ in results if problems}
+    assert problems == {}
@@ -0,0 +1,13 @@
+from server.tests.helpers import auth_headers
+
+def test_each_app_keeps_its_own_metrics_settings(make_seeded_app):
+    first = make_seeded_app(2, config={"SQL_METRICS_HEADERS": True})
+    second = make_seeded_app(2)
+
+    response = first.test_client().get("/proposals", headers=auth_headers(first))
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Queries"]) > 0
+
+    response = second.test_client().get("/proposals", headers=auth_headers(second))
+    assert response.status_code == 200
+    assert "X-DB-Queries" not in response.headers
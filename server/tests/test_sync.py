@@ -0,0 +1,103 @@
+import time
+import pytest
+from server.extensions import db
+from server.app.models import Proposal, Subtask
+from server.app.pagination import encode_cursor
+
+@pytest.fixture
+def app(make_seeded_app):
+    app = make_seeded_app(5, users=2, tasks=(2, 2), subtasks=(2, 2))  # 10 tasks, 20 subtasks
+    app.config.update(SYNC_SETTLE_SECONDS=0, SYNC_PAGE_SIZE=4)
+    return app
+
+def sync(client, token=None):
+    """Follow next_token until has_more is false; returns the combined changes and the last token"""
+    changes = {"proposals": [], "tasks": [], "subtasks": [], "deleted": []}
+    while True:
+        response = client.get("/sync/proposals", query_string={"since": token} if token else None)
+        assert response.status_code == 200
+        page = response.get_json()
+        for key in changes:
+            changes[key] += page[key]
+        token = page["next_token"]
+        if not page["has_more"]:
+            time.sleep(0.01)  # Later writes get an updated_at past this token's position
+            return changes, token
+
+def ids(rows):
+    return sorted(row["id"] for row in rows)
+
+def test_snapshot_then_nothing_new(client):
+    snapshot, token = sync(client)
+    assert (len(snapshot["proposals"]), len(snapshot["tasks"]), len(snapshot["subtasks"])) == (5, 10, 20)
+
+    changes, _ = sync(client, token)
+    assert changes == {"proposals": [], "tasks": [], "subtasks": [], "deleted": []}
+
+def test_delta_returns_changed_rows_and_tombstones(app, client):
+    _, token = sync(client)
+
+    with app.app_context():
+        db.session.get(Proposal, 2).name = "Renamed"
+        db.session.delete(db.session.get(Subtask, 3))
+        db.session.commit()
+
+    changes, _ = sync(client, token)
+    assert [proposal["name"] for proposal in changes["proposals"] if proposal["id"] == 2] == ["Renamed"]
+    assert {"type": "subtask", "id": 3} in changes["deleted"]
+    assert 3 not in ids(changes["subtasks"])
+
+def test_unsettled_changes_wait_for_the_next_call(app, client):
+    _, token = sync(client)
+    app.config["SYNC_SETTLE_SECONDS"] = 60
+
+    with app.app_context():
+        db.session.get(Proposal, 1).name = "Too recent"
+        db.session.commit()
+
+    changes, _ = sync(client, token)
+    assert changes["proposals"] == []
+
+    app.config["SYNC_SETTLE_SECONDS"] = 0
+    changes, _ = sync(client, token)
+    assert ids(changes["proposals"]) == [1]
+
+def test_bad_and_expired_tokens(client):
+    assert client.get("/sync/proposals?since=garbage").status_code == 400
+
+    expired = encode_cursor({key: ["2000-01-01T00:00:00", 0] for key in ("proposals", "tasks", "subtasks", "deleted")})
+    response = client.get("/sync/proposals", query_string={"since": expired})
+    assert response.status_code == 410
+    assert response.get_json()["resync"] is True
+
+def test_commit_within_the_settle_window_is_picked_up(app, client):
+    app.config["SYNC_SETTLE_SECONDS"] = 0.3
+    time.sleep(0.3)  # Let the seeded rows settle
+    _, token = sync(client)
+
+    with app.app_context():
+        db.session.get(Proposal, 1).name = "Committed in time"
+        db.session.flush()  # Stamps updated_at
+        _, token = sync(client, token)  # Not settled yet, so the token stays behind it
+        db.session.commit()
+
+    time.sleep(0.3)
+    changes, _ = sync(client, token)
+    assert ids(changes["proposals"]) == [1]
+
+def test_commit_later_than_the_settle_window_is_skipped(app, client):
+    # The documented limit of SYNC_SETTLE_SECONDS: updated_at is stamped at flush, not commit
+    app.config["SYNC_SETTLE_SECONDS"] = 0.3
+    time.sleep(0.3)  # Let the seeded rows settle
+    _, token = sync(client)
+
+    with app.app_context():
+        db.session.get(Proposal, 1).name = "Committed too late"
+        db.session.flush()
+        time.sleep(0.4)
+        _, token = sync(client, token)  # Moves past the uncommitted row's updated_at
+        db.session.commit()
+
+    time.sleep(0.3)
+    changes, _ = sync(client, token)
+    assert changes["proposals"] == []